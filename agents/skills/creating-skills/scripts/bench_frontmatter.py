@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Benchmark frontmatter loading: quick_validate's reader vs the old
+read_text() + regex + PyYAML path.
+
+Usage (JSON via stdin):
+    bench_frontmatter.py <<'EOF'
+    {"roots": ["~/.dotfiles/agents/skills"], "repeat": 200}
+    EOF
+
+JSON input fields (all optional):
+    roots: Directories to collect SKILL.md files from (default: this repo's agents/skills)
+    repeat: Passes over every file for the per-file timing (default: 200)
+    starts: Fresh interpreter launches for the startup timing (default: 20)
+
+Startup is a fresh interpreter that imports the loader and parses one
+SKILL.md, so it includes module import cost (PyYAML for the old path).
+Per-file time is the in-process load of every collected SKILL.md. The run
+also checks that both paths produce identical frontmatter for every file.
+
+Outputs JSON to stdout:
+    {"status": "ok", "files": 25, "fallbacks": 1, "mismatches": [],
+     "startup_ms": {"old": ..., "new": ...}, "per_file_us": {"old": ..., "new": ...}}
+"""
+
+import json
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from quick_validate import ComplexYAML, load_frontmatter, parse_simple_yaml, read_frontmatter
+from validate_skills import DEFAULT_ROOT, find_skills
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+
+OLD_STARTUP = """
+import re, yaml
+from pathlib import Path
+m = re.match(r'^---\\n(.*?)\\n---', Path({path!r}).read_text(), re.DOTALL)
+yaml.safe_load(m.group(1))
+"""
+NEW_STARTUP = """
+import sys
+sys.path.insert(0, {script_dir!r})
+from quick_validate import load_frontmatter, read_frontmatter
+load_frontmatter(read_frontmatter({path!r}))
+"""
+
+
+def output_json(data: dict) -> None:
+    """Output structured JSON to stdout."""
+    print(json.dumps(data))
+
+
+def old_load(skill_md):
+    """The pre-existing path: whole file, regex, PyYAML."""
+    import yaml
+    match = re.match(r'^---\n(.*?)\n---', Path(skill_md).read_text(), re.DOTALL)
+    return yaml.safe_load(match.group(1))
+
+
+def new_load(skill_md):
+    return load_frontmatter(read_frontmatter(skill_md))
+
+
+def startup_ms(code, starts):
+    times = []
+    for _ in range(starts):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True)
+        times.append(time.perf_counter() - start)
+    return round(statistics.median(times) * 1000, 1)
+
+
+def per_file_us(load, files, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for f in files:
+            load(f)
+    return round((time.perf_counter() - start) / (repeat * len(files)) * 1e6, 1)
+
+
+def parse_args() -> dict:
+    """Parse arguments from stdin JSON (empty input means all defaults)."""
+    if sys.stdin.isatty():
+        print("Error: This script requires JSON input via stdin", file=sys.stderr)
+        print("Usage: bench_frontmatter.py <<'EOF'", file=sys.stderr)
+        print('{"repeat": 200}', file=sys.stderr)
+        print("EOF", file=sys.stderr)
+        output_json({"error": "This script requires JSON input via stdin"})
+        sys.exit(1)
+    try:
+        text = sys.stdin.read().strip()
+        return json.loads(text) if text else {}
+    except json.JSONDecodeError as e:
+        print(f"Error: Invalid JSON input: {e}", file=sys.stderr)
+        output_json({"error": f"Invalid JSON input: {e}"})
+        sys.exit(1)
+
+
+def main() -> int:
+    opts = parse_args()
+    roots = [Path(r).expanduser() for r in opts.get("roots") or [DEFAULT_ROOT]]
+    repeat = max(1, opts.get("repeat", 200))
+    starts = max(1, opts.get("starts", 20))
+
+    files = []
+    for skill in find_skills(roots):
+        skill_md = Path(skill) / "SKILL.md"
+        # Only files both paths can load (the old one crashes on no frontmatter)
+        if read_frontmatter(skill_md):
+            files.append(skill_md)
+    if not files:
+        output_json({"error": "No SKILL.md files with frontmatter found"})
+        return 1
+
+    mismatches, fallbacks = [], 0
+    for f in files:
+        try:
+            parse_simple_yaml(read_frontmatter(f))
+        except ComplexYAML:
+            fallbacks += 1
+        if new_load(f) != old_load(f):
+            mismatches.append(str(f))
+
+    print(f"Timing {starts} cold starts per path...", file=sys.stderr)
+    sample = str(files[0])
+    old_start = startup_ms(OLD_STARTUP.format(path=sample), starts)
+    new_start = startup_ms(NEW_STARTUP.format(path=sample, script_dir=str(SCRIPT_DIR)), starts)
+
+    print(f"Timing {repeat} passes over {len(files)} files per path...", file=sys.stderr)
+    old_load(files[0])  # import PyYAML outside the timed loop
+    old_file = per_file_us(old_load, files, repeat)
+    new_file = per_file_us(new_load, files, repeat)
+
+    output_json({
+        "status": "ok",
+        "files": len(files),
+        "fallbacks": fallbacks,
+        "mismatches": mismatches,
+        "startup_ms": {"old": old_start, "new": new_start},
+        "per_file_us": {"old": old_file, "new": new_file},
+    })
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,22 +12,111 @@ JSON input fields:
     output_dir: Output directory for .skill file (optional)
 
 Outputs JSON to stdout:
-    Success: {"status": "ok", "path": "/path/to/skill.skill"}
+    Success: {"status": "ok", "path": "/path/to/skill.skill", "unchanged": false,
+              "files": 321, "recompressed": 1, "reused": 320}
     Error:   {"error": "message"}
+
+Packaging is incremental. A manifest of every packaged file's size, mtime
+and SHA-256 is kept (in $XDG_CACHE_HOME/creating-skills/package-manifests)
+per output archive. When nothing changed and the archive is still the one
+we wrote, the skill is skipped entirely — not even re-validated. Otherwise
+only new or modified files are recompressed; unchanged files have their
+already-compressed bytes copied straight from the previous archive.
+
+Archives are reproducible: entries are sorted, timestamps fixed, and
+permissions normalised, so identical skill contents give identical bytes.
 """
 
 import sys
+import os
 import json
+import struct
+import hashlib
 import zipfile
 from pathlib import Path
 from quick_validate import validate_skill
 
+MANIFEST_DIR = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "creating-skills" / "package-manifests"
+# Earliest time a zip can hold; any fixed value makes builds reproducible.
+FIXED_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+COMPRESS_LEVEL = 9
+# Bytecode differs per interpreter and run; never worth shipping.
+SKIP_DIRS = {"__pycache__"}
+
 
 def output_json(data: dict) -> None:
     """Output structured JSON to stdout."""
     print(json.dumps(data))
 
 
+def skill_files(skill_path):
+    """(arcname, path) for every file to package, sorted by arcname."""
+    files = []
+    for file_path in skill_path.rglob('*'):
+        if file_path.is_file() and not SKIP_DIRS.intersection(file_path.relative_to(skill_path).parts):
+            files.append((file_path.relative_to(skill_path.parent).as_posix(), file_path))
+    return sorted(files)
+
+
+def manifest_path(archive):
+    key = hashlib.sha256(str(archive).encode()).hexdigest()[:16]
+    return MANIFEST_DIR / f"{archive.stem}-{key}.json"
+
+
+def load_manifest(archive):
+    """The previous build's manifest, if the archive on disk is still the one
+    it describes."""
+    try:
+        manifest = json.loads(manifest_path(archive).read_text())
+        st = archive.stat()
+    except (OSError, json.JSONDecodeError):
+        return None
+    if manifest.get("archive") != [st.st_size, st.st_mtime_ns]:
+        return None
+    return manifest
+
+
+def file_entry(file_path, previous):
+    """{size, mtime_ns, sha256}; the hash is reused when size and mtime match."""
+    st = file_path.stat()
+    if previous and previous["size"] == st.st_size and previous["mtime_ns"] == st.st_mtime_ns:
+        return previous
+    digest = hashlib.sha256(file_path.read_bytes()).hexdigest()
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest}
+
+
+def zip_info(arcname, executable):
+    info = zipfile.ZipInfo(arcname, date_time=FIXED_DATE_TIME)
+    info.compress_type = zipfile.ZIP_DEFLATED
+    info.create_system = 3  # Unix, so the mode bits below are honoured
+    info.external_attr = (0o100755 if executable else 0o100644) << 16
+    return info
+
+
+def copy_compressed(src, old_info, dst):
+    """Append old_info's entry to dst without decompressing it. zipfile has
+    no public API for this, so write the local header and raw bytes by hand
+    and register the entry for the central directory."""
+    src.fp.seek(old_info.header_offset)
+    header = src.fp.read(30)
+    name_len, extra_len = struct.unpack('<HH', header[26:30])
+    src.fp.seek(old_info.header_offset + 30 + name_len + extra_len)
+    data = src.fp.read(old_info.compress_size)
+
+    info = zip_info(old_info.filename, old_info.external_attr >> 16 & 0o111)
+    info.compress_type = old_info.compress_type
+    info.CRC = old_info.CRC
+    info.compress_size = old_info.compress_size
+    info.file_size = old_info.file_size
+    info.header_offset = dst.fp.tell()
+    dst.fp.write(info.FileHeader())
+    dst.fp.write(data)
+    dst.filelist.append(info)
+    dst.NameToInfo[info.filename] = info
+    dst.start_dir = dst.fp.tell()
+    dst._didModify = True
+
+
 def package_skill(skill_path, output_dir=None):
     """
     Package a skill folder into a .skill file.
@@ -37,7 +126,7 @@ def package_skill(skill_path, output_dir=None):
         output_dir: Optional output directory for the .skill file (defaults to current directory)
 
     Returns:
-        Tuple of (Path to created .skill file, error message) - one will be None
+        Tuple of (result dict with "path" and build stats, error message) - one will be None
     """
     skill_path = Path(skill_path).resolve()
 
@@ -53,13 +142,6 @@ def package_skill(skill_path, output_dir=None):
     if not skill_md.exists():
         return None, f"SKILL.md not found in {skill_path}"
 
-    # Run validation before packaging
-    print("Validating skill...", file=sys.stderr)
-    valid, message = validate_skill(skill_path)
-    if not valid:
-        return None, f"Validation failed: {message}"
-    print(f"Validation passed: {message}", file=sys.stderr)
-
     # Determine output location
     skill_name = skill_path.name
     if output_dir:
@@ -70,24 +152,76 @@ def package_skill(skill_path, output_dir=None):
 
     skill_filename = output_path / f"{skill_name}.skill"
 
-    # Create the .skill file (zip format)
+    manifest = load_manifest(skill_filename)
+    previous = manifest["files"] if manifest else {}
+    files = skill_files(skill_path)
     try:
-        with zipfile.ZipFile(skill_filename, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            # Walk through the skill directory
-            for file_path in skill_path.rglob('*'):
-                if file_path.is_file():
-                    # Calculate the relative path within the zip
-                    arcname = file_path.relative_to(skill_path.parent)
-                    zipf.write(file_path, arcname)
-                    print(f"  Added: {arcname}", file=sys.stderr)
-
-        print(f"Successfully packaged skill to: {skill_filename}", file=sys.stderr)
-        return skill_filename, None
+        entries = {arcname: file_entry(path, previous.get(arcname)) for arcname, path in files}
+    except OSError as e:
+        return None, f"Error reading skill files: {e}"
+
+    if manifest and {a: e["sha256"] for a, e in entries.items()} == \
+            {a: e["sha256"] for a, e in previous.items()}:
+        print(f"Unchanged, skipping: {skill_filename}", file=sys.stderr)
+        if entries != previous:  # touched but identical: remember the new stats
+            write_manifest(skill_filename, entries)
+        return {"path": skill_filename, "unchanged": True, "files": len(files),
+                "recompressed": 0, "reused": 0}, None
+
+    # Run validation before packaging
+    print("Validating skill...", file=sys.stderr)
+    valid, message = validate_skill(skill_path)
+    if not valid:
+        return None, f"Validation failed: {message}"
+    print(f"Validation passed: {message}", file=sys.stderr)
+
+    # Create the .skill file (zip format) next to the old one, then swap
+    tmp_filename = skill_filename.with_name(f".{skill_filename.name}.tmp")
+    recompressed = reused = 0
+    try:
+        old = zipfile.ZipFile(skill_filename) if manifest else None
+        try:
+            with zipfile.ZipFile(tmp_filename, 'w', zipfile.ZIP_DEFLATED,
+                                 compresslevel=COMPRESS_LEVEL) as zipf:
+                for arcname, file_path in files:
+                    prev = previous.get(arcname)
+                    old_info = old.NameToInfo.get(arcname) if old else None
+                    if old_info and prev and prev["sha256"] == entries[arcname]["sha256"]:
+                        copy_compressed(old, old_info, zipf)
+                        reused += 1
+                    else:
+                        executable = os.access(file_path, os.X_OK)
+                        zipf.writestr(zip_info(arcname, executable), file_path.read_bytes())
+                        print(f"  Added: {arcname}", file=sys.stderr)
+                        recompressed += 1
+        finally:
+            if old:
+                old.close()
+        tmp_filename.replace(skill_filename)
+        write_manifest(skill_filename, entries)
+
+        print(f"Successfully packaged skill to: {skill_filename} "
+              f"({recompressed} compressed, {reused} reused)", file=sys.stderr)
+        return {"path": skill_filename, "unchanged": False, "files": len(files),
+                "recompressed": recompressed, "reused": reused}, None
 
     except Exception as e:
+        tmp_filename.unlink(missing_ok=True)
         return None, f"Error creating .skill file: {e}"
 
 
+def write_manifest(archive, entries):
+    st = archive.stat()
+    try:
+        MANIFEST_DIR.mkdir(parents=True, exist_ok=True)
+        path = manifest_path(archive)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"archive": [st.st_size, st.st_mtime_ns], "files": entries}))
+        tmp.replace(path)
+    except OSError:
+        pass
+
+
 def parse_args():
     """Parse arguments from stdin JSON."""
     if sys.stdin.isatty():
@@ -123,7 +257,7 @@ def main():
     result, error = package_skill(skill_path, output_dir)
 
     if result:
-        output_json({"status": "ok", "path": str(result)})
+        output_json({"status": "ok", **result, "path": str(result["path"])})
         sys.exit(0)
     else:
         output_json({"error": error})
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Release packager - packages every skill in parallel and writes an index
+
+Usage (JSON via stdin):
+    # Every plugin listed in .claude-plugin/marketplace.json
+    package_skills.py <<'EOF'
+    {"output_dir": "./dist"}
+    EOF
+
+    # Every skill under agents/skills (or other roots)
+    package_skills.py <<'EOF'
+    {"from": "skills", "output_dir": "./dist"}
+    EOF
+
+JSON input fields:
+    output_dir: Where the .skill files and index.json go (required)
+    from: "marketplace" (default) or "skills"
+    marketplace: Marketplace manifest path (default: this repo's .claude-plugin/marketplace.json)
+    roots: Skill directories to scan with "from": "skills" (default: this repo's agents/skills)
+    workers: Process pool size (default: CPU count)
+
+Each skill is packaged by package_skill.package_skill() — validated,
+incremental and reproducible — on a process pool. Skills are submitted
+largest first, so the biggest one starts immediately and the small ones
+fill in around it: the whole build takes about as long as the largest
+skill rather than the sum of all of them.
+
+Marketplace plugins whose `source` isn't a local path (e.g. a GitHub
+source) are listed in the index as skipped.
+
+Writes <output_dir>/index.json:
+    {"skills": [{"name": "...", "source": "...", "archive": "name.skill",
+                 "bytes": 12345, "sha256": "...", "files": 12}]}
+
+Outputs JSON to stdout:
+    {"status": "ok", "index": "/path/to/dist/index.json", "packaged": 25, "failed": 0,
+     "wall_seconds": 0.8, "sum_seconds": 3.1,
+     "skills": [{"name": "...", "seconds": 0.12, "unchanged": false, ...}]}
+    Error: {"error": "message"}
+
+Exit codes:
+    0 - Every skill packaged
+    1 - Some skill failed (see its "error"), or invalid arguments
+"""
+
+import sys
+import json
+import time
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from package_skill import package_skill, skill_files
+from validate_skills import DEFAULT_ROOT, find_skills
+
+REPO_ROOT = DEFAULT_ROOT.parents[1]
+DEFAULT_MARKETPLACE = REPO_ROOT / ".claude-plugin" / "marketplace.json"
+
+
+def output_json(data: dict) -> None:
+    """Output structured JSON to stdout."""
+    print(json.dumps(data))
+
+
+def marketplace_skills(manifest_path):
+    """(name, source dir or None) for each plugin in a marketplace manifest.
+    Local sources are relative to the repo holding .claude-plugin/."""
+    manifest = json.loads(Path(manifest_path).read_text())
+    base = Path(manifest_path).resolve().parent.parent
+    skills = []
+    for plugin in manifest.get("plugins", []):
+        source = plugin.get("source")
+        local = isinstance(source, str) and source.startswith(("./", "../"))
+        skills.append((plugin["name"], (base / source).resolve() if local else None))
+    return skills
+
+
+def tree_size(skill_path):
+    return sum(path.stat().st_size for _, path in skill_files(Path(skill_path)))
+
+
+def build_one(name, source, output_dir):
+    """Package one skill; runs in a worker process."""
+    start = time.perf_counter()
+    result, error = package_skill(source, output_dir)
+    entry = {"name": name, "source": str(source), "seconds": round(time.perf_counter() - start, 3)}
+    if error:
+        entry["error"] = error
+        return entry
+    archive = Path(result["path"])
+    entry.update(
+        archive=archive.name,
+        bytes=archive.stat().st_size,
+        sha256=hashlib.sha256(archive.read_bytes()).hexdigest(),
+        files=result["files"],
+        unchanged=result["unchanged"],
+    )
+    return entry
+
+
+def package_all(skills, output_dir, workers=None):
+    """Package (name, source) pairs in parallel, largest first."""
+    local = [(name, source) for name, source in skills if source is not None]
+    local.sort(key=lambda s: tree_size(s[1]), reverse=True)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(build_one, name, source, output_dir) for name, source in local]
+        results = [f.result() for f in futures]
+    results += [{"name": name, "source": None, "skipped": "not a local source"}
+                for name, source in skills if source is None]
+    return sorted(results, key=lambda r: r["name"])
+
+
+def write_index(output_dir, results):
+    """index.json: one entry per skill, without build timings, so it's as
+    reproducible as the archives it describes."""
+    keys = ("archive", "bytes", "sha256", "files", "error", "skipped")
+    skills = []
+    for r in results:
+        entry = {"name": r["name"]}
+        if r.get("source"):
+            source = Path(r["source"])
+            entry["source"] = str(source.relative_to(REPO_ROOT)) if source.is_relative_to(REPO_ROOT) else str(source)
+        entry.update((k, r[k]) for k in keys if k in r)
+        skills.append(entry)
+    index_path = Path(output_dir) / "index.json"
+    index_path.write_text(json.dumps({"skills": skills}, indent=2) + "\n")
+    return index_path
+
+
+def parse_args():
+    """Parse arguments from stdin JSON."""
+    if sys.stdin.isatty():
+        print("Error: This script requires JSON input via stdin", file=sys.stderr)
+        print("Usage: package_skills.py <<'EOF'", file=sys.stderr)
+        print('{"output_dir": "./dist"}', file=sys.stderr)
+        print("EOF", file=sys.stderr)
+        output_json({"error": "This script requires JSON input via stdin"})
+        sys.exit(1)
+
+    try:
+        data = json.load(sys.stdin)
+    except json.JSONDecodeError as e:
+        print(f"Error: Invalid JSON input: {e}", file=sys.stderr)
+        output_json({"error": f"Invalid JSON input: {e}"})
+        sys.exit(1)
+
+    output_dir = data.get("output_dir")
+    if not output_dir:
+        print("Error: Missing required field 'output_dir'", file=sys.stderr)
+        output_json({"error": "Missing required field 'output_dir'"})
+        sys.exit(1)
+    source = data.get("from", "marketplace")
+    if source not in ("marketplace", "skills"):
+        print(f"Error: 'from' must be 'marketplace' or 'skills', got {source!r}", file=sys.stderr)
+        output_json({"error": f"'from' must be 'marketplace' or 'skills', got {source!r}"})
+        sys.exit(1)
+
+    class Args:
+        pass
+    args = Args()
+    args.output_dir = Path(output_dir).expanduser().resolve()
+    args.source = source
+    args.marketplace = Path(data.get("marketplace") or DEFAULT_MARKETPLACE).expanduser()
+    args.roots = [Path(r).expanduser() for r in data.get("roots") or [DEFAULT_ROOT]]
+    args.workers = data.get("workers")
+    return args
+
+
+def main():
+    args = parse_args()
+
+    try:
+        if args.source == "marketplace":
+            skills = marketplace_skills(args.marketplace)
+        else:
+            skills = [(Path(p).name, Path(p).resolve()) for p in find_skills(args.roots)]
+    except (OSError, json.JSONDecodeError, KeyError) as e:
+        print(f"Error: Could not read skill list: {e}", file=sys.stderr)
+        output_json({"error": f"Could not read skill list: {e}"})
+        sys.exit(1)
+
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    print(f"Packaging {len(skills)} skills into {args.output_dir}...", file=sys.stderr)
+    start = time.perf_counter()
+    results = package_all(skills, args.output_dir, args.workers)
+    wall = time.perf_counter() - start
+    index_path = write_index(args.output_dir, results)
+
+    failed = [r for r in results if "error" in r]
+    for r in failed:
+        print(f"FAILED {r['name']}: {r['error']}", file=sys.stderr)
+    output_json({
+        "status": "ok",
+        "index": str(index_path),
+        "packaged": sum(1 for r in results if "archive" in r),
+        "failed": len(failed),
+        "wall_seconds": round(wall, 3),
+        "sum_seconds": round(sum(r.get("seconds", 0) for r in results), 3),
+        "skills": results,
+    })
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,20 +11,151 @@ Outputs JSON to stdout:
     Success: {"status": "ok", "valid": true, "message": "Skill is valid!"}
     Invalid: {"status": "ok", "valid": false, "message": "Error description"}
     Error:   {"error": "message"}
+
+Only the frontmatter is read (up to the closing `---`). It is parsed by a
+small built-in parser covering what skill frontmatter uses; PyYAML is only
+imported for frontmatter beyond that (anchors, flow collections, non-string
+scalars...). bench_frontmatter.py compares this against a full PyYAML load.
 """
 
 import sys
 import os
 import re
 import json
-import yaml
 from pathlib import Path
 
+KEY_RE = re.compile(r'^([A-Za-z0-9_-]+):(?:[ \t]+(.*?))?[ \t]*$')
+BLOCK_SCALAR_RE = re.compile(r'^([|>])([-+]?)$')
+# Plain scalars YAML would resolve to something other than a string (bools
+# incl. YAML 1.1 yes/no/on/off, null, numbers, dates) — left to PyYAML.
+NON_STRING_RE = re.compile(
+    r'^(?:~|null|Null|NULL|true|True|TRUE|false|False|FALSE|yes|Yes|YES|no|No|NO'
+    r'|on|On|ON|off|Off|OFF|y|Y|n|N|[-+.]?[0-9].*|\.(?:inf|Inf|INF|nan|NaN|NAN))$'
+)
+# First characters that make a plain scalar something else in YAML
+# (anchors, aliases, tags, flow collections, directives...).
+INDICATORS = set('&*!{}[]%@`,?-#')
+
+
+class ComplexYAML(Exception):
+    """Frontmatter uses YAML beyond what parse_simple_yaml handles."""
+
 
 def output_json(data: dict) -> None:
     """Output structured JSON to stdout."""
     print(json.dumps(data))
 
+def read_frontmatter(skill_md):
+    """Frontmatter text of SKILL.md, reading only up to the closing `---`.
+
+    Returns None when the file doesn't open with `---`, and False when the
+    frontmatter is never closed."""
+    with open(skill_md, encoding='utf-8') as f:
+        if not f.readline().startswith('---'):
+            return None
+        lines = []
+        for line in f:
+            if line.startswith('---'):
+                return ''.join(lines).rstrip('\n')
+            lines.append(line)
+    return False
+
+
+def parse_scalar(value):
+    """A single-line YAML scalar as a string; ComplexYAML if unsure."""
+    if value[0] == "'":
+        if len(value) < 2 or not value.endswith("'") or "'" in value[1:-1].replace("''", ''):
+            raise ComplexYAML(value)
+        return value[1:-1].replace("''", "'")
+    if value[0] == '"':
+        if len(value) < 2 or not value.endswith('"') or '\\' in value or '"' in value[1:-1]:
+            raise ComplexYAML(value)
+        return value[1:-1]
+    value = value.split(' #', 1)[0].rstrip()
+    if value[0] in INDICATORS or ': ' in value or value.endswith(':') or NON_STRING_RE.match(value):
+        raise ComplexYAML(value)
+    return value
+
+
+def block_scalar(style, chomp, lines, at_end):
+    """Literal (|) or folded (>) block scalar from its indented lines.
+    `at_end`: the block closes the text with no final line break, so there
+    is no break for clip chomping to keep."""
+    if chomp == '+':
+        raise ComplexYAML('keep chomping')
+    indent = min(len(l) - len(l.lstrip(' ')) for l in lines if l.strip())
+    body = [l[indent:] for l in lines]
+    while body and not body[-1].strip():
+        body.pop()
+    if style == '>':
+        # Blank lines and more-indented lines fold differently; leave to PyYAML
+        if any(not l.strip() or l.startswith((' ', '\t')) for l in body):
+            raise ComplexYAML('folded block with structure')
+        text = ' '.join(body)
+    else:
+        text = '\n'.join(body)
+    return text if chomp == '-' or at_end else text + '\n'
+
+
+def parse_simple_yaml(text, nested=False):
+    """Parse the restricted YAML skill frontmatter uses: `key: scalar`,
+    block scalars, lists of scalars, and one nested mapping (`metadata`).
+    Raises ComplexYAML for anything else."""
+    lines = text.split('\n')
+    result = {}
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        i += 1
+        if not line.strip() or line.startswith('#'):
+            continue
+        if line[0] in ' \t':
+            raise ComplexYAML(line)  # continuation of a multi-line plain scalar
+        m = KEY_RE.match(line)
+        if not m:
+            raise ComplexYAML(line)
+        key, value = m.group(1), m.group(2) or ''
+        body = []
+        while i < len(lines) and (not lines[i].strip() or lines[i][0] == ' '):
+            body.append(lines[i])
+            i += 1
+        if i < len(lines) and lines[i][0] == '\t':
+            raise ComplexYAML(key)  # tabs can't indent YAML
+        content = [l for l in body if l.strip()]
+
+        block = BLOCK_SCALAR_RE.match(value)
+        if block and content:
+            at_end = i == len(lines) and not text.endswith('\n')
+            result[key] = block_scalar(block.group(1), block.group(2), body, at_end)
+        elif value and not content:
+            result[key] = parse_scalar(value)
+        elif value or not content:
+            raise ComplexYAML(key)  # null, or a value followed by indented lines
+        else:
+            items = [l.strip() for l in content if not l.lstrip().startswith('#')]
+            if all(item.startswith('- ') for item in items):
+                result[key] = [parse_scalar(item[2:].strip()) for item in items]
+            elif nested:
+                raise ComplexYAML(key)
+            else:
+                width = min(len(l) - len(l.lstrip(' ')) for l in content)
+                result[key] = parse_simple_yaml('\n'.join(l[width:] for l in body), nested=True)
+    return result
+
+
+def load_frontmatter(text):
+    """Parse frontmatter text; PyYAML only when the built-in parser can't."""
+    try:
+        return parse_simple_yaml(text) or None
+    except ComplexYAML:
+        pass
+    import yaml  # deferred: most skills never need it
+    try:
+        return yaml.safe_load(text)
+    except yaml.YAMLError as e:
+        raise ValueError(str(e)) from e
+
+
 def validate_skill(skill_path):
     """Basic validation of a skill"""
     skill_path = Path(skill_path)
@@ -35,23 +166,18 @@ def validate_skill(skill_path):
         return False, "SKILL.md not found"
 
     # Read and validate frontmatter
-    content = skill_md.read_text()
-    if not content.startswith('---'):
+    frontmatter_text = read_frontmatter(skill_md)
+    if frontmatter_text is None:
         return False, "No YAML frontmatter found"
-
-    # Extract frontmatter
-    match = re.match(r'^---\n(.*?)\n---', content, re.DOTALL)
-    if not match:
+    if frontmatter_text is False or not frontmatter_text.strip():
         return False, "Invalid frontmatter format"
 
-    frontmatter_text = match.group(1)
-
     # Parse YAML frontmatter
     try:
-        frontmatter = yaml.safe_load(frontmatter_text)
+        frontmatter = load_frontmatter(frontmatter_text)
         if not isinstance(frontmatter, dict):
             return False, "Frontmatter must be a YAML dictionary"
-    except yaml.YAMLError as e:
+    except ValueError as e:
         return False, f"Invalid YAML in frontmatter: {e}"
 
     # Define allowed properties
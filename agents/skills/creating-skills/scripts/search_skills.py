@@ -0,0 +1,478 @@
+#!/usr/bin/env python3
+"""
+Skill search - ranked skills and reference sections for a free-text query
+
+Usage (JSON via stdin):
+    search_skills.py <<'EOF'
+    {"query": "cloudflare kv bulk writes"}
+    EOF
+
+    # Other skill directories, more results
+    search_skills.py <<'EOF'
+    {"query": "review a pull request", "roots": ["~/.dotfiles/agents/skills"], "limit": 10}
+    EOF
+
+JSON input fields:
+    query: Free text to search for (required unless "rebuild" is set)
+    roots: Directories to search for skills (default: the agents/skills dir this script lives in)
+    limit: Maximum skills and sections returned, each (default: 5)
+    refresh: Bring the index up to date before querying (default: true)
+    rebuild: Drop the index and build it from scratch (default: false)
+
+The index is an inverted index in SQLite under
+$XDG_CACHE_HOME/creating-skills/, one per set of roots. Every skill gets a
+document of its name, description (read with quick_validate's frontmatter
+parser) and SKILL.md headings; every heading section of every markdown
+file in a skill — SKILL.md and its references — gets a document of its
+heading, file path and text. Both are ranked with BM25. A skill's score is
+its own document's plus a share of its best section's, so a skill whose
+references answer the query ranks even when its description doesn't say so.
+
+Before each query the index is refreshed incrementally: only markdown
+files whose size or mtime changed are re-read, and removed files are
+dropped. A query against an up-to-date index touches only the postings
+of its own terms.
+
+Parallel queries share the index. Queries read it without locking;
+anything that writes it holds <index>.lock. A missing, outdated or
+rebuilt index is built under a temporary name and renamed into place, so
+a query never sees it half-built, and a refresh re-reads the index state
+inside its own write transaction.
+
+Outputs JSON to stdout:
+    {"status": "ok", "query": "...",
+     "skills": [{"name": "cloudflare", "path": "...", "description": "...", "score": 12.3}],
+     "sections": [{"skill": "cloudflare", "path": ".../references/kv/api.md",
+                   "heading": "Bulk writes", "line": 42, "score": 9.8}],
+     "index": {"files": 431, "documents": 5210, "reindexed": 0, "removed": 0, "ms": 4.1}}
+    Error: {"error": "message"}
+
+Exit codes:
+    0 - Query ran (possibly with no matches)
+    1 - Invalid arguments
+"""
+
+import sys
+import os
+import fcntl
+import re
+import json
+import math
+import time
+import sqlite3
+import hashlib
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from quick_validate import load_frontmatter, read_frontmatter
+from validate_skills import DEFAULT_ROOT, find_skills, skill_markdown
+
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "creating-skills"
+# Bumped whenever tokenizing or the schema changes; older indexes are rebuilt.
+SCHEMA_VERSION = 1
+# Standard BM25 parameters.
+K1 = 1.2
+B = 0.75
+# Field weights, applied as term-frequency multipliers (a cheap BM25F).
+NAME_WEIGHT = 3
+DESCRIPTION_WEIGHT = 2
+HEADING_WEIGHT = 2
+# How much of a skill's best section counts towards the skill's own rank.
+SECTION_SHARE = 0.5
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+HEADING_RE = re.compile(r"^(#{1,6})[ \t]+(.+?)[ \t#]*$")
+FENCE_RE = re.compile(r"^[ \t]*(```|~~~)")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from how i if in into is it its of on or that the "
+    "this to use using was what when which with you your".split()
+)
+
+SCHEMA = """
+CREATE TABLE files (path TEXT PRIMARY KEY, skill TEXT NOT NULL, size INTEGER, mtime_ns INTEGER);
+CREATE TABLE skills (path TEXT PRIMARY KEY, name TEXT NOT NULL, description TEXT NOT NULL);
+CREATE TABLE docs (id INTEGER PRIMARY KEY, file TEXT NOT NULL, skill TEXT NOT NULL,
+                   kind TEXT NOT NULL, heading TEXT, line INTEGER, length INTEGER NOT NULL);
+CREATE INDEX docs_file ON docs (file);
+CREATE TABLE terms (id INTEGER PRIMARY KEY, term TEXT NOT NULL UNIQUE);
+CREATE TABLE postings (term INTEGER NOT NULL, doc INTEGER NOT NULL, tf INTEGER NOT NULL,
+                       PRIMARY KEY (term, doc)) WITHOUT ROWID;
+"""
+
+
+def output_json(data: dict) -> None:
+    """Output structured JSON to stdout."""
+    print(json.dumps(data))
+
+
+def stem(token):
+    """Strip the commonest English suffixes so "tests", "tested" and
+    "testing" meet at "test". Deliberately timid: short words are kept."""
+    for suffix in ("ing", "ed", "s"):
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3 and not token.endswith("ss"):
+            return token[:-len(suffix)]
+    return token
+
+
+def tokenize(text):
+    return [stem(t) for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+def index_path(roots):
+    key = "\n".join(sorted(os.path.realpath(r) for r in roots))
+    return CACHE_DIR / f"search-index-{hashlib.sha256(key.encode()).hexdigest()[:12]}.sqlite"
+
+
+@contextmanager
+def index_lock(path):
+    """Held by whatever writes the index or replaces its file."""
+    with open(path.with_name(f"{path.name}.lock"), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        yield
+
+
+def schema_version(path):
+    """The index file's schema version; None when missing or unreadable."""
+    try:
+        db = sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True, timeout=30)
+    except sqlite3.Error:
+        return None
+    try:
+        return db.execute("PRAGMA user_version").fetchone()[0]
+    except sqlite3.Error:
+        return None
+    finally:
+        db.close()
+
+
+def open_index(path, roots, rebuild=False, update=True):
+    """Open the index, building or refreshing it first as needed.
+    Returns (db, reindexed, removed)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with index_lock(path):
+        if rebuild or schema_version(path) != SCHEMA_VERSION:
+            # Never touch a file other queries may have open: build aside.
+            tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+            tmp.unlink(missing_ok=True)
+            db = sqlite3.connect(tmp, timeout=30)
+            try:
+                db.executescript(SCHEMA)
+                db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+                db.commit()
+                reindexed, removed = refresh(db, scan(roots))
+            finally:
+                db.close()
+            os.replace(tmp, path)
+            return sqlite3.connect(path, timeout=30), reindexed, removed
+        db = sqlite3.connect(path, timeout=30)
+        inode = os.stat(path).st_ino
+    if not update:
+        return db, 0, 0
+    seen = scan(roots)
+    if not any(changes(db, seen)):
+        return db, 0, 0
+    with index_lock(path):
+        if os.stat(path).st_ino != inode:
+            # Rebuilt since we opened it; writing the old file would leave a
+            # journal next to the new one.
+            db.close()
+            db = sqlite3.connect(path, timeout=30)
+        reindexed, removed = refresh(db, seen)
+    return db, reindexed, removed
+
+
+def skill_meta(skill_path):
+    """(name, description) from the frontmatter, falling back to the
+    directory name when it's missing or unparseable."""
+    try:
+        text = read_frontmatter(Path(skill_path) / "SKILL.md")
+        frontmatter = load_frontmatter(text) if text else None
+    except (OSError, ValueError):
+        frontmatter = None
+    if not isinstance(frontmatter, dict):
+        frontmatter = {}
+    name = frontmatter.get("name")
+    description = frontmatter.get("description")
+    return (name if isinstance(name, str) else Path(skill_path).name,
+            description.strip() if isinstance(description, str) else "")
+
+
+def sections(text):
+    """(heading, line, body) per heading section; text before the first
+    heading is a section with no heading. Headings in code fences don't count."""
+    found = []
+    heading, line, body = None, 1, []
+    fence = None
+    for number, raw in enumerate(text.splitlines(), 1):
+        fence_match = FENCE_RE.match(raw)
+        if fence_match:
+            marker = fence_match.group(1)
+            fence = None if fence == marker else fence or marker
+        match = None if fence else HEADING_RE.match(raw)
+        if match:
+            if heading is not None or any(b.strip() for b in body):
+                found.append((heading, line, "\n".join(body)))
+            heading, line, body = match.group(2), number, []
+        else:
+            body.append(raw)
+    if heading is not None or any(b.strip() for b in body):
+        found.append((heading, line, "\n".join(body)))
+    return found
+
+
+def strip_frontmatter(text):
+    """Body of a markdown file and the 1-based line it starts on."""
+    if text.startswith("---"):
+        end = text.find("\n---", 3)
+        if end != -1:
+            rest = text.find("\n", end + 4)
+            rest = len(text) if rest == -1 else rest + 1
+            return text[rest:], text.count("\n", 0, rest) + 1
+    return text, 1
+
+
+def weighted(*fields):
+    """Term counts over (text, weight) fields, and the weighted length."""
+    counts = Counter()
+    for text, weight in fields:
+        for token in tokenize(text):
+            counts[token] += weight
+    return counts, sum(counts.values())
+
+
+def file_documents(skill_path, file_path, name, description):
+    """(kind, heading, line, counts, length) per document of one file."""
+    text = Path(file_path).read_text(encoding="utf-8", errors="replace")
+    rel = os.path.relpath(file_path, skill_path)
+    docs = []
+    body, first_line = text, 1
+    if rel == "SKILL.md":
+        body, first_line = strip_frontmatter(text)
+        found = sections(body)
+        headings = " ".join(h for h, _, _ in found if h)
+        counts, length = weighted((name.replace("-", " "), NAME_WEIGHT),
+                                  (description, DESCRIPTION_WEIGHT), (headings, 1))
+        docs.append(("skill", name, 1, counts, length))
+    else:
+        found = sections(body)
+    # The path inside the skill ("references/kv/api") says what a file is about.
+    location = os.path.splitext(rel)[0].replace(os.sep, " ")
+    for heading, line, section_body in found:
+        counts, length = weighted((f"{heading or ''} {location}", HEADING_WEIGHT), (section_body, 1))
+        if length:
+            docs.append(("section", heading, line + first_line - 1, counts, length))
+    return docs
+
+
+def scan(roots):
+    """{real path: (skill, size, mtime_ns)} of every skill markdown file."""
+    seen = {}
+    for skill in find_skills(roots):
+        for file_path in skill_markdown(skill):
+            real = os.path.realpath(file_path)
+            if real in seen:
+                continue
+            try:
+                st = os.stat(real)
+            except OSError:
+                continue
+            seen[real] = (skill, st.st_size, st.st_mtime_ns)
+    return seen
+
+
+def changes(db, seen):
+    """(changed [(path, skill, size, mtime_ns)], removed [path]) of the index
+    against a scan."""
+    indexed = {path: (skill, size, mtime) for path, skill, size, mtime in db.execute(
+        "SELECT path, skill, size, mtime_ns FROM files")}
+    changed = [(real, *stat) for real, stat in seen.items() if indexed.get(real) != stat]
+    removed = [path for path in indexed if path not in seen]
+    return changed, removed
+
+
+def refresh(db, seen):
+    """Re-index changed files, drop removed ones. Callers hold index_lock;
+    the index is re-read inside the write transaction, since another
+    process may have refreshed it since it was last looked at. Returns
+    (reindexed, removed)."""
+    db.execute("BEGIN IMMEDIATE")
+    try:
+        changed, removed = changes(db, seen)
+        if changed or removed:
+            apply_changes(db, seen, changed, removed)
+        db.commit()
+    except BaseException:
+        db.rollback()
+        raise
+    return len(changed), len(removed)
+
+
+def apply_changes(db, seen, changed, removed):
+    """Drop the documents of changed and removed files, and index the changed ones."""
+    stale = [path for path, *_ in changed] + removed
+    db.execute("CREATE TEMP TABLE IF NOT EXISTS stale (id INTEGER PRIMARY KEY)")
+    db.execute("DELETE FROM stale")
+    for path in stale:
+        db.execute("INSERT INTO stale SELECT id FROM docs WHERE file = ?", (path,))
+    db.execute("DELETE FROM postings WHERE doc IN stale")
+    db.execute("DELETE FROM docs WHERE id IN stale")
+    db.executemany("DELETE FROM files WHERE path = ?", [(p,) for p in stale])
+    live_skills = {skill for skill, _, _ in seen.values()}
+    db.executemany("DELETE FROM skills WHERE path = ?",
+                   [(s,) for (s,) in db.execute("SELECT path FROM skills") if s not in live_skills])
+
+    term_ids = dict(db.execute("SELECT term, id FROM terms"))
+    meta = {}
+    for real, skill, size, mtime_ns in changed:
+        if os.path.basename(real) == "SKILL.md" or skill not in meta:
+            meta[skill] = skill_meta(skill)
+        name, description = meta[skill]
+        if os.path.basename(real) == "SKILL.md":
+            db.execute("INSERT OR REPLACE INTO skills VALUES (?, ?, ?)", (skill, name, description))
+        try:
+            docs = file_documents(skill, real, name, description)
+        except OSError:
+            continue
+        for kind, heading, line, counts, length in docs:
+            doc = db.execute(
+                "INSERT INTO docs (file, skill, kind, heading, line, length) VALUES (?, ?, ?, ?, ?, ?)",
+                (real, skill, kind, heading, line, length),
+            ).lastrowid
+            for term in counts.keys() - term_ids.keys():
+                term_ids[term] = db.execute("INSERT INTO terms (term) VALUES (?)", (term,)).lastrowid
+            db.executemany("INSERT INTO postings VALUES (?, ?, ?)",
+                           [(term_ids[term], doc, tf) for term, tf in counts.items()])
+        db.execute("INSERT INTO files VALUES (?, ?, ?, ?)", (real, skill, size, mtime_ns))
+
+
+def search(db, query, limit):
+    """BM25-ranked (skills, sections) for a query."""
+    words = sorted(set(tokenize(query)))
+    total, avg_length = db.execute("SELECT COUNT(*), AVG(length) FROM docs").fetchone()
+    if not words or not total:
+        return [], []
+    terms = [t for (t,) in db.execute(
+        f"SELECT id FROM terms WHERE term IN ({','.join('?' * len(words))})", words)]
+    if not terms:
+        return [], []
+    marks = ",".join("?" * len(terms))
+    idf = {
+        term: math.log(1 + (total - df + 0.5) / (df + 0.5))
+        for term, df in db.execute(
+            f"SELECT term, COUNT(*) FROM postings WHERE term IN ({marks}) GROUP BY term", terms)
+    }
+
+    scores = defaultdict(float)
+    lengths = {}
+    for term, doc, tf, length in db.execute(
+        f"SELECT p.term, p.doc, p.tf, d.length FROM postings p JOIN docs d ON d.id = p.doc "
+        f"WHERE p.term IN ({marks})", terms,
+    ):
+        norm = K1 * (1 - B + B * length / avg_length)
+        scores[doc] += idf[term] * tf * (K1 + 1) / (tf + norm)
+        lengths[doc] = length
+    if not scores:
+        return [], []
+
+    docs = {}
+    ids = list(scores)
+    for start in range(0, len(ids), 900):
+        chunk = ids[start:start + 900]
+        for row in db.execute(
+            f"SELECT id, file, skill, kind, heading, line FROM docs WHERE id IN ({','.join('?' * len(chunk))})",
+            chunk,
+        ):
+            docs[row[0]] = row[1:]
+
+    own, best_section = defaultdict(float), defaultdict(float)
+    section_hits = []
+    for doc, score in scores.items():
+        file_path, skill, kind, heading, line = docs[doc]
+        if kind == "skill":
+            own[skill] += score
+        else:
+            best_section[skill] = max(best_section[skill], score)
+            section_hits.append((score, skill, file_path, heading, line))
+
+    meta = dict(((path, (name, description)) for path, name, description
+                 in db.execute("SELECT path, name, description FROM skills")))
+    ranked = sorted(set(own) | set(best_section),
+                    key=lambda s: own[s] + SECTION_SHARE * best_section[s], reverse=True)
+    skills = []
+    for skill in ranked[:limit]:
+        name, description = meta.get(skill, (Path(skill).name, ""))
+        skills.append({"name": name, "path": skill, "description": description,
+                       "score": round(own[skill] + SECTION_SHARE * best_section[skill], 3)})
+    section_hits.sort(key=lambda h: h[0], reverse=True)
+    found_sections = [
+        {"skill": meta.get(skill, (Path(skill).name,))[0], "path": file_path,
+         "heading": heading, "line": line, "score": round(score, 3)}
+        for score, skill, file_path, heading, line in section_hits[:limit]
+    ]
+    return skills, found_sections
+
+
+def parse_args():
+    """Parse arguments from stdin JSON."""
+    if sys.stdin.isatty():
+        print("Error: This script requires JSON input via stdin", file=sys.stderr)
+        print("Usage: search_skills.py <<'EOF'", file=sys.stderr)
+        print('{"query": "cloudflare kv bulk writes"}', file=sys.stderr)
+        print("EOF", file=sys.stderr)
+        output_json({"error": "This script requires JSON input via stdin"})
+        sys.exit(1)
+
+    try:
+        data = json.load(sys.stdin)
+    except json.JSONDecodeError as e:
+        print(f"Error: Invalid JSON input: {e}", file=sys.stderr)
+        output_json({"error": f"Invalid JSON input: {e}"})
+        sys.exit(1)
+
+    if not data.get("query") and not data.get("rebuild"):
+        print("Error: Missing required field 'query'", file=sys.stderr)
+        output_json({"error": "Missing required field 'query'"})
+        sys.exit(1)
+    roots = [Path(r).expanduser() for r in data.get("roots") or [DEFAULT_ROOT]]
+    missing = [str(r) for r in roots if not r.is_dir()]
+    if missing:
+        print(f"Error: Not a directory: {', '.join(missing)}", file=sys.stderr)
+        output_json({"error": f"Not a directory: {', '.join(missing)}"})
+        sys.exit(1)
+
+    class Args:
+        pass
+    args = Args()
+    args.query = data.get("query") or ""
+    args.roots = roots
+    args.limit = data.get("limit", 5)
+    args.refresh = data.get("refresh", True)
+    args.rebuild = data.get("rebuild", False)
+    return args
+
+
+def main():
+    args = parse_args()
+
+    start = time.perf_counter()
+    db, reindexed, removed = open_index(index_path(args.roots), args.roots, args.rebuild, args.refresh)
+    if reindexed or removed:
+        print(f"Indexed {reindexed} changed files, dropped {removed}", file=sys.stderr)
+    skills, found_sections = search(db, args.query, args.limit)
+    files = db.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+    documents = db.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+    db.close()
+
+    output_json({
+        "status": "ok",
+        "query": args.query,
+        "skills": skills,
+        "sections": found_sections,
+        "index": {"files": files, "documents": documents, "reindexed": reindexed,
+                  "removed": removed, "ms": round((time.perf_counter() - start) * 1000, 1)},
+    })
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Print one heading's section of a skill's reference docs, not the whole file.
+
+Usage:
+    section.py cloudflare/kv "Bulk writes"
+    section.py cloudflare/kv/api "Bulk writes"      # one file
+    section.py cloudflare/kv --list                 # headings, with token estimates
+    section.py cloudflare/kv "Bulk writes" --json   # location instead of text
+
+The target is a skill name followed by a path inside it, with the
+"references/" directory left out: cloudflare/kv matches every markdown
+file under cloudflare/references/kv/. The heading matches case-insensitively:
+an exact heading first, then an exact "Parent > Child" path, then a
+substring. A section runs to the next heading of the same or a higher level,
+so it includes its subsections.
+
+Headings come from a binary index (file, heading path, byte offset, length,
+token estimate) in $XDG_CACHE_HOME/creating-skills/. The index and the
+matched file are both read through mmap, so a lookup reads the file table,
+that file's headings and the bytes of the section — nothing else. Files
+whose size or mtime no longer match the index trigger a rebuild first.
+
+Outputs the section's markdown to stdout (with --json:
+    {"status": "ok", "path": "...", "heading": "KV > Bulk writes",
+     "offset": 1234, "length": 567, "tokens": 142, "others": [...]}).
+
+Exit codes:
+    0 - Section printed
+    1 - No matching file or heading (candidates on stderr), or invalid arguments
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+from pathlib import Path
+
+from validate_skills import DEFAULT_ROOT, find_skills, skill_markdown
+
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "creating-skills"
+MAGIC = b"SKSX"
+VERSION = 1
+# magic, version, file count, section count, string table offset
+HEADER = struct.Struct("<4sIIII")
+# key offset/length, path offset/length, size, mtime_ns, first section, section count
+FILE = struct.Struct("<IIIIqqII")
+# heading path offset/length, byte offset, byte length, token estimate
+SECTION = struct.Struct("<IIIII")
+# Rough bytes per token for English markdown; good enough to compare costs.
+BYTES_PER_TOKEN = 4
+
+HEADING_RE = re.compile(rb"^(#{1,6})[ \t]+(.+?)[ \t#]*\r?$")
+FENCE_RE = re.compile(rb"^[ \t]*(```|~~~)")
+
+
+def estimate_tokens(n_bytes):
+    return (n_bytes + BYTES_PER_TOKEN - 1) // BYTES_PER_TOKEN
+
+
+def file_key(skill, path):
+    """"cloudflare/kv/api.md" for cloudflare/references/kv/api.md."""
+    rel = Path(os.path.relpath(path, skill)).parts
+    if rel[0] == "references" and len(rel) > 1:
+        rel = rel[1:]
+    return "/".join((Path(skill).name,) + rel)
+
+
+def heading_sections(data):
+    """(heading path, offset, length) per heading in markdown bytes.
+    Headings inside code fences don't count."""
+    open_headings = []  # (level, path, offset), innermost last
+    found = []
+    fence = None
+    offset = 0
+    for line in data.splitlines(keepends=True):
+        fence_match = FENCE_RE.match(line)
+        if fence_match:
+            marker = fence_match.group(1)
+            fence = None if fence == marker else fence or marker
+        match = None if fence else HEADING_RE.match(line)
+        if match:
+            level = len(match.group(1))
+            while open_headings and open_headings[-1][0] >= level:
+                _, path, start = open_headings.pop()
+                found.append((path, start, offset - start))
+            parent = open_headings[-1][1] + " > " if open_headings else ""
+            title = match.group(2).decode("utf-8", errors="replace")
+            open_headings.append((level, parent + title, offset))
+        offset += len(line)
+    for _, path, start in open_headings:
+        found.append((path, start, offset - start))
+    return sorted(found, key=lambda s: s[1])
+
+
+def index_path(root):
+    digest = hashlib.sha256(os.path.realpath(root).encode()).hexdigest()[:12]
+    return CACHE_DIR / f"sections-{digest}.idx"
+
+
+def build_index(root, out):
+    """Scan every skill's markdown under root and write the binary index."""
+    strings = bytearray()
+
+    def intern(text):
+        raw = text.encode()
+        start = len(strings)
+        strings.extend(raw)
+        return start, len(raw)
+
+    files, sections = [], []
+    for skill in find_skills([root]):
+        for path in skill_markdown(skill):
+            try:
+                st = os.stat(path)
+                data = Path(path).read_bytes()
+            except OSError:
+                continue
+            found = heading_sections(data)
+            files.append(FILE.pack(*intern(file_key(skill, path)), *intern(os.path.realpath(path)),
+                                   st.st_size, st.st_mtime_ns, len(sections), len(found)))
+            for heading, offset, length in found:
+                sections.append(SECTION.pack(*intern(heading), offset, length, estimate_tokens(length)))
+
+    table = b"".join(files) + b"".join(sections)
+    header = HEADER.pack(MAGIC, VERSION, len(files), len(sections), HEADER.size + len(table))
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_suffix(".tmp")
+    tmp.write_bytes(header + table + strings)
+    tmp.replace(out)
+
+
+class Index:
+    """Read-only view of a section index through mmap."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.n_files, self.n_sections, self.strings = HEADER.unpack_from(self.buf)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("not a current section index")
+        self.sections_at = HEADER.size + self.n_files * FILE.size
+
+    def string(self, offset, length):
+        start = self.strings + offset
+        return self.buf[start:start + length].decode()
+
+    def files(self):
+        """(key, path, size, mtime_ns, first, count) per indexed file."""
+        for i in range(self.n_files):
+            key_off, key_len, path_off, path_len, size, mtime_ns, first, count = \
+                FILE.unpack_from(self.buf, HEADER.size + i * FILE.size)
+            yield self.string(key_off, key_len), self.string(path_off, path_len), size, mtime_ns, first, count
+
+    def sections(self, first, count):
+        """(heading path, offset, length, tokens) for a file's sections."""
+        for i in range(first, first + count):
+            head_off, head_len, offset, length, tokens = \
+                SECTION.unpack_from(self.buf, self.sections_at + i * SECTION.size)
+            yield self.string(head_off, head_len), offset, length, tokens
+
+
+def open_index(root, rebuild=False):
+    path = index_path(root)
+    if not rebuild:
+        try:
+            return Index(path)
+        except (OSError, ValueError, struct.error):
+            pass
+    print("Building section index...", file=sys.stderr)
+    build_index(root, path)
+    return Index(path)
+
+
+def matching_files(index, target):
+    target = target.strip("/")
+    found = []
+    for key, path, size, mtime_ns, first, count in index.files():
+        stem = key[:-3] if key.endswith(".md") else key
+        if key == target or stem == target or key.startswith(target + "/"):
+            found.append((key, path, size, mtime_ns, first, count))
+    return found
+
+
+def is_stale(files):
+    for _, path, size, mtime_ns, _, _ in files:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return True
+        if (st.st_size, st.st_mtime_ns) != (size, mtime_ns):
+            return True
+    return False
+
+
+def rank(heading_path, query):
+    """Lower is better; None for no match."""
+    heading_path, query = heading_path.casefold(), query.casefold()
+    if heading_path.rsplit(" > ", 1)[-1] == query:
+        return 0
+    if heading_path == query or heading_path.endswith(" > " + query):
+        return 1
+    if query in heading_path:
+        return 2
+    return None
+
+
+def read_slice(path, offset, length):
+    with open(path, "rb") as f:
+        if not length:
+            return b""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            return buf[offset:offset + length]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("target", help='skill and path inside it, e.g. "cloudflare/kv"')
+    parser.add_argument("heading", nargs="?", help="heading to print")
+    parser.add_argument("--list", action="store_true", help="list the target's headings instead")
+    parser.add_argument("--json", action="store_true", help="print the location as JSON, not the text")
+    parser.add_argument("--root", default=str(DEFAULT_ROOT), help="skills directory (default: %(default)s)")
+    parser.add_argument("--rebuild", action="store_true", help="rebuild the index first")
+    args = parser.parse_args()
+    if not args.list and not args.heading:
+        parser.error("a heading is required unless --list is given")
+
+    root = Path(args.root).expanduser()
+    index = open_index(root, args.rebuild)
+    files = matching_files(index, args.target)
+    if not files or is_stale(files):
+        # Unknown target may be a file added since the last build.
+        index = open_index(root, rebuild=True)
+        files = matching_files(index, args.target)
+    if not files:
+        print(f"No markdown files match {args.target!r}", file=sys.stderr)
+        return 1
+
+    if args.list:
+        for key, _, _, _, first, count in files:
+            print(key)
+            for heading, _, _, tokens in index.sections(first, count):
+                print(f"  {heading}  (~{tokens} tokens)")
+        return 0
+
+    matches = sorted(
+        (score, key, path, heading, offset, length, tokens)
+        for key, path, _, _, first, count in files
+        for heading, offset, length, tokens in index.sections(first, count)
+        if (score := rank(heading, args.heading)) is not None
+    )
+    if not matches:
+        print(f"No heading matching {args.heading!r} in {args.target!r}; try --list", file=sys.stderr)
+        return 1
+    _, key, path, heading, offset, length, tokens = matches[0]
+    others = [f"{m[1]}: {m[3]}" for m in matches[1:] if m[0] == matches[0][0]]
+    if args.json:
+        print(json.dumps({"status": "ok", "path": path, "heading": heading, "offset": offset,
+                          "length": length, "tokens": tokens, "others": others}))
+        return 0
+    if others:
+        print(f"Also matching: {'; '.join(others)}", file=sys.stderr)
+    sys.stdout.buffer.write(read_slice(path, offset, length))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
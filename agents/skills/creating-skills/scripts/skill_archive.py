@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Install a .skill archive without extracting it, and read files straight from it.
+
+Usage:
+    skill_archive.py install dist/cloudflare.skill     # index it, leave it in place
+    skill_archive.py install cloudflare.skill --manifest cloudflare-manifest.json
+    skill_archive.py ls cloudflare
+    skill_archive.py cat cloudflare SKILL.md
+    skill_archive.py cat cloudflare references/kv/api.md
+
+install reads only the archive's central directory and writes an index of
+every entry (local header offset, compression, sizes, CRC-32, SHA-256) to
+$XDG_DATA_HOME/creating-skills/installed/<skill>.json. Nothing is
+extracted or copied, so install time grows with the number of entries,
+not their size.
+
+cat seeks to the entry's local header and reads only that entry's
+compressed bytes: stored entries are sliced out through mmap, deflated ones
+are inflated with zlib. Every read is checked against the CRC-32, and
+against the SHA-256 from package_skill.py's packaging manifest when install
+found one — for archives built on this machine it is found automatically;
+otherwise pass --manifest. A read from an archive that changed since
+install fails rather than serving the wrong bytes.
+
+Outputs:
+    install: {"status": "ok", "name": "cloudflare", "archive": "...", "files": 321,
+              "verified": "sha256"}   ("crc32" when no manifest was found)
+    ls:      one "<path>\t<bytes>" line per file
+    cat:     the file's bytes
+    Error:   {"error": "message"} (install) or a message on stderr
+
+Exit codes:
+    0 - Success
+    1 - Invalid arguments, unknown skill or file
+    2 - Integrity failure (archive changed, manifest mismatch, bad checksum)
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import zipfile
+import zlib
+from pathlib import Path
+
+from package_skill import load_manifest
+
+INSTALL_DIR = Path(os.environ.get("XDG_DATA_HOME", Path.home() / ".local" / "share")) / "creating-skills" / "installed"
+# Fixed part of a zip local file header; name and extra lengths are its last two fields.
+LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+LOCAL_MAGIC = b"PK\x03\x04"
+
+
+class IntegrityError(Exception):
+    """The archive no longer matches what was installed."""
+
+
+def output_json(data: dict) -> None:
+    """Output structured JSON to stdout."""
+    print(json.dumps(data))
+
+
+def index_path(name):
+    return INSTALL_DIR / f"{name}.json"
+
+
+def install(archive, manifest_file=None):
+    """Index an archive's entries in place. Returns the index."""
+    archive = Path(archive).resolve()
+    if manifest_file:
+        manifest = json.loads(Path(manifest_file).read_text())
+    else:
+        manifest = load_manifest(archive)  # None unless built here and untouched since
+    with zipfile.ZipFile(archive) as zf:
+        infos = [i for i in zf.infolist() if not i.is_dir()]
+    names = {i.filename.split("/", 1)[0] for i in infos}
+    if len(names) != 1:
+        raise ValueError(f"malformed archive: expected one top-level skill directory, found {sorted(names)}")
+    name = names.pop()
+    loose = [i.filename for i in infos if not name or "/" not in i.filename or i.filename.endswith("/")]
+    if loose:
+        raise ValueError(f"malformed archive: {loose[0]} is not inside a top-level skill directory")
+
+    expected = manifest["files"] if manifest else {}
+    if manifest and set(expected) != {i.filename for i in infos}:
+        raise IntegrityError("archive entries don't match the packaging manifest")
+    files = {}
+    for info in infos:
+        entry = expected.get(info.filename)
+        if entry and entry["size"] != info.file_size:
+            raise IntegrityError(f"{info.filename}: size differs from the packaging manifest")
+        files[info.filename.split("/", 1)[1]] = [
+            info.header_offset, info.compress_type, info.compress_size, info.file_size,
+            info.CRC, entry["sha256"] if entry else None,
+        ]
+
+    st = archive.stat()
+    index = {"name": name, "archive": str(archive), "archive_stat": [st.st_size, st.st_mtime_ns],
+             "verified": "sha256" if manifest else "crc32", "files": files}
+    INSTALL_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = index_path(name).with_suffix(".tmp")
+    tmp.write_text(json.dumps(index))
+    tmp.replace(index_path(name))
+    return index
+
+
+def load_index(name):
+    try:
+        return json.loads(index_path(name).read_text())
+    except FileNotFoundError:
+        raise KeyError(f"{name} is not installed") from None
+
+
+def read_file(index, path):
+    """One file's bytes, read and checked without touching the rest of the archive."""
+    try:
+        offset, compress_type, compress_size, file_size, crc, sha256 = index["files"][path]
+    except KeyError:
+        raise KeyError(f"{path} not in {index['name']}") from None
+    with open(index["archive"], "rb") as f:
+        st = os.fstat(f.fileno())
+        if [st.st_size, st.st_mtime_ns] != index["archive_stat"]:
+            raise IntegrityError(f"{index['archive']} changed since install; reinstall it")
+        f.seek(offset)
+        magic, *_, name_len, extra_len = LOCAL_HEADER.unpack(f.read(LOCAL_HEADER.size))
+        if magic != LOCAL_MAGIC:
+            raise IntegrityError(f"{path}: no local header at offset {offset}")
+        start = offset + LOCAL_HEADER.size + name_len + extra_len
+        if compress_type == zipfile.ZIP_STORED:
+            if not file_size:
+                data = b""
+            else:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                    data = buf[start:start + file_size]
+        elif compress_type == zipfile.ZIP_DEFLATED:
+            f.seek(start)
+            try:
+                data = zlib.decompress(f.read(compress_size), -zlib.MAX_WBITS)
+            except zlib.error as e:
+                raise IntegrityError(f"{path}: corrupt deflate data ({e})") from None
+        else:
+            raise ValueError(f"{path}: unsupported compression method {compress_type}")
+    if len(data) != file_size or zlib.crc32(data) != crc:
+        raise IntegrityError(f"{path}: CRC-32 mismatch")
+    if sha256 and hashlib.sha256(data).hexdigest() != sha256:
+        raise IntegrityError(f"{path}: SHA-256 differs from the packaging manifest")
+    return data
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    install_cmd = commands.add_parser("install", help="index a .skill archive in place")
+    install_cmd.add_argument("archive")
+    install_cmd.add_argument("--manifest", help="packaging manifest to verify against")
+    ls_cmd = commands.add_parser("ls", help="list an installed skill's files")
+    ls_cmd.add_argument("name")
+    cat_cmd = commands.add_parser("cat", help="print one file from an installed skill")
+    cat_cmd.add_argument("name")
+    cat_cmd.add_argument("path", help="path inside the skill, e.g. SKILL.md")
+    args = parser.parse_args()
+
+    if args.command == "install":
+        try:
+            index = install(args.archive, args.manifest)
+        except IntegrityError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            output_json({"error": str(e)})
+            return 2
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile) as e:
+            print(f"Error: Could not install {args.archive}: {e}", file=sys.stderr)
+            output_json({"error": f"Could not install {args.archive}: {e}"})
+            return 1
+        output_json({"status": "ok", "name": index["name"], "archive": index["archive"],
+                     "files": len(index["files"]), "verified": index["verified"]})
+        return 0
+
+    try:
+        index = load_index(args.name)
+        if args.command == "ls":
+            for path, entry in sorted(index["files"].items()):
+                print(f"{path}\t{entry[3]}")
+            return 0
+        sys.stdout.buffer.write(read_file(index, args.path.lstrip("/")))
+        return 0
+    except IntegrityError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error: {e.args[0] if isinstance(e, KeyError) else e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Skill budget report - what each skill costs the context window
+
+Usage (JSON via stdin):
+    # Every skill under this repo's agents/skills
+    echo '{}' | skill_budget.py
+
+    skill_budget.py <<'EOF'
+    {"roots": ["~/.dotfiles/agents/skills"], "context_tokens": 200000, "references": false}
+    EOF
+
+JSON input fields (all optional):
+    roots: Directories to search for skills (default: the agents/skills dir this script lives in)
+    context_tokens: Context window the listing budget is a fraction of (default: 200000)
+    fraction: Listing budget fraction (default: skillListingBudgetFraction from claude/settings.json)
+    references: Include the per-reference breakdown (default: true)
+    no_cache: Re-measure every file (default: false)
+
+Three costs per skill:
+    listing  — the "name: description" line every conversation pays for
+    SKILL.md — frontmatter and body, paid when the skill triggers
+    references — each markdown file beside SKILL.md, paid when read
+
+Token counts are estimates (bytes / 4, as section.py reports them), good
+for comparing skills rather than exact billing. Measurements are cached per
+file by size and mtime, so a rerun only re-reads files that changed.
+
+The listing as a whole is checked against the budget (context_tokens x
+fraction); per-skill flags, from creating-skills' own guidance:
+    listing_over_share        — this skill's listing exceeds budget / skill count
+    description_over_1024     — description over the 1024-character limit
+    skill_md_over_500_lines   — SKILL.md body over 500 lines
+    skill_md_over_5k_words    — SKILL.md body over 5k words
+
+Outputs JSON to stdout:
+    {"status": "ok", "budget": {"fraction": 0.03, "context_tokens": 200000, "listing_tokens": 6000},
+     "listing": {"tokens": 2400, "over_budget": false},
+     "totals": {"skills": 25, "files": 430, "bytes": 2800034, "words": 380000, "tokens": 700009},
+     "files_read": 3, "files_cached": 427,
+     "skills": [{"name": "...", "path": "...", "description_chars": 312, "listing_tokens": 85,
+                 "frontmatter_tokens": 90, "skill_md_tokens": 2100, "skill_md_lines": 180,
+                 "skill_md_words": 1400, "reference_tokens": 5300,
+                 "references": [{"path": "references/api.md", "tokens": 1200, "words": 900}],
+                 "flags": []}]}
+    Error: {"error": "message"}
+
+Exit codes:
+    0 - Report written (flags don't change the exit code)
+    1 - Invalid arguments
+"""
+
+import sys
+import os
+import json
+from pathlib import Path
+from quick_validate import load_frontmatter, read_frontmatter
+from section import estimate_tokens
+from validate_skills import DEFAULT_ROOT, find_skills, skill_markdown
+
+CACHE_PATH = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "creating-skills" / "budget-cache.json"
+SETTINGS_PATH = DEFAULT_ROOT.parents[1] / "claude" / "settings.json"
+DEFAULT_CONTEXT_TOKENS = 200_000
+# Used when settings.json doesn't say.
+DEFAULT_FRACTION = 0.03
+# Limits from SKILL.md's "Progressive Disclosure" and frontmatter guidance.
+MAX_DESCRIPTION_CHARS = 1024
+MAX_BODY_LINES = 500
+MAX_BODY_WORDS = 5000
+
+
+def output_json(data: dict) -> None:
+    """Output structured JSON to stdout."""
+    print(json.dumps(data))
+
+
+def listing_fraction():
+    try:
+        return float(json.loads(SETTINGS_PATH.read_text())["skillListingBudgetFraction"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return DEFAULT_FRACTION
+
+
+def load_cache():
+    try:
+        return json.loads(CACHE_PATH.read_text())
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def save_cache(cache):
+    try:
+        CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp = CACHE_PATH.with_suffix(".tmp")
+        tmp.write_text(json.dumps(cache))
+        tmp.replace(CACHE_PATH)
+    except OSError:
+        pass
+
+
+def measure(path, is_skill_md):
+    """Sizes of one markdown file; SKILL.md also gets its frontmatter and
+    body measured separately."""
+    data = Path(path).read_bytes()
+    text = data.decode("utf-8", errors="replace")
+    entry = {"bytes": len(data), "words": len(text.split()), "lines": text.count("\n")}
+    if not is_skill_md:
+        return entry
+    try:
+        frontmatter_text = read_frontmatter(path)
+        frontmatter = load_frontmatter(frontmatter_text) if frontmatter_text else None
+    except ValueError:
+        frontmatter_text, frontmatter = None, None
+    if not isinstance(frontmatter, dict):
+        frontmatter = {}
+    description = frontmatter.get("description")
+    name = frontmatter.get("name")
+    frontmatter_bytes = len(frontmatter_text.encode()) + len("---\n\n---\n") if frontmatter_text else 0
+    body = data[frontmatter_bytes:].decode("utf-8", errors="replace")
+    entry.update(
+        name=name if isinstance(name, str) else None,
+        description=description.strip() if isinstance(description, str) else "",
+        frontmatter_bytes=frontmatter_bytes,
+        body_words=len(body.split()),
+        body_lines=body.count("\n"),
+    )
+    return entry
+
+
+def measure_cached(path, is_skill_md, cache, counts):
+    real = os.path.realpath(path)
+    st = os.stat(real)
+    entry = cache.get(real)
+    if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+        counts["cached"] += 1
+        return entry
+    entry = dict(measure(real, is_skill_md), size=st.st_size, mtime_ns=st.st_mtime_ns)
+    cache[real] = entry
+    counts["read"] += 1
+    return entry
+
+
+def listing_line(name, description):
+    """How a skill appears in the always-loaded skill listing."""
+    return f"- {name}: {description}\n"
+
+
+def skill_report(skill, cache, counts, with_references):
+    skill_md = os.path.join(skill, "SKILL.md")
+    main = measure_cached(skill_md, True, cache, counts)
+    name = main["name"] or Path(skill).name
+    references = []
+    for path in skill_markdown(skill):
+        if path == skill_md:
+            continue
+        try:
+            entry = measure_cached(path, False, cache, counts)
+        except OSError:
+            continue
+        references.append({"path": os.path.relpath(path, skill), "tokens": estimate_tokens(entry["bytes"]),
+                           "words": entry["words"], "bytes": entry["bytes"]})
+
+    report = {
+        "name": name,
+        "path": skill,
+        "description_chars": len(main["description"]),
+        "listing_tokens": estimate_tokens(len(listing_line(name, main["description"]).encode())),
+        "frontmatter_tokens": estimate_tokens(main["frontmatter_bytes"]),
+        "skill_md_tokens": estimate_tokens(main["bytes"]),
+        "skill_md_lines": main["body_lines"],
+        "skill_md_words": main["body_words"],
+        "reference_tokens": sum(r["tokens"] for r in references),
+        "flags": [],
+    }
+    if report["description_chars"] > MAX_DESCRIPTION_CHARS:
+        report["flags"].append("description_over_1024")
+    if main["body_lines"] > MAX_BODY_LINES:
+        report["flags"].append("skill_md_over_500_lines")
+    if main["body_words"] > MAX_BODY_WORDS:
+        report["flags"].append("skill_md_over_5k_words")
+    if with_references:
+        report["references"] = sorted(references, key=lambda r: r["tokens"], reverse=True)
+    totals = {"files": 1 + len(references), "bytes": main["bytes"] + sum(r["bytes"] for r in references),
+              "words": main["words"] + sum(r["words"] for r in references)}
+    return report, totals
+
+
+def budget_report(roots, context_tokens, fraction, with_references=True, use_cache=True):
+    cache = load_cache() if use_cache else {}
+    counts = {"read": 0, "cached": 0}
+    skills = []
+    totals = {"skills": 0, "files": 0, "bytes": 0, "words": 0}
+    for skill in find_skills(roots):
+        try:
+            report, skill_totals = skill_report(skill, cache, counts, with_references)
+        except OSError as e:
+            print(f"Skipping {skill}: {e}", file=sys.stderr)
+            continue
+        skills.append(report)
+        totals["skills"] += 1
+        for key, value in skill_totals.items():
+            totals[key] += value
+    save_cache(cache)
+
+    budget = int(context_tokens * fraction)
+    listing = sum(s["listing_tokens"] for s in skills)
+    share = budget / len(skills) if skills else budget
+    for s in skills:
+        if s["listing_tokens"] > share:
+            s["flags"].insert(0, "listing_over_share")
+    totals["tokens"] = estimate_tokens(totals["bytes"])
+    return {
+        "status": "ok",
+        "budget": {"fraction": fraction, "context_tokens": context_tokens, "listing_tokens": budget},
+        "listing": {"tokens": listing, "over_budget": listing > budget},
+        "totals": totals,
+        "files_read": counts["read"],
+        "files_cached": counts["cached"],
+        "skills": skills,
+    }
+
+
+def parse_args():
+    """Parse arguments from stdin JSON."""
+    if sys.stdin.isatty():
+        print("Error: This script requires JSON input via stdin", file=sys.stderr)
+        print("Usage: skill_budget.py <<'EOF'", file=sys.stderr)
+        print('{"roots": ["/path/to/skills"]}', file=sys.stderr)
+        print("EOF", file=sys.stderr)
+        output_json({"error": "This script requires JSON input via stdin"})
+        sys.exit(1)
+
+    try:
+        text = sys.stdin.read().strip()
+        data = json.loads(text) if text else {}
+    except json.JSONDecodeError as e:
+        print(f"Error: Invalid JSON input: {e}", file=sys.stderr)
+        output_json({"error": f"Invalid JSON input: {e}"})
+        sys.exit(1)
+
+    roots = [Path(r).expanduser() for r in data.get("roots") or [DEFAULT_ROOT]]
+    missing = [str(r) for r in roots if not r.is_dir()]
+    if missing:
+        print(f"Error: Not a directory: {', '.join(missing)}", file=sys.stderr)
+        output_json({"error": f"Not a directory: {', '.join(missing)}"})
+        sys.exit(1)
+
+    class Args:
+        pass
+    args = Args()
+    args.roots = roots
+    args.context_tokens = data.get("context_tokens", DEFAULT_CONTEXT_TOKENS)
+    args.fraction = data.get("fraction") or listing_fraction()
+    args.references = data.get("references", True)
+    args.use_cache = not data.get("no_cache", False)
+    return args
+
+
+def main():
+    args = parse_args()
+
+    report = budget_report(args.roots, args.context_tokens, args.fraction, args.references, args.use_cache)
+    listing, budget = report["listing"]["tokens"], report["budget"]["listing_tokens"]
+    print(f"{report['totals']['skills']} skills, listing ~{listing}/{budget} tokens; "
+          f"{report['files_read']} files read, {report['files_cached']} from cache", file=sys.stderr)
+    for s in report["skills"]:
+        if s["flags"]:
+            print(f"FLAGGED {s['name']}: {', '.join(s['flags'])}", file=sys.stderr)
+    output_json(report)
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
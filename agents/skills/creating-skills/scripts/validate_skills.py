@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Bulk skill validator - validates every skill under one or more roots
+
+Usage (JSON via stdin):
+    validate_skills.py <<'EOF'
+    {"roots": ["~/.dotfiles/agents/skills", "~/projects/my-app/skills"]}
+    EOF
+
+    # Defaults to this repo's agents/skills
+    echo '{}' | validate_skills.py
+
+JSON input fields:
+    roots: Directories to search for skills (default: the agents/skills dir this script lives in)
+    workers: Process pool size (default: CPU count)
+    no_cache: Re-validate everything, ignoring cached results (default: false)
+
+Every directory containing a SKILL.md is a skill (symlinked skills are
+followed). Each is checked with quick_validate.validate_skill(), the same
+rules as quick_validate.py.
+
+Results are cached per skill by SKILL.md's size, mtime and content hash,
+and by a hash of quick_validate.py, so changed rules re-validate everything.
+An unchanged stat is a hit without reading the file; a changed stat with the
+same content hash (touched, re-checked-out) is a hit after one read. Only
+the misses are validated, across a process pool when there are enough of
+them to be worth the pool's startup.
+
+Outputs JSON to stdout:
+    {"status": "ok", "total": 31, "valid": 30, "invalid": 1, "cached": 29,
+     "skills": [{"path": "...", "valid": false, "message": "...", "cached": false}]}
+    Error: {"error": "message"}
+
+Exit codes:
+    0 - All skills valid
+    1 - Some skill invalid, or invalid arguments
+"""
+
+import sys
+import os
+import json
+import hashlib
+from pathlib import Path
+import quick_validate
+from quick_validate import validate_skill
+
+DEFAULT_ROOT = Path(__file__).resolve().parents[2]
+CACHE_PATH = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "creating-skills" / "validate-cache.json"
+# Below this many misses, spawning workers costs more than it saves.
+POOL_MIN = 8
+SKIP_DIRS = {"node_modules", "__pycache__"}
+
+
+def output_json(data: dict) -> None:
+    """Output structured JSON to stdout."""
+    print(json.dumps(data))
+
+
+def find_skills(roots):
+    """Every directory under roots holding a SKILL.md, sorted, each once."""
+    found = {}
+    seen_dirs = set()
+    for root in roots:
+        for dirpath, dirnames, filenames in os.walk(root, followlinks=True):
+            real = os.path.realpath(dirpath)
+            if real in seen_dirs:  # symlink loop or a skill linked twice
+                dirnames[:] = []
+                continue
+            seen_dirs.add(real)
+            dirnames[:] = [d for d in dirnames if not d.startswith('.') and d not in SKIP_DIRS]
+            if 'SKILL.md' in filenames:
+                found.setdefault(real, dirpath)
+    return sorted(found.values())
+
+
+def skill_markdown(skill_path):
+    """Markdown files belonging to a skill, stopping at nested skills."""
+    files = []
+    for dirpath, dirnames, filenames in os.walk(skill_path, followlinks=True):
+        if dirpath != str(skill_path) and 'SKILL.md' in filenames:
+            dirnames[:] = []
+            continue
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith('.') and d not in SKIP_DIRS)
+        files.extend(os.path.join(dirpath, f) for f in sorted(filenames) if f.endswith('.md'))
+    return files
+
+
+def load_cache():
+    try:
+        return json.loads(CACHE_PATH.read_text())
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def save_cache(cache):
+    try:
+        CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp = CACHE_PATH.with_name(f".{CACHE_PATH.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(cache))
+        tmp.replace(CACHE_PATH)
+    except OSError:
+        pass
+
+
+def validator_version():
+    """Hash of quick_validate.py: a verdict only holds for the rules that gave it."""
+    return hashlib.sha256(Path(quick_validate.__file__).read_bytes()).hexdigest()[:16]
+
+
+def fingerprint(skill_path, cached):
+    """(size, mtime_ns, sha256) of SKILL.md; the hash is reused from the
+    cache entry when size and mtime are unchanged."""
+    st = os.stat(Path(skill_path) / 'SKILL.md')
+    if cached and cached["size"] == st.st_size and cached["mtime_ns"] == st.st_mtime_ns:
+        return st.st_size, st.st_mtime_ns, cached["hash"]
+    digest = hashlib.sha256((Path(skill_path) / 'SKILL.md').read_bytes()).hexdigest()
+    return st.st_size, st.st_mtime_ns, digest
+
+
+def validate_skills(roots, workers=None, use_cache=True):
+    """Validate every skill under roots. Returns the per-skill results."""
+    cache = load_cache() if use_cache else {}
+    validator = validator_version()
+    results = {}
+    misses = {}
+    for skill in find_skills(roots):
+        key = os.path.realpath(skill)
+        try:
+            size, mtime_ns, digest = fingerprint(skill, cache.get(key))
+        except OSError as e:
+            results[skill] = {"path": skill, "valid": False, "message": f"Cannot read SKILL.md: {e}",
+                              "cached": False}
+            continue
+        entry = cache.get(key)
+        if entry and entry["hash"] == digest and entry.get("validator") == validator:
+            entry.update(size=size, mtime_ns=mtime_ns)
+            results[skill] = {"path": skill, "valid": entry["valid"], "message": entry["message"],
+                              "cached": True}
+        else:
+            misses[skill] = {"size": size, "mtime_ns": mtime_ns, "hash": digest}
+
+    paths = list(misses)
+    if len(paths) >= POOL_MIN and workers != 1:
+        # Imported here: it's most of this module's import time, and the
+        # scripts that only use find_skills() never need it.
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            outcomes = list(pool.map(validate_skill, paths))
+    else:
+        outcomes = [validate_skill(p) for p in paths]
+
+    for skill, (valid, message) in zip(paths, outcomes):
+        cache[os.path.realpath(skill)] = dict(misses[skill], validator=validator, valid=valid,
+                                              message=message)
+        results[skill] = {"path": skill, "valid": valid, "message": message, "cached": False}
+
+    save_cache(cache)
+    return [results[s] for s in sorted(results)]
+
+
+def parse_args():
+    """Parse arguments from stdin JSON."""
+    if sys.stdin.isatty():
+        print("Error: This script requires JSON input via stdin", file=sys.stderr)
+        print("Usage: validate_skills.py <<'EOF'", file=sys.stderr)
+        print('{"roots": ["/path/to/skills"]}', file=sys.stderr)
+        print("EOF", file=sys.stderr)
+        output_json({"error": "This script requires JSON input via stdin"})
+        sys.exit(1)
+
+    try:
+        text = sys.stdin.read().strip()
+        data = json.loads(text) if text else {}
+    except json.JSONDecodeError as e:
+        print(f"Error: Invalid JSON input: {e}", file=sys.stderr)
+        output_json({"error": f"Invalid JSON input: {e}"})
+        sys.exit(1)
+
+    roots = [Path(r).expanduser() for r in data.get("roots") or [DEFAULT_ROOT]]
+    missing = [str(r) for r in roots if not r.is_dir()]
+    if missing:
+        print(f"Error: Not a directory: {', '.join(missing)}", file=sys.stderr)
+        output_json({"error": f"Not a directory: {', '.join(missing)}"})
+        sys.exit(1)
+    return roots, data.get("workers"), not data.get("no_cache", False)
+
+
+def main():
+    roots, workers, use_cache = parse_args()
+
+    skills = validate_skills(roots, workers, use_cache)
+    invalid = [s for s in skills if not s["valid"]]
+    cached = sum(1 for s in skills if s["cached"])
+    for s in invalid:
+        print(f"INVALID {s['path']}: {s['message']}", file=sys.stderr)
+    print(f"{len(skills)} skills, {len(invalid)} invalid, {cached} from cache", file=sys.stderr)
+
+    output_json({
+        "status": "ok",
+        "total": len(skills),
+        "valid": len(skills) - len(invalid),
+        "invalid": len(invalid),
+        "cached": cached,
+        "skills": skills,
+    })
+    sys.exit(1 if invalid else 0)
+
+
+if __name__ == "__main__":
+    main()
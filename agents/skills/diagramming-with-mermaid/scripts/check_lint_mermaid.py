@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Check lint_mermaid.py against a table of diagrams known to render (which it
+must pass) and known to fail (which it should catch).
+
+Usage:
+    scripts/check_lint_mermaid.py
+
+A wrongly rejected valid diagram breaks lint_mermaid.py's promise (validate.sh
+reports the lint error without ever running mmdc), so every rule change
+should come with a case here: the diagram that motivated it, and the
+near-miss it must not reject.
+
+Outputs JSON to stdout:
+    {"status": "ok", "cases": 24, "failures": []}
+    {"status": "failed", "cases": 24, "failures": [{"diagram": "...",
+      "expected": "valid", "got": "Lint error on line 1: ..."}]}
+
+Exit codes:
+    0 - Every case linted as expected
+    1 - Some case didn't
+"""
+
+import json
+import sys
+
+from lint_mermaid import result
+
+VALID = [
+    "flowchart TD\n    A --> B",
+    "graph TD;A-->B;",
+    "graph LR;\n    A --> B",
+    "flowchart LR\n    A -- the end --> B",
+    "flowchart LR\n    A -. end .-> B\n    B == end ==> C\n    C -- to the end --- D",
+    'flowchart TD\n    A["end"] --> B\n    B -->|end| C',
+    "flowchart TD\n    subgraph S\n        A --> B\n    end",
+    "flowchart TD\n    A>flag] --> B{choice}\n    B --> C((circle))",
+    "flowchart TD\n    A o--o B\n    B <--> C\n    C --x D",
+    "---\ntitle: T\n---\nflowchart TD\n    A --> B",
+    "sequenceDiagram\n    A->>B: hi\n    loop every minute\n        B-->>A: ok\n    end",
+    "stateDiagram-v2\n    [*] --> A\n    A --> B : on {\n    note right of A\n        payload starts with {\n    end note",
+    "stateDiagram-v2\n    state A {\n        [*] --> B\n    }\n    B : waits for {",
+    "classDiagram\n    class Animal {\n        +int age\n        +eat() void\n    }",
+    "erDiagram\n    CUSTOMER ||--o{ ORDER : places\n    ORDER }|..|{ LINE : contains",
+    "pie\n    \"a\" : 1",
+    "flowchart TD\n    accTitle: Checkout\n    accDescr {\n        Orders flow (left to right: see [docs]\n    }\n    A --> B",
+    "sequenceDiagram\n    accDescr {\n        Alice greets Bob\n    }\n    A->>B: hi",
+    "stateDiagram-v2\n    accDescr {\n        waits for {\n    }\n    [*] --> A",
+    'flowchart TD\n    A["`multi\n    line`"] --> B\n    B --> C',
+    'flowchart TD\n    subgraph S["`one\n    two`"]\n        A --> B\n    end',
+]
+
+INVALID = [
+    "flowchart TD\n    A --> end",
+    "graph TD;A-->end;",
+    "flowchart XY\n    A --> B",
+    "flowchart TD\n    A -> B",
+    "flowchart TD\n    A[label --> B",
+    "flowchart TD\n    A -->|label B",
+    "flowchart TD\n    subgraph S\n        A --> B",
+    "flowchart TD\n    A --> B\n    end",
+    "sequencediagram\n    A->>B: hi",
+    "sequenceDiagram\n    loop forever\n        A->>B: hi",
+    "sequenceDiagram\n    A B: hi",
+    "classDiagram\n    class Animal {\n        +int age",
+    "stateDiagram-v2\n    state A {\n        [*] --> B",
+    "---\ntitle: T\nflowchart TD\n    A --> B",
+    "flowchart TD\n    accDescr {\n        text\n    }\n    A --> end",
+    'flowchart TD\n    A["`a\n    b`"] --> B\n    B --> end',
+]
+
+
+def main() -> int:
+    failures = []
+    for expected, diagrams in (("valid", VALID), ("invalid", INVALID)):
+        for diagram in diagrams:
+            outcome = result(diagram)
+            if outcome["valid"] != (expected == "valid"):
+                failures.append({"diagram": diagram, "expected": expected,
+                                 "got": outcome.get("error", "valid")})
+    for failure in failures:
+        print(f"Expected {failure['expected']}, got {failure['got']!r}:\n{failure['diagram']}\n",
+              file=sys.stderr)
+    print(json.dumps({"status": "failed" if failures else "ok", "cases": len(VALID) + len(INVALID),
+                      "failures": failures}))
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Pre-lint Mermaid diagrams in pure Python, before paying for a render.
+
+Usage (JSON via stdin):
+    scripts/lint_mermaid.py <<'EOF'
+    {"diagram": "flowchart TD\\n    A --> end"}
+    EOF
+
+    scripts/lint_mermaid.py <<'EOF'
+    {"diagrams": ["flowchart TD\\n    A --> B", "sequencediagram\\n    A->>B: hi"]}
+    EOF
+
+JSON input fields (one of):
+    diagram: Raw Mermaid source, without ```mermaid fences
+    diagrams: A list of them
+
+Catches the cheap, common failures the references warn about, line by line:
+    - unknown diagram type keyword, or a bad flowchart direction
+    - unclosed frontmatter
+    - flowchart: unbalanced brackets or quotes, unclosed |edge labels|,
+      arrows flowcharts don't have (->, =>, <-), `end` used as a node id,
+      subgraph without end (and end without subgraph)
+    - sequenceDiagram: message lines without a valid arrow,
+      loop/alt/opt/par/critical/break/rect/box without end
+    - classDiagram, stateDiagram, erDiagram: unbalanced braces (outside
+      `: descriptions` and note bodies)
+
+Free text is never checked: multi-line `accDescr { ... }` bodies (any
+diagram type) and flowchart markdown strings ("` ... `"), which may span
+lines.
+
+Every rule errs towards passing: a diagram the linter accepts may still
+fail to render (validate.sh / validate_batch.py decide that), but one it
+rejects would have failed too. validate.sh and validate_batch.py run this
+first and only start mmdc for diagrams that pass. check_lint_mermaid.py
+holds that promise to a table of valid and invalid diagrams; add a case to
+it with every rule change.
+
+Outputs JSON to stdout, in validate.sh's shape:
+    {"valid": false, "error": "Lint error on line 2: ...", "line": 2}
+    With "diagrams": {"status": "ok", "valid": false, "results": [{"valid": true}, ...]}
+    Error: {"error": "message"}
+
+Exit codes:
+    0 - Every diagram passed the lint
+    1 - Some diagram failed, or invalid arguments
+"""
+
+import json
+import re
+import sys
+
+# Declarations from SKILL.md's type selector and the references, plus the
+# aliases and newer/older spellings Mermaid also accepts.
+DIAGRAM_TYPES = {
+    "flowchart", "graph", "flowchart-elk", "sequenceDiagram", "classDiagram", "classDiagram-v2",
+    "stateDiagram", "stateDiagram-v2", "erDiagram", "gantt", "pie", "quadrantChart",
+    "xychart-beta", "xychart", "sankey-beta", "sankey", "mindmap", "timeline", "gitGraph",
+    "block-beta", "block", "packet-beta", "packet", "architecture-beta", "architecture", "kanban",
+    "requirementDiagram", "journey", "C4Context", "C4Container", "C4Component", "C4Dynamic",
+    "C4Deployment", "zenuml", "radar-beta", "treemap-beta",
+}
+FLOWCHART_TYPES = {"flowchart", "graph", "flowchart-elk"}
+# references/flowchart.md "Declaration" (and the legacy arrow forms).
+FLOWCHART_DIRECTIONS = {"TB", "TD", "BT", "RL", "LR", ">", "<", "^", "v"}
+# Lines whose syntax isn't node/edge syntax; not bracket- or arrow-checked.
+FLOWCHART_DIRECTIVES = ("style ", "classDef ", "class ", "linkStyle ", "click ", "direction ",
+                        "accTitle", "accDescr")
+# references/sequence.md "Messages" and "Control Flow".
+SEQUENCE_ARROW_RE = re.compile(r"<<-->>|<<->>|-->>|->>|-->|->|--x|-x|--\)|-\)")
+SEQUENCE_BLOCKS = ("loop", "alt", "opt", "par", "critical", "break", "rect", "box")
+SEQUENCE_KEYWORDS = SEQUENCE_BLOCKS + (
+    "else", "and", "option", "end", "participant", "actor", "note", "activate", "deactivate",
+    "autonumber", "title", "create", "destroy", "link", "links", "properties", "details",
+    "accTitle", "accDescr",
+)
+BRACE_TYPES = {"classDiagram", "classDiagram-v2", "stateDiagram", "stateDiagram-v2", "erDiagram"}
+
+ACC_DESCR_BLOCK_RE = re.compile(r"accDescr\s*\{")
+QUOTED_RE = re.compile(r'"[^"]*"')
+HTML_TAG_RE = re.compile(r"</?[A-Za-z][^<>]*>")
+EDGE_LABEL_RE = re.compile(r"\|[^|]*\|")
+# Text on an edge: A -- text --> B, A -. text .-> B, A == text ==> B.
+EDGE_TEXT_RE = re.compile(r"(?:--|==|-\.)(?![-.=>ox])[^>]*?(?:-->|---|--[ox]|==>|===|==[ox]|\.->|\.-)")
+# > opens an asymmetric node (A>text]) when it follows an id, not an arrow.
+ASYMMETRIC_RE = re.compile(r"(?<=\w)>")
+BAD_FLOW_ARROW_RE = re.compile(r"(?<![-.=<>])->(?!>)|(?<![=<>])=>|<-(?![-.])")
+END_ID_RE = re.compile(r"(?<![\w-])end(?![\w-])")
+# references/class-state-er.md crow's foot notation: }o--||, |o..o{ ...
+ER_RELATION_RE = re.compile(r"(?:\|o|\|\||\}o|\}\|)(?:--|\.\.)(?:o\||\|\||o\{|\|\{)")
+PAIRS = {")": "(", "]": "[", "}": "{"}
+
+
+def strip_comment(line):
+    return line.split("%%", 1)[0] if "%%" in line else line
+
+
+def drop_acc_descr(lines):
+    """The lines without multi-line `accDescr { ... }` blocks, whose bodies
+    are free text (references/theming-styling.md "Accessibility")."""
+    kept = []
+    in_block = False
+    for number, raw in lines:
+        line = strip_comment(raw).strip()
+        if in_block:
+            in_block = "}" not in line
+            continue
+        if ACC_DESCR_BLOCK_RE.match(line):
+            in_block = "}" not in line.split("{", 1)[1]
+            continue
+        kept.append((number, raw))
+    return kept
+
+
+def check_brackets(text, number):
+    """Bracket balance on one flowchart line (quotes already removed).
+    Returns (error or None, the text outside all brackets)."""
+    stack = []
+    outside = []
+    text = ASYMMETRIC_RE.sub("[", text)
+    for ch in text:
+        if ch in "([{":
+            stack.append(ch)
+        elif ch in PAIRS:
+            if not stack:
+                return f"Lint error on line {number}: unmatched '{ch}'", ""
+            if stack.pop() != PAIRS[ch]:
+                return f"Lint error on line {number}: mismatched '{ch}'; quote labels containing brackets", ""
+        elif not stack:
+            outside.append(ch)
+    if stack:
+        return f"Lint error on line {number}: unclosed '{stack[-1]}'", ""
+    return None, "".join(outside)
+
+
+def open_markdown(line):
+    """Whether a markdown string ("` ... `") is still open at the end of line."""
+    return line.rfind('"`') > line.rfind('`"')
+
+
+def lint_flowchart(lines):
+    errors = []
+    subgraphs = []
+    in_markdown = False
+    for number, raw in lines:
+        line = strip_comment(raw).strip()
+        if in_markdown:
+            in_markdown = open_markdown('"`' + line)
+            continue
+        if not line or line.startswith(FLOWCHART_DIRECTIVES):
+            continue
+        if line in ("end", "end;"):
+            if not subgraphs:
+                errors.append((number, f"Lint error on line {number}: 'end' without a subgraph"))
+            else:
+                subgraphs.pop()
+            continue
+        if line.startswith("subgraph ") or line == "subgraph":
+            subgraphs.append(number)
+        if '"`' in line:  # markdown strings may span lines; leave them to mmdc
+            in_markdown = open_markdown(line)
+            continue
+        if line.count('"') % 2:
+            errors.append((number, f"Lint error on line {number}: unclosed '\"'"))
+            continue
+        text = HTML_TAG_RE.sub("", QUOTED_RE.sub('""', line))
+        text = EDGE_LABEL_RE.sub("", text)
+        if "|" in text:
+            errors.append((number, f"Lint error on line {number}: unclosed '|' edge label"))
+            continue
+        error, outside = check_brackets(text, number)
+        if error:
+            errors.append((number, error))
+            continue
+        outside = EDGE_TEXT_RE.sub("-->", outside)
+        arrow = BAD_FLOW_ARROW_RE.search(outside)
+        if arrow:
+            errors.append((number, f"Lint error on line {number}: '{arrow.group()}' is not a flowchart "
+                                   f"arrow (use -->, ---, -.->, ==>)"))
+        elif not line.startswith("subgraph") and END_ID_RE.search(outside):
+            errors.append((number, f"Lint error on line {number}: 'end' can't be a node id; "
+                                   f"capitalize it or quote it: [\"end\"]"))
+    for number in subgraphs:
+        errors.append((number, f"Lint error on line {number}: subgraph is never closed with 'end'"))
+    return errors
+
+
+def lint_sequence(lines):
+    errors = []
+    blocks = []
+    for number, raw in lines:
+        line = strip_comment(raw).strip()
+        if not line:
+            continue
+        keyword = re.split(r"[\s:]", line, 1)[0]
+        if keyword.lower() in SEQUENCE_KEYWORDS or keyword in SEQUENCE_KEYWORDS:
+            if keyword in SEQUENCE_BLOCKS:
+                blocks.append((number, keyword))
+            elif keyword == "end":
+                if not blocks:
+                    errors.append((number, f"Lint error on line {number}: 'end' without an open block"))
+                else:
+                    blocks.pop()
+            continue
+        if ":" in line and not SEQUENCE_ARROW_RE.search(line.split(":", 1)[0]):
+            errors.append((number, f"Lint error on line {number}: no message arrow before ':' "
+                                   f"(use ->>, -->>, ->, -->, -x, --x, -), --))"))
+    for number, keyword in blocks:
+        errors.append((number, f"Lint error on line {number}: '{keyword}' is never closed with 'end'"))
+    return errors
+
+
+def lint_braces(lines):
+    depth = []
+    in_note = False
+    for number, raw in lines:
+        line = strip_comment(raw).strip()
+        # Free text: note bodies (note ... end note) and `: descriptions`.
+        if in_note:
+            in_note = line != "end note"
+            continue
+        if line.startswith("note ") and ":" not in line and '"' not in line:
+            in_note = True
+            continue
+        text = ER_RELATION_RE.sub("--", QUOTED_RE.sub('""', line)).split(":", 1)[0]
+        for ch in text:
+            if ch == "{":
+                depth.append(number)
+            elif ch == "}":
+                if not depth:
+                    return [(number, f"Lint error on line {number}: unmatched '}}'")]
+                depth.pop()
+    return [(n, f"Lint error on line {n}: '{{' is never closed") for n in depth[-1:]]
+
+
+def lint(source):
+    """(line, message) for every lint error in a diagram, in line order."""
+    lines = list(enumerate(source.splitlines(), 1))
+    i = 0
+    while i < len(lines) and not lines[i][1].strip():
+        i += 1
+    if i < len(lines) and lines[i][1].strip() == "---":
+        start = lines[i][0]
+        i += 1
+        while i < len(lines) and lines[i][1].strip() != "---":
+            i += 1
+        if i == len(lines):
+            return [(start, f"Lint error on line {start}: frontmatter is never closed with '---'")]
+        i += 1
+    while i < len(lines) and (not lines[i][1].strip() or lines[i][1].lstrip().startswith("%%")):
+        i += 1
+    if i == len(lines):
+        return [(1, "Lint error on line 1: no diagram type declaration")]
+
+    number, declaration = lines[i]
+    words = declaration.split()
+    kind = words[0].rstrip(";:")
+    if kind not in DIAGRAM_TYPES:
+        import difflib
+        close = difflib.get_close_matches(kind, DIAGRAM_TYPES, n=1)
+        hint = f"; did you mean '{close[0]}'?" if close else ""
+        return [(number, f"Lint error on line {number}: unknown diagram type '{kind}'{hint}")]
+    body = drop_acc_descr(lines[i + 1:])
+    if kind in FLOWCHART_TYPES:
+        # `graph TD;A-->B;` — statements may follow on the declaration line.
+        head, _, rest = declaration.partition(";")
+        words = head.split()
+        if rest.strip():
+            body.insert(0, (number, rest))
+        if len(words) > 1 and words[1].rstrip(";") not in FLOWCHART_DIRECTIONS:
+            return [(number, f"Lint error on line {number}: unknown direction '{words[1]}' "
+                             f"(use TB, TD, BT, LR or RL)")]
+        return lint_flowchart(body)
+    if kind == "sequenceDiagram":
+        return lint_sequence(body)
+    if kind in BRACE_TYPES:
+        return lint_braces(body)
+    return []
+
+
+def result(source):
+    """validate.sh-shaped result for one diagram."""
+    errors = sorted(lint(source))
+    if not errors:
+        return {"valid": True}
+    return {"valid": False, "error": "\n".join(message for _, message in errors), "line": errors[0][0]}
+
+
+def output_json(data: dict) -> None:
+    """Output structured JSON to stdout."""
+    print(json.dumps(data))
+
+
+def parse_args() -> dict:
+    """Parse arguments from stdin JSON."""
+    if sys.stdin.isatty():
+        print("Error: This script requires JSON input via stdin", file=sys.stderr)
+        print("Usage: scripts/lint_mermaid.py <<'EOF'", file=sys.stderr)
+        print('{"diagram": "flowchart TD\\n    A --> B"}', file=sys.stderr)
+        print("EOF", file=sys.stderr)
+        output_json({"error": "This script requires JSON input via stdin"})
+        sys.exit(1)
+    try:
+        data = json.load(sys.stdin)
+    except json.JSONDecodeError as e:
+        print(f"Error: Invalid JSON input: {e}", file=sys.stderr)
+        output_json({"error": f"Invalid JSON input: {e}"})
+        sys.exit(1)
+    diagrams = data.get("diagrams")
+    if isinstance(data.get("diagram"), str) or (
+        isinstance(diagrams, list) and diagrams and all(isinstance(d, str) for d in diagrams)
+    ):
+        return data
+    print("Error: Missing required field: diagram (or diagrams)", file=sys.stderr)
+    output_json({"error": "Missing required field: diagram (or diagrams)"})
+    sys.exit(1)
+
+
+def main() -> int:
+    data = parse_args()
+    if "diagram" in data:
+        outcome = result(data["diagram"])
+        output_json(outcome)
+        return 0 if outcome["valid"] else 1
+    results = [result(d) for d in data["diagrams"]]
+    valid = all(r["valid"] for r in results)
+    output_json({"status": "ok", "valid": valid, "results": results})
+    return 0 if valid else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+#!/usr/bin/env node
+// Warm Mermaid renderer for validate_batch.py: one headless browser for many diagrams.
+//
+// Usage: node render_server.mjs <mermaid-cli package dir> [puppeteer config JSON file]
+// Reads NDJSON {"id", "diagram"} on stdin and writes one NDJSON
+// {"id", "valid", "error"?, "renderer_error"?} line per diagram to stdout, in
+// order. renderer_error marks a failure of the browser rather than the
+// diagram (crash, closed target, timeout); if the browser is gone, the
+// server stops there and exits 1.
+//
+// Diagrams go through mermaid-cli's own renderMermaid(), which is what mmdc
+// calls, so a diagram valid here is valid for mmdc. Only the browser launch
+// is shared, and that launch is where mmdc spends its seconds.
+
+import { createRequire } from 'node:module';
+import { readFileSync } from 'node:fs';
+import path from 'node:path';
+import readline from 'node:readline';
+import { pathToFileURL } from 'node:url';
+
+const [cliDir, puppeteerConfigFile] = process.argv.slice(2);
+if (!cliDir) {
+  console.error('Usage: render_server.mjs <mermaid-cli package dir> [puppeteer config]');
+  process.exit(1);
+}
+
+// Resolve puppeteer the way mmdc does: from mermaid-cli's own dependencies.
+const require = createRequire(path.join(cliDir, 'package.json'));
+const puppeteer = require('puppeteer');
+const { renderMermaid } = await import(pathToFileURL(path.join(cliDir, 'src', 'index.js')).href);
+const puppeteerConfig = puppeteerConfigFile ? JSON.parse(readFileSync(puppeteerConfigFile, 'utf8')) : {};
+// Puppeteer's own error classes, and the messages older versions throw as
+// plain Errors when the page or browser goes away mid-render.
+const RENDERER_ERROR_NAMES = new Set(['ProtocolError', 'TargetCloseError', 'TimeoutError']);
+const RENDERER_ERROR_RE = /Target closed|Session closed|Protocol error|Execution context was destroyed|Navigation timeout|Connection closed/i;
+
+const browser = await (puppeteer.default ?? puppeteer).launch({ headless: true, ...puppeteerConfig });
+try {
+  const lines = readline.createInterface({ input: process.stdin, crlfDelay: Infinity });
+  for await (const line of lines) {
+    if (!line.trim()) continue;
+    const { id, diagram } = JSON.parse(line);
+    let result;
+    try {
+      await renderMermaid(browser, diagram, 'svg');
+      result = { id, valid: true };
+    } catch (err) {
+      const error = String(err?.message ?? err);
+      result = { id, valid: false, error };
+      if (!browser.connected || RENDERER_ERROR_NAMES.has(err?.name) || RENDERER_ERROR_RE.test(error)) {
+        result.renderer_error = true;
+      }
+    }
+    process.stdout.write(JSON.stringify(result) + '\n');
+    if (!browser.connected) {
+      console.error('Browser disconnected; stopping.');
+      process.exitCode = 1;
+      break;
+    }
+  }
+} finally {
+  await browser.close();
+}
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Validate every ```mermaid block in one or more markdown trees, incrementally.
+
+Usage (JSON via stdin):
+    # Every markdown file under this repo's agents/skills
+    echo '{}' | scripts/sweep_mermaid.py
+
+    scripts/sweep_mermaid.py <<'EOF'
+    {"roots": ["~/.dotfiles/agents/skills", "./docs"], "workers": 4}
+    EOF
+
+JSON input fields (all optional):
+    roots: Directories to scan for .md files (default: the agents/skills dir this script is in)
+    manifest: Where to write the results manifest
+              (default: $XDG_CACHE_HOME/diagramming-with-mermaid/sweep-manifest.json)
+    workers: Renderer processes to spread new diagrams over (default: min(4, CPU count))
+    lint_only: Only run lint_mermaid.py, never mmdc (default: false)
+    full: Ignore the previous manifest and re-check every block (default: false)
+
+Each block is pre-linted (lint_mermaid.py), then rendered by
+validate_batch.py's warm renderer. The manifest from the last run is the
+cache: files whose size and mtime are unchanged aren't even read, and a
+block whose content hash already has a rendered result (in the manifest or
+validate_batch.py's cache, for the same mermaid-cli version) isn't checked
+again. New blocks are split across `workers` renderer processes.
+
+When mmdc isn't installed, blocks are linted only; those results are
+marked "checked": "lint" and are rendered on the first run that has mmdc.
+Lint results are reused only while lint_mermaid.py is unchanged, so a
+linter fix re-checks every block it may have judged wrongly. A block the
+renderer itself failed on (browser crash, timeout) is reported with
+"checked": "failed" and rendered again next run.
+
+Outputs JSON to stdout:
+    {"status": "ok", "files": 431, "blocks": 25, "checked": 2, "reused": 23,
+     "renderer": "11.4.0", "manifest": "/path/to/sweep-manifest.json", "seconds": 0.08,
+     "invalid": [{"file": "...", "line": 150, "error": "Lint error on line 2: ..."}]}
+    Error: {"error": "message"}
+
+Manifest: {"renderer": "11.4.0" or null, "linter": "<lint_mermaid.py hash>",
+    "files": {path: {"size", "mtime_ns",
+    "blocks": [{"line", "hash", "valid", "error"?, "checked": "render" | "lint" | "failed"}]}}}
+
+Exit codes:
+    0 - Every block valid
+    1 - Some block invalid, or invalid arguments
+    2 - Renderer crashed
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import lint_mermaid
+from lint_mermaid import result as lint_result
+from validate_batch import RendererError, cache_key, find_cli, load_cache, render, save_cache
+
+DEFAULT_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_MANIFEST = (Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+                    / "diagramming-with-mermaid" / "sweep-manifest.json")
+# Each renderer holds a headless browser; more than a few just contend for memory.
+MAX_WORKERS = 4
+SKIP_DIRS = {"node_modules", "__pycache__"}
+FENCE_RE = re.compile(r"^[ \t]*(`{3,}|~{3,})[ \t]*([^`\s]*)")
+
+
+def output_json(data: dict) -> None:
+    """Output structured JSON to stdout."""
+    print(json.dumps(data))
+
+
+def markdown_files(roots: list[Path]) -> list[str]:
+    """Every .md file under roots (symlinks followed), each once, sorted."""
+    found = {}
+    seen_dirs = set()
+    for root in roots:
+        for dirpath, dirnames, filenames in os.walk(root, followlinks=True):
+            real = os.path.realpath(dirpath)
+            if real in seen_dirs:
+                dirnames[:] = []
+                continue
+            seen_dirs.add(real)
+            dirnames[:] = [d for d in dirnames if not d.startswith(".") and d not in SKIP_DIRS]
+            for name in filenames:
+                if name.endswith(".md"):
+                    path = os.path.join(dirpath, name)
+                    found.setdefault(os.path.realpath(path), path)
+    return sorted(found.values())
+
+
+def mermaid_blocks(text: str) -> list[tuple[int, str]]:
+    """(first diagram line, source) for every ```mermaid block."""
+    blocks = []
+    lines = text.splitlines()
+    i = 0
+    while i < len(lines):
+        match = FENCE_RE.match(lines[i])
+        if not match:
+            i += 1
+            continue
+        fence, info = match.groups()
+        end = i + 1
+        while end < len(lines):
+            closing = FENCE_RE.match(lines[end])
+            if closing and closing.group(1)[0] == fence[0] and len(closing.group(1)) >= len(fence) \
+                    and not closing.group(2):
+                break
+            end += 1
+        if info.lower() == "mermaid":
+            blocks.append((i + 2, "\n".join(lines[i + 1:end])))
+        i = end + 1
+    return blocks
+
+
+def source_hash(source: str) -> str:
+    return hashlib.sha256(source.encode()).hexdigest()
+
+
+def linter_version() -> str:
+    """Hash of lint_mermaid.py, which lint results are only valid for."""
+    return hashlib.sha256(Path(lint_mermaid.__file__).read_bytes()).hexdigest()[:16]
+
+
+def load_manifest(path: Path) -> dict:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def render_pool(cli_dir: Path, sources: list[str], workers: int) -> tuple[list[dict], list[bool]]:
+    """Render sources split across up to `workers` renderer processes.
+    Returns results and, per result, whether it's cacheable (as render())."""
+    if not sources:
+        return [], []
+    workers = max(1, min(workers, len(sources)))
+    chunks = [sources[i::workers] for i in range(workers)]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        rendered = list(pool.map(lambda chunk: render(cli_dir, chunk), chunks))
+    results = [None] * len(sources)
+    cacheable = [False] * len(sources)
+    for w, (chunk_results, chunk_cacheable) in enumerate(rendered):
+        results[w::workers] = chunk_results
+        cacheable[w::workers] = chunk_cacheable
+    return results, cacheable
+
+
+def sweep(roots: list[Path], manifest_path: Path, workers: int, lint_only: bool = False,
+          full: bool = False) -> dict:
+    start = time.perf_counter()
+    previous = {} if full else load_manifest(manifest_path)
+    linter = linter_version()
+    version = None
+    cli_dir = None
+    if not lint_only:
+        try:
+            cli_dir, version = find_cli()
+        except RendererError as e:
+            print(f"{e}; linting only", file=sys.stderr)
+    render_cache = load_cache() if cli_dir else {}
+
+    # Results already known, by content hash.
+    known = {}
+    for entry in previous.get("files", {}).values():
+        for block in entry["blocks"]:
+            if block["checked"] == "failed":
+                continue  # the renderer failed, not the diagram; try again
+            if block["checked"] == "render" and previous.get("renderer") != version:
+                continue
+            if block["checked"] == "lint" and previous.get("linter") != linter:
+                continue
+            if block["checked"] == "lint" and block["valid"] and cli_dir:
+                continue  # passed the lint only; still needs a render
+            known[block["hash"]] = block
+
+    files = {}
+    pending = {}  # hash -> source
+    for path in markdown_files(roots):
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        old = previous.get("files", {}).get(path)
+        if old and old["size"] == st.st_size and old["mtime_ns"] == st.st_mtime_ns \
+                and all(b["hash"] in known for b in old["blocks"]):
+            files[path] = old
+            continue
+        try:
+            text = Path(path).read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            continue
+        blocks = []
+        for line, source in mermaid_blocks(text):
+            digest = source_hash(source)
+            blocks.append({"line": line, "hash": digest})
+            if digest not in known:
+                pending[digest] = source
+        files[path] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "blocks": blocks}
+
+    checked = {}
+    to_render = []
+    for digest, source in pending.items():
+        linted = lint_result(source)
+        if not linted["valid"] or not cli_dir:
+            checked[digest] = dict(linted, checked="lint")
+        elif cache_key(source, version) in render_cache:
+            checked[digest] = dict(render_cache[cache_key(source, version)], checked="render")
+        else:
+            to_render.append(digest)
+    if to_render:
+        print(f"Rendering {len(to_render)} new diagram(s) on {min(workers, len(to_render))} "
+              f"worker(s)...", file=sys.stderr)
+        sources = [pending[d] for d in to_render]
+        results, cacheable = render_pool(cli_dir, sources, workers)
+        for digest, source, outcome, ok in zip(to_render, sources, results, cacheable):
+            checked[digest] = dict(outcome, checked="render" if ok else "failed")
+            if ok:
+                render_cache[cache_key(source, version)] = outcome
+        save_cache(render_cache)
+
+    invalid = []
+    total = 0
+    for path, entry in files.items():
+        for block in entry["blocks"]:
+            outcome = checked.get(block["hash"]) or known[block["hash"]]
+            block.update((k, outcome[k]) for k in ("valid", "checked"))
+            block.pop("error", None)
+            if not outcome["valid"]:
+                block["error"] = outcome["error"]
+                invalid.append({"file": path, "line": block["line"], "error": outcome["error"]})
+            total += 1
+
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = manifest_path.with_suffix(".tmp")
+    tmp.write_text(json.dumps({"renderer": version, "linter": linter, "files": files}))
+    tmp.replace(manifest_path)
+    return {
+        "status": "ok",
+        "files": len(files),
+        "blocks": total,
+        "checked": len(checked),
+        "reused": total - sum(1 for e in files.values() for b in e["blocks"] if b["hash"] in checked),
+        "renderer": version,
+        "manifest": str(manifest_path),
+        "seconds": round(time.perf_counter() - start, 3),
+        "invalid": invalid,
+    }
+
+
+def parse_args() -> dict:
+    """Parse arguments from stdin JSON (empty input means all defaults)."""
+    if sys.stdin.isatty():
+        print("Error: This script requires JSON input via stdin", file=sys.stderr)
+        print("Usage: scripts/sweep_mermaid.py <<'EOF'", file=sys.stderr)
+        print('{"roots": ["/path/to/docs"]}', file=sys.stderr)
+        print("EOF", file=sys.stderr)
+        output_json({"error": "This script requires JSON input via stdin"})
+        sys.exit(1)
+    try:
+        text = sys.stdin.read().strip()
+        data = json.loads(text) if text else {}
+    except json.JSONDecodeError as e:
+        print(f"Error: Invalid JSON input: {e}", file=sys.stderr)
+        output_json({"error": f"Invalid JSON input: {e}"})
+        sys.exit(1)
+    roots = [Path(r).expanduser() for r in data.get("roots") or [DEFAULT_ROOT]]
+    missing = [str(r) for r in roots if not r.is_dir()]
+    if missing:
+        print(f"Error: Not a directory: {', '.join(missing)}", file=sys.stderr)
+        output_json({"error": f"Not a directory: {', '.join(missing)}"})
+        sys.exit(1)
+    data["roots"] = roots
+    return data
+
+
+def main() -> int:
+    data = parse_args()
+    workers = data.get("workers") or min(MAX_WORKERS, os.cpu_count() or 1)
+    manifest = Path(data.get("manifest") or DEFAULT_MANIFEST).expanduser()
+    try:
+        report = sweep(data["roots"], manifest, workers, data.get("lint_only", False), data.get("full", False))
+    except RendererError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        output_json({"error": str(e)})
+        return 2
+    for block in report["invalid"]:
+        print(f"INVALID {block['file']}:{block['line']}: {block['error'].splitlines()[0]}", file=sys.stderr)
+    print(f"{report['blocks']} blocks in {report['files']} files; {report['checked']} checked, "
+          f"{report['reused']} reused", file=sys.stderr)
+    output_json(report)
+    return 1 if report["invalid"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
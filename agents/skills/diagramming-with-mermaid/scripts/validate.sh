@@ -45,6 +45,16 @@ trap 'rm -rf "$TMPDIR"' EXIT
 # Write diagram to temp file, interpreting \n as newlines
 printf '%b' "$DIAGRAM" > "$TMPDIR/diagram.mmd"
 
+# Cheap syntax checks first; only start mmdc for diagrams that pass
+SCRIPT_DIR=$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)
+if command -v python3 &>/dev/null; then
+  LINT_RESULT=$(jq -n --rawfile diagram "$TMPDIR/diagram.mmd" '{diagram: $diagram}' \
+    | python3 "$SCRIPT_DIR/lint_mermaid.py") || {
+    echo "$LINT_RESULT" | jq -c '{valid, error}'
+    exit 0
+  }
+fi
+
 echo "Validating diagram..." >&2
 
 MMDC_OUTPUT=$(mmdc -i "$TMPDIR/diagram.mmd" -o "$TMPDIR/diagram.svg" -q 2>&1) || true
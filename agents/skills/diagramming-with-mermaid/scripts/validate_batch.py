@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Validate many Mermaid diagrams in one call, with one warm renderer.
+
+Usage (JSON via stdin):
+    scripts/validate_batch.py <<'EOF'
+    {"diagrams": ["flowchart TD\\n    A --> B", "sequenceDiagram\\n    A->>B: hi"]}
+    EOF
+
+JSON input fields:
+    diagrams: Raw Mermaid sources, without ```mermaid fences (required)
+    no_cache: Render every diagram even if a cached result exists (default: false)
+    puppeteer_config: Puppeteer launch options file, as for mmdc -p (optional)
+
+validate.sh starts a fresh mmdc — and so a fresh headless Chromium — per
+diagram. This starts one renderer (render_server.mjs, driving mermaid-cli's
+own renderMermaid()) and feeds it every diagram, so the browser launch is
+paid once per batch instead of once per diagram. Diagrams are pre-linted
+first (lint_mermaid.py): one that fails the lint gets the lint error and is
+never rendered.
+
+Results are cached by (diagram source hash, mermaid-cli version) in
+$XDG_CACHE_HOME/diagramming-with-mermaid/, so an unchanged diagram is never
+rendered twice; when every diagram is cached, no renderer is started. Only
+verdicts on the diagram itself are cached: a failure the renderer flags as
+its own (browser crash, closed target, timeout) is reported but rendered
+again next time.
+
+Outputs JSON to stdout, one result per diagram in input order, each in
+validate.sh's shape:
+    {"status": "ok", "valid": false, "linted_out": 1, "rendered": 2, "cached": 12,
+     "results": [{"valid": true}, {"valid": false, "error": "Error: Parse error on line 2: ..."}]}
+    Error: {"error": "message"}
+
+Exit codes:
+    0 - Every diagram valid
+    1 - Some diagram invalid, or invalid arguments
+    2 - Renderer unavailable or crashed (mmdc/node missing)
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+from lint_mermaid import result as lint_result
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+CACHE_PATH = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "diagramming-with-mermaid" / "validate-cache.json"
+CLI_PACKAGE = "@mermaid-js/mermaid-cli"
+# Browser launch plus a generous per-diagram allowance.
+TIMEOUT_BASE = 60
+TIMEOUT_PER_DIAGRAM = 10
+# validate.sh keeps at most this many lines of a parse error.
+MAX_ERROR_LINES = 20
+
+
+class RendererError(Exception):
+    """The renderer couldn't be started or died mid-batch."""
+
+
+def output_json(data: dict) -> None:
+    """Output structured JSON to stdout."""
+    print(json.dumps(data))
+
+
+def find_cli() -> tuple[Path, str]:
+    """mermaid-cli's package dir and version, found through the mmdc on PATH."""
+    mmdc = shutil.which("mmdc")
+    if not mmdc:
+        raise RendererError("mmdc not found. Install with: npm install -g @mermaid-js/mermaid-cli")
+    for parent in Path(os.path.realpath(mmdc)).parents:
+        package = parent / "package.json"
+        try:
+            meta = json.loads(package.read_text())
+        except (OSError, json.JSONDecodeError):
+            continue
+        if meta.get("name") == CLI_PACKAGE:
+            return parent, meta.get("version", "unknown")
+    raise RendererError(f"Could not find the {CLI_PACKAGE} package behind {mmdc}")
+
+
+def cache_key(source: str, version: str) -> str:
+    return hashlib.sha256(f"{version}\0{source}".encode()).hexdigest()
+
+
+def load_cache() -> dict:
+    try:
+        return json.loads(CACHE_PATH.read_text())
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def save_cache(cache: dict) -> None:
+    try:
+        CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp = CACHE_PATH.with_suffix(".tmp")
+        tmp.write_text(json.dumps(cache))
+        tmp.replace(CACHE_PATH)
+    except OSError:
+        pass
+
+
+def trim_error(message: str) -> str:
+    """The parse error itself, as validate.sh extracts it from mmdc: from the
+    "Parse error" line through the "Expecting" line, without stack frames."""
+    lines = message.strip().splitlines()
+    if not lines:
+        return "Error: diagram failed to render"
+    kept = []
+    for line in lines:
+        if line.lstrip().startswith("at ") and kept:
+            break
+        kept.append(line)
+        if line.startswith("Expecting"):
+            break
+    text = "\n".join(kept[:MAX_ERROR_LINES])
+    return text if text.startswith("Error:") else f"Error: {text}"
+
+
+def render(cli_dir: Path, sources: list[str],
+           puppeteer_config: str | None = None) -> tuple[list[dict], list[bool]]:
+    """Render every source in one renderer process. Returns validate.sh-shaped
+    results, and per result whether it's about the diagram (so cacheable)
+    rather than a renderer failure."""
+    node = shutil.which("node")
+    if not node:
+        raise RendererError("node not found; mermaid-cli needs Node.js")
+    cmd = [node, str(SCRIPT_DIR / "render_server.mjs"), str(cli_dir)]
+    if puppeteer_config:
+        cmd.append(puppeteer_config)
+    requests = "".join(json.dumps({"id": i, "diagram": s}) + "\n" for i, s in enumerate(sources))
+    print(f"Rendering {len(sources)} diagram(s) in one browser...", file=sys.stderr)
+    try:
+        result = subprocess.run(cmd, input=requests, capture_output=True, text=True,
+                                timeout=TIMEOUT_BASE + TIMEOUT_PER_DIAGRAM * len(sources))
+    except subprocess.TimeoutExpired:
+        raise RendererError("Renderer timed out") from None
+
+    by_id = {}
+    cacheable = {}
+    for line in result.stdout.splitlines():
+        try:
+            reply = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        by_id[reply["id"]] = ({"valid": True} if reply["valid"]
+                              else {"valid": False, "error": trim_error(reply.get("error", ""))})
+        cacheable[reply["id"]] = not reply.get("renderer_error")
+    if len(by_id) != len(sources):
+        detail = result.stderr.strip().splitlines()[-MAX_ERROR_LINES:]
+        raise RendererError("Renderer exited early: " + ("\n".join(detail) or f"exit {result.returncode}"))
+    return [by_id[i] for i in range(len(sources))], [cacheable[i] for i in range(len(sources))]
+
+
+def validate_batch(sources: list[str], use_cache: bool = True,
+                   puppeteer_config: str | None = None) -> tuple[list[dict], int]:
+    """validate.sh-shaped results for every source, and how many were rendered."""
+    linted = [lint_result(s) for s in sources]
+    if all(not r["valid"] for r in linted):
+        return linted, 0
+    cli_dir, version = find_cli()
+    cache = load_cache() if use_cache else {}
+    keys = [cache_key(s, version) for s in sources]
+    # Identical diagrams in one batch are rendered once.
+    pending = list(dict.fromkeys(k for k, r in zip(keys, linted) if r["valid"] and k not in cache))
+    fresh = {}
+    if pending:
+        source_for = dict(zip(keys, sources))
+        results, cacheable = render(cli_dir, [source_for[k] for k in pending], puppeteer_config)
+        fresh = dict(zip(pending, results))
+        cache.update((k, r) for k, r, ok in zip(pending, results, cacheable) if ok)
+        save_cache(cache)
+    return [fresh.get(k) or cache[k] if r["valid"] else r for k, r in zip(keys, linted)], len(pending)
+
+
+def parse_args() -> dict:
+    """Parse arguments from stdin JSON."""
+    if sys.stdin.isatty():
+        print("Error: This script requires JSON input via stdin", file=sys.stderr)
+        print("Usage: scripts/validate_batch.py <<'EOF'", file=sys.stderr)
+        print('{"diagrams": ["flowchart TD\\n    A --> B"]}', file=sys.stderr)
+        print("EOF", file=sys.stderr)
+        output_json({"error": "This script requires JSON input via stdin"})
+        sys.exit(1)
+    try:
+        data = json.load(sys.stdin)
+    except json.JSONDecodeError as e:
+        print(f"Error: Invalid JSON input: {e}", file=sys.stderr)
+        output_json({"error": f"Invalid JSON input: {e}"})
+        sys.exit(1)
+    diagrams = data.get("diagrams")
+    if not isinstance(diagrams, list) or not diagrams or not all(isinstance(d, str) for d in diagrams):
+        print("Error: 'diagrams' must be a non-empty list of strings", file=sys.stderr)
+        output_json({"error": "'diagrams' must be a non-empty list of strings"})
+        sys.exit(1)
+    return data
+
+
+def main() -> int:
+    data = parse_args()
+    try:
+        results, rendered = validate_batch(data["diagrams"], not data.get("no_cache", False),
+                                           data.get("puppeteer_config"))
+    except RendererError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        output_json({"error": str(e)})
+        return 2
+    valid = all(r["valid"] for r in results)
+    linted_out = sum(1 for r in results if r.get("error", "").startswith("Lint error"))
+    output_json({
+        "status": "ok",
+        "valid": valid,
+        "linted_out": linted_out,
+        "rendered": rendered,
+        "cached": len(results) - rendered - linted_out,
+        "results": results,
+    })
+    return 0 if valid else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Benchmark extract_log_errors.py on a synthetic CI log: throughput and peak memory.
+
+Usage (JSON via stdin):
+    bench_extract_log_errors.py <<'EOF'
+    {"megabytes": 200, "seed": 1}
+    EOF
+
+JSON input fields (all optional):
+    megabytes: Size of the synthetic log (default: 200)
+    errors: Error bursts scattered through it (default: 50)
+    seed: RNG seed so runs are comparable (default: 1)
+    repeat: Timed runs; the best is reported (default: 3)
+    keep: Keep the generated log instead of deleting it (default: false)
+
+The synthetic log mimics a GitHub Actions job: timestamped lines of build
+and test chatter, the occasional very long line (minified output), and
+error bursts — tracebacks, pytest failures, `##[error]` annotations, many
+of them repeated — spread through the file.
+
+Each timed run happens in a child process so its peak RSS is measured on
+its own; compare `peak_rss_mb` across sizes to check memory stays flat.
+
+Before timing, small logs with lines longer than a read block (ending
+exactly on, just before and just after a block boundary, several in a row,
+one at end of file) are extracted with both a tiny and the real block size;
+each must still count every line and find the error after them.
+
+Outputs JSON to stdout:
+    {"status": "ok", "log_bytes": ..., "seconds": ..., "mb_per_s": ...,
+     "peak_rss_mb": ..., "excerpts": ..., "truncated": false}
+    {"status": "failed", "boundary_failures": [{"case": "...", "block_size": 64, ...}]}
+
+Exit codes:
+    0 - Benchmark ran
+    1 - Invalid input, or a block-boundary case was extracted wrongly
+"""
+
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import extract_log_errors
+
+SCRIPT = Path(__file__).with_name("extract_log_errors.py")
+
+CHATTER = (
+    "Collecting package metadata (current_repodata.json): done",
+    "  Downloading https://files.pythonhosted.org/packages/ab/cd/pkg-{n}.tar.gz",
+    "tests/test_module_{n}.py::test_case_{n} PASSED",
+    "[{n}/9000] Compiling src/module_{n}.ts",
+    "npm WARN deprecated package@{n}.0.0: use something else",
+    "  -> Running step {n} of build",
+)
+BURSTS = (
+    "##[error]Process completed with exit code 1.",
+    "Traceback (most recent call last):\n"
+    '  File "/home/runner/work/app/app/src/worker.py", line {n}, in run\n'
+    "    result = handler(payload)\n"
+    "KeyError: 'job_{n}'",
+    "=================================== FAILURES ===================================\n"
+    "_______________________________ test_retry_{n} ________________________________\n"
+    "E       AssertionError: expected 3 retries, got {n}",
+    "src/api/client.ts(12,{n}): error TS2339: Property 'foo' does not exist on type 'Bar'.",
+)
+
+
+def output_json(data: dict) -> None:
+    """Output structured JSON to stdout."""
+    print(json.dumps(data))
+
+
+def synthetic_log(path: Path, megabytes: int, errors: int, seed: int) -> int:
+    """Write a ~megabytes log to path; returns its size in bytes."""
+    rng = random.Random(seed)
+    target = megabytes << 20
+    burst_every = max(1, target // max(1, errors))
+    written = 0
+    next_burst = rng.randrange(burst_every)
+    stamp = "2026-01-01T00:00:00.0000000Z "
+    with open(path, "w") as f:
+        while written < target:
+            # Build in batches: generating line by line would dominate the run
+            batch = [
+                stamp + rng.choice(CHATTER).format(n=rng.randrange(10000))
+                for _ in range(2000)
+            ]
+            if rng.random() < 0.05:
+                batch.append(stamp + "x" * rng.randrange(10_000, 200_000))
+            if written >= next_burst:
+                burst = rng.choice(BURSTS).format(n=rng.randrange(10000))
+                batch += [stamp + line for line in burst.split("\n")]
+                next_burst += burst_every
+            text = "\n".join(batch) + "\n"
+            f.write(text)
+            written += len(text)
+    return written
+
+
+def boundary_cases(block: int) -> dict[str, str]:
+    """Logs whose overlong lines end around multiples of `block`, each
+    followed by the one error the extractor must find."""
+    error = "##[error]real failure\nmore\n"
+    return {
+        "newline_is_last_byte_of_block": "x" * (3 * block - 1) + "\n" + error,
+        "newline_first_byte_of_block": "x" * (3 * block) + "\n" + error,
+        "newline_mid_block": "x" * (3 * block + block // 2) + "\n" + error,
+        "long_lines_in_a_row": ("y" * (2 * block - 1) + "\n") * 3 + "short\n"
+                               + ("z" * (block + 7) + "\n") * 2 + error,
+        "long_line_at_eof": error + "x" * (2 * block + 3),
+    }
+
+
+def check_boundaries() -> list[dict]:
+    """Extract every boundary case at a tiny and the real block size."""
+    failures = []
+    real = extract_log_errors.BLOCK_SIZE
+    with tempfile.TemporaryDirectory(prefix="bench-ci-") as tmp:
+        for block in (64, real):
+            extract_log_errors.BLOCK_SIZE = block
+            try:
+                for case, text in boundary_cases(block).items():
+                    path = Path(tmp) / f"{case}.log"
+                    path.write_text(text)
+                    lines = text.split("\n")
+                    want = {"lines": len(lines) - (lines[-1] == ""),
+                            "match_line": lines.index("##[error]real failure") + 1}
+                    result = extract_log_errors.extract(str(path))
+                    got = {"lines": result["lines"],
+                           "match_line": result["excerpts"][0]["match_line"] if result["excerpts"] else None}
+                    if got != want:
+                        failures.append({"case": case, "block_size": block, "expected": want, "got": got})
+            finally:
+                extract_log_errors.BLOCK_SIZE = real
+    return failures
+
+
+def timed_run(path: Path) -> tuple[float, float, dict]:
+    """(seconds, peak RSS in MB, output) for one extractor run."""
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, str(SCRIPT)], input=json.dumps({"path": str(path)}),
+        capture_output=True, text=True, check=True,
+    )
+    elapsed = time.perf_counter() - start
+    # RUSAGE_CHILDREN is the max over every child so far; runs only ever
+    # repeat the same work, so the max is the per-run peak.
+    peak_kb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return elapsed, peak_kb / 1024, json.loads(proc.stdout)
+
+
+def parse_args() -> dict:
+    """Parse arguments from stdin JSON (empty input means all defaults)."""
+    if sys.stdin.isatty():
+        print("Error: This script requires JSON input via stdin", file=sys.stderr)
+        print("Usage: bench_extract_log_errors.py <<'EOF'", file=sys.stderr)
+        print('{"megabytes": 200}', file=sys.stderr)
+        print("EOF", file=sys.stderr)
+        output_json({"error": "This script requires JSON input via stdin"})
+        sys.exit(1)
+    try:
+        text = sys.stdin.read().strip()
+        return json.loads(text) if text else {}
+    except json.JSONDecodeError as e:
+        print(f"Error: Invalid JSON input: {e}", file=sys.stderr)
+        output_json({"error": f"Invalid JSON input: {e}"})
+        sys.exit(1)
+
+
+def main() -> int:
+    opts = parse_args()
+    megabytes = opts.get("megabytes", 200)
+    repeat = max(1, opts.get("repeat", 3))
+
+    failures = check_boundaries()
+    if failures:
+        for failure in failures:
+            print(f"Block-boundary case failed: {failure}", file=sys.stderr)
+        output_json({"status": "failed", "boundary_failures": failures})
+        return 1
+
+    fd, name = tempfile.mkstemp(prefix="bench-ci-", suffix=".log")
+    os.close(fd)
+    path = Path(name)
+    try:
+        print(f"Generating {megabytes} MB synthetic log...", file=sys.stderr)
+        size = synthetic_log(path, megabytes, opts.get("errors", 50), opts.get("seed", 1))
+        runs = [timed_run(path) for _ in range(repeat)]
+    finally:
+        if not opts.get("keep"):
+            path.unlink()
+
+    best = min(r[0] for r in runs)
+    log = runs[-1][2]["logs"][0]
+    output_json({
+        "status": "ok",
+        "log_path": str(path) if opts.get("keep") else None,
+        "log_bytes": size,
+        "log_lines": log["lines"],
+        "seconds": round(best, 3),
+        "mb_per_s": round(size / (1 << 20) / best, 1),
+        "peak_rss_mb": round(max(r[1] for r in runs), 1),
+        "excerpts": len(log["excerpts"]),
+        "truncated": log["truncated"],
+    })
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Benchmark fetch_comments.py's pure-Python hot paths on synthetic PRs: time,
+peak memory and how each scales with PR size, against a stored baseline.
+
+Usage (JSON via stdin):
+    bench_fetch_comments.py <<'EOF'
+    {"sizes": [100, 1000, 10000, 100000]}
+    EOF
+
+    # Record the current numbers as the baseline to compare later runs with
+    bench_fetch_comments.py <<'EOF'
+    {"save_baseline": true}
+    EOF
+
+JSON input fields (all optional):
+    sizes: Comment counts of the synthetic PRs (default: [100, 1000, 10000, 100000])
+    functions: Which functions to time (default: all of FUNCTIONS)
+    seed: synthetic_pr.py seed so runs are comparable (default: 1)
+    repeat: Timed runs per function and size; the best is reported (default: 5)
+    baseline: Baseline file (default: $XDG_CACHE_HOME/fixing-prs/bench-fetch-comments.json)
+    save_baseline: Write this run's numbers to the baseline file (default: false)
+    tolerance: Slowdown or memory growth vs the baseline that counts as a
+               regression (default: 1.5, i.e. 50% worse)
+
+Functions and their workloads (one call per item of the PR, so each is
+timed over a whole PR):
+    collapse_details     every comment, review and issue-comment body
+    clean_body           the same bodies
+    conversation_status  every thread's body list
+    new_reply_indices    every thread's body list
+    annotate             the whole fetch_all()-shaped PR (a fresh copy per run)
+    render               the annotated PR, with --all
+
+Two checks, either of which sets "status": "regressed":
+    - growth: the log-log slope of time against PR size between
+      consecutive sizes. These are all linear passes, so a slope well above
+      1 (SUPERLINEAR) means something went quadratic. Unlike absolute
+      times, this holds on any machine.
+    - baseline: seconds or peak memory worse than the stored baseline by
+      more than `tolerance`. Baselines are per machine; save one before a
+      change, then compare after it.
+
+Peak memory is measured with tracemalloc on a separate, untimed run (it
+slows allocation-heavy code several-fold).
+
+Outputs JSON to stdout (and a table to stderr):
+    {"status": "ok|regressed", "results": [{"function": "render", "comments": 1000,
+      "seconds": 0.012, "us_per_comment": 12.0, "peak_mb": 1.8, "growth": 1.02,
+      "baseline_ratio": {"seconds": 0.97, "peak_mb": 1.0}}],
+     "regressions": ["render@100000: growth 1.9"]}
+
+Exit codes:
+    0 - No regressions
+    1 - Invalid input
+    2 - Regressions found
+"""
+
+import copy
+import gc
+import json
+import math
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from fetch_comments import annotate, clean_body, collapse_details, conversation_status, new_reply_indices, render
+from synthetic_pr import synthetic_pr
+
+FUNCTIONS = ("collapse_details", "clean_body", "conversation_status", "new_reply_indices", "annotate", "render")
+DEFAULT_SIZES = [100, 1000, 10000, 100000]
+DEFAULT_BASELINE = (Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+                    / "fixing-prs" / "bench-fetch-comments.json")
+# Growth between sizes under this many comments is mostly fixed overhead
+# and timer noise, so it isn't judged.
+GROWTH_MIN_SIZE = 1000
+SUPERLINEAR = 1.3
+
+
+def output_json(data: dict) -> None:
+    """Output structured JSON to stdout."""
+    print(json.dumps(data))
+
+
+def fetch_data(pr: dict) -> dict:
+    """synthetic_pr() state in the shape fetch_all() returns."""
+    threads = [
+        dict({k: t[k] for k in ("id", "isResolved", "isOutdated", "path", "line", "originalLine")},
+             comments=[
+                 dict({k: c[k] for k in ("databaseId", "author", "body", "createdAt",
+                                         "isMinimized", "minimizedReason")},
+                      pullRequestReview={"databaseId": c["review"]} if c["review"] else None)
+                 for c in t["comments"]
+             ])
+        for t in pr["threads"]
+    ]
+    info = {k: pr[k] for k in ("number", "title", "state", "isDraft", "headRefName",
+                               "baseRefName", "headRefOid", "author")}
+    info["url"] = f"https://github.com/{pr['owner']}/{pr['repo']}/pull/{pr['number']}"
+    return {"owner": pr["owner"], "repo": pr["repo"], "info": info, "threads": threads,
+            "reviews": pr["reviews"], "issue_comments": pr["issue_comments"]}
+
+
+def workloads(data: dict) -> dict:
+    """name -> (setup, call): setup builds the input outside the timing."""
+    bodies = ([c["body"] for t in data["threads"] for c in t["comments"]]
+              + [r["body"] for r in data["reviews"]] + [c["body"] for c in data["issue_comments"]])
+    thread_bodies = [[c["body"] for c in t["comments"]] for t in data["threads"]]
+    annotated = annotate(copy.deepcopy(data))
+    return {
+        "collapse_details": (lambda: bodies, lambda b: [collapse_details(x) for x in b]),
+        "clean_body": (lambda: bodies, lambda b: [clean_body(x) for x in b]),
+        "conversation_status": (lambda: thread_bodies, lambda t: [conversation_status(x) for x in t]),
+        "new_reply_indices": (lambda: thread_bodies, lambda t: [new_reply_indices(x) for x in t]),
+        "annotate": (lambda: copy.deepcopy(data), annotate),
+        "render": (lambda: annotated, lambda d: render(d, show_all=True)),
+    }
+
+
+def measure(setup, call, repeat: int) -> tuple[float, float]:
+    """(best seconds, peak MB allocated during one call)."""
+    best = math.inf
+    for _ in range(repeat):
+        arg = setup()
+        # As timeit does: a collection landing in one run but not another
+        # is most of the run-to-run noise.
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            call(arg)
+            best = min(best, time.perf_counter() - start)
+        finally:
+            gc.enable()
+    arg = setup()
+    tracemalloc.start()
+    call(arg)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak / (1 << 20)
+
+
+def load_baseline(path: Path) -> dict:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def save_baseline(path: Path, results: list[dict]) -> None:
+    baseline = load_baseline(path)
+    for r in results:
+        baseline[f"{r['function']}@{r['comments']}"] = {"seconds": r["seconds"], "peak_mb": r["peak_mb"]}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(baseline, indent=2, sort_keys=True))
+    tmp.replace(path)
+
+
+def parse_args() -> dict:
+    """Parse arguments from stdin JSON (empty input means all defaults)."""
+    if sys.stdin.isatty():
+        print("Error: This script requires JSON input via stdin", file=sys.stderr)
+        print("Usage: bench_fetch_comments.py <<'EOF'", file=sys.stderr)
+        print('{"sizes": [100, 1000, 10000]}', file=sys.stderr)
+        print("EOF", file=sys.stderr)
+        output_json({"error": "This script requires JSON input via stdin"})
+        sys.exit(1)
+    try:
+        text = sys.stdin.read().strip()
+        opts = json.loads(text) if text else {}
+    except json.JSONDecodeError as e:
+        print(f"Error: Invalid JSON input: {e}", file=sys.stderr)
+        output_json({"error": f"Invalid JSON input: {e}"})
+        sys.exit(1)
+    unknown = set(opts.get("functions", [])) - set(FUNCTIONS)
+    if unknown:
+        print(f"Error: Unknown functions: {sorted(unknown)}", file=sys.stderr)
+        output_json({"error": f"Unknown functions: {sorted(unknown)}; choose from {list(FUNCTIONS)}"})
+        sys.exit(1)
+    return opts
+
+
+def main() -> int:
+    opts = parse_args()
+    sizes = sorted(opts.get("sizes", DEFAULT_SIZES))
+    functions = opts.get("functions", FUNCTIONS)
+    repeat = max(1, opts.get("repeat", 5))
+    tolerance = opts.get("tolerance", 1.5)
+    baseline_path = Path(opts.get("baseline", DEFAULT_BASELINE)).expanduser()
+    baseline = load_baseline(baseline_path)
+
+    results = []
+    regressions = []
+    previous: dict[str, dict] = {}
+    for size in sizes:
+        print(f"Generating a {size}-comment PR...", file=sys.stderr)
+        data = fetch_data(synthetic_pr(size, opts.get("seed", 1)))
+        jobs = workloads(data)
+        for name in functions:
+            seconds, peak = measure(*jobs[name], repeat)
+            result = {"function": name, "comments": size, "seconds": round(seconds, 6),
+                      "us_per_comment": round(seconds / size * 1e6, 3), "peak_mb": round(peak, 3),
+                      "growth": None, "baseline_ratio": None}
+            before = previous.get(name)
+            if before and before["seconds"] > 0 and seconds > 0:
+                result["growth"] = round(math.log(seconds / before["seconds"]) / math.log(size / before["comments"]), 2)
+                if before["comments"] >= GROWTH_MIN_SIZE and result["growth"] > SUPERLINEAR:
+                    regressions.append(f"{name}@{size}: growth {result['growth']}")
+            base = baseline.get(f"{name}@{size}")
+            if base:
+                ratio = {"seconds": round(seconds / base["seconds"], 2) if base["seconds"] else None,
+                         "peak_mb": round(peak / base["peak_mb"], 2) if base["peak_mb"] else None}
+                result["baseline_ratio"] = ratio
+                for metric, value in ratio.items():
+                    if value is not None and value > tolerance:
+                        regressions.append(f"{name}@{size}: {metric} x{value} vs baseline")
+            results.append(result)
+            previous[name] = result
+
+    if opts.get("save_baseline"):
+        save_baseline(baseline_path, results)
+        print(f"Baseline saved to {baseline_path}", file=sys.stderr)
+
+    print(f"{'function':<20}{'comments':>9}{'ms':>10}{'us/comment':>12}{'peak MB':>9}{'growth':>8}{'vs base':>9}",
+          file=sys.stderr)
+    for r in results:
+        growth = "" if r["growth"] is None else f"{r['growth']:.2f}"
+        vs = "" if not r["baseline_ratio"] or r["baseline_ratio"]["seconds"] is None else f"x{r['baseline_ratio']['seconds']:.2f}"
+        print(f"{r['function']:<20}{r['comments']:>9}{r['seconds'] * 1000:>10.2f}{r['us_per_comment']:>12.2f}"
+              f"{r['peak_mb']:>9.2f}{growth:>8}{vs:>9}", file=sys.stderr)
+    for line in regressions:
+        print(f"REGRESSION {line}", file=sys.stderr)
+
+    output_json({"status": "regressed" if regressions else "ok", "results": results,
+                 "regressions": regressions})
+    return 2 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
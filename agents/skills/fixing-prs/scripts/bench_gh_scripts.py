@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Benchmark the PR scripts' GitHub API cost against fake_github.py: calls,
+bytes and wall time per script, per PR size.
+
+Usage (JSON via stdin):
+    bench_gh_scripts.py <<'EOF'
+    {"sizes": [10, 100, 1000, 10000], "latency_ms": 50}
+    EOF
+
+JSON input fields (all optional):
+    sizes: Comment counts of the synthetic PRs (default: [10, 100, 1000])
+    seed: synthetic_pr.py seed so runs are comparable (default: 1)
+    latency_ms: Server-side delay per request, to see round trips in wall time (default: 0)
+    page_cap: Largest page the fake serves, to exercise paging on small PRs
+    rate_limit_every: Answer every Nth request with a secondary rate limit
+    scripts: Names of the scenarios to run (default: all of them)
+
+Scenarios, each run against a fresh copy of the PR through the fake_gh/gh
+shim:
+    fetch_comments      fetch_comments.py <url>
+    post_reply          post_reply.py, replying to the first thread's root comment
+    post_review         post_review.py COMMENT with one inline comment
+    update_description  update_pr_description.py with a summary
+    fetch_pr_data       reviewing-prs/scripts/fetch_pr_data.sh <url>
+
+Counts come from the server, so they are exact; wall time includes the
+shim's Python startup per gh call (~20 ms), which real gh doesn't have but
+which scales the same way (per call).
+
+Outputs JSON to stdout (and a table to stderr):
+    {"status": "ok", "results": [{"comments": 100, "script": "fetch_comments", "exit": 0,
+      "seconds": 0.41, "api_calls": 5, "bytes": 48210, "rate_limited": 0,
+      "by_endpoint": {"POST graphql": {"calls": 5, "bytes": 48210}}}]}
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+from fake_github import start
+from synthetic_pr import synthetic_pr
+
+HERE = Path(__file__).resolve().parent
+SHIM_DIR = HERE / "fake_gh"
+REVIEWING = HERE.parent.parent / "reviewing-prs" / "scripts"
+# A stuck script (say, an unbounded retry loop against the rate limiter)
+# shouldn't hang the whole run.
+SCRIPT_TIMEOUT = 300
+
+
+def output_json(data: dict) -> None:
+    """Output structured JSON to stdout."""
+    print(json.dumps(data))
+
+
+def scenarios(pr: dict) -> dict:
+    """name -> (argv, stdin) for one PR."""
+    url = f"https://github.com/{pr['owner']}/{pr['repo']}/pull/{pr['number']}"
+    root = pr["threads"][0]["comments"][0]["databaseId"]
+    return {
+        "fetch_comments": ([sys.executable, str(HERE / "fetch_comments.py"), url], None),
+        "post_reply": ([sys.executable, str(HERE / "post_reply.py")],
+                       {"pr": url, "comment_id": root, "body": "Fixed.", "force": True}),
+        "post_review": ([sys.executable, str(REVIEWING / "post_review.py")],
+                        {"pr": url, "event": "COMMENT", "body": "A few notes.",
+                         "comments": [{"path": pr["files"][0], "line": 3, "body": "Guard this?"}]}),
+        "update_description": ([sys.executable, str(HERE / "update_pr_description.py")],
+                               {"pr": url, "summary": "- Fixed the null check"}),
+        "fetch_pr_data": (["bash", str(REVIEWING / "fetch_pr_data.sh"), url], None),
+    }
+
+
+def fake_call(base: str, path: str, method: str = "GET") -> dict:
+    req = urllib.request.Request(base + path, method=method, data=b"" if method == "POST" else None)
+    with urllib.request.urlopen(req) as resp:
+        return json.load(resp)
+
+
+def run(argv: list[str], stdin: dict | None, base: str) -> tuple[int, float]:
+    env = dict(os.environ, PATH=f"{SHIM_DIR}{os.pathsep}{os.environ.get('PATH', '')}", FAKE_GH_URL=base)
+    start_time = time.perf_counter()
+    try:
+        proc = subprocess.run(argv, input=json.dumps(stdin) if stdin else "", env=env,
+                              capture_output=True, text=True, timeout=SCRIPT_TIMEOUT)
+        code = proc.returncode
+    except subprocess.TimeoutExpired:
+        code = -1
+    return code, time.perf_counter() - start_time
+
+
+def parse_args() -> dict:
+    """Parse arguments from stdin JSON (empty input means all defaults)."""
+    if sys.stdin.isatty():
+        print("Error: This script requires JSON input via stdin", file=sys.stderr)
+        print("Usage: bench_gh_scripts.py <<'EOF'", file=sys.stderr)
+        print('{"sizes": [10, 100, 1000]}', file=sys.stderr)
+        print("EOF", file=sys.stderr)
+        output_json({"error": "This script requires JSON input via stdin"})
+        sys.exit(1)
+    try:
+        text = sys.stdin.read().strip()
+        return json.loads(text) if text else {}
+    except json.JSONDecodeError as e:
+        print(f"Error: Invalid JSON input: {e}", file=sys.stderr)
+        output_json({"error": f"Invalid JSON input: {e}"})
+        sys.exit(1)
+
+
+def main() -> int:
+    opts = parse_args()
+    results = []
+    for size in opts.get("sizes", [10, 100, 1000]):
+        print(f"Generating a {size}-comment PR...", file=sys.stderr)
+        pr = synthetic_pr(size, opts.get("seed", 1))
+        server, _ = start(pr, latency_ms=opts.get("latency_ms", 0), page_cap=opts.get("page_cap"),
+                          rate_limit_every=opts.get("rate_limit_every"))
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        try:
+            for name, (argv, stdin) in scenarios(pr).items():
+                if opts.get("scripts") and name not in opts["scripts"]:
+                    continue
+                fake_call(base, "/_fake/reset?state=1", "POST")
+                code, seconds = run(argv, stdin, base)
+                stats = fake_call(base, "/_fake/stats")
+                results.append({
+                    "comments": size, "script": name, "exit": code, "seconds": round(seconds, 3),
+                    "api_calls": stats["calls"], "bytes": stats["bytes"],
+                    "rate_limited": stats["rate_limited"], "by_endpoint": stats["by_endpoint"],
+                })
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    print(f"{'comments':>8}  {'script':<20}{'exit':>5}{'calls':>7}{'KB':>9}{'seconds':>9}", file=sys.stderr)
+    for r in results:
+        print(f"{r['comments']:>8}  {r['script']:<20}{r['exit']:>5}{r['api_calls']:>7}"
+              f"{r['bytes'] / 1024:>9.1f}{r['seconds']:>9.2f}", file=sys.stderr)
+    output_json({"status": "ok", "results": results})
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
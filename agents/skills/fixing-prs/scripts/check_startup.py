@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Check the PR scripts' cold-start imports against a budget, with
+`python -X importtime`.
+
+Usage (JSON via stdin):
+    check_startup.py <<'EOF'
+    {}
+    EOF
+
+    check_startup.py <<'EOF'
+    {"scripts": ["fetch_comments"], "budget_ms": 10}
+    EOF
+
+JSON input fields (all optional):
+    scripts: Which scripts to check (default: all of BUDGETS)
+    budget_ms: One absolute budget for every checked script, instead of BUDGETS
+    repeat: Fresh interpreters per script; the fastest is reported (default: 11)
+
+Each run is a new interpreter importing the script as a module (so its
+main() doesn't run), the way a request handed to pr_daemon.py or a usage
+error starts up. Reported is the script module's cumulative import time:
+everything it imports, but not interpreter startup (site and co.), which no
+script can change. Bytecode goes to $XDG_CACHE_HOME/fixing-prs/pycache and
+one untimed run warms it, so compiling isn't counted either.
+
+Two checks, so a slow or loaded machine doesn't fail them at random:
+    - No script may import any of EAGER_FORBIDDEN at startup. This is exact.
+    - Each script's import time stays within its BUDGETS multiple of the
+      baseline: the wall time of a bare `python -c pass`, best of the same
+      repeats in the same run, so both scale with the machine and its load.
+
+Over budget usually means a module-level import of something only main()
+needs; make it pr_core.lazy_import() instead. "top" lists the script's
+costliest direct imports to start from.
+
+It also checks that the modules fixing-prs and reviewing-prs each carry a
+copy of (SHARED) are still byte-identical, so the copies can't drift.
+
+Outputs JSON to stdout (and a table to stderr):
+    {"status": "ok|over_budget|copies_differ", "baseline_ms": 11.0,
+     "results": [{"script": "fetch_comments", "ms": 10.3, "budget_ms": 22.0,
+      "eager": [], "top": [["json", 8.8], ["gh_trace", 0.3]]}],
+     "over_budget": ["probe_merge_state: 31.0 ms > 27.5 ms (2.5x baseline)",
+                     "watch_ci imports subprocess at startup"],
+     "copies_differ": ["pr_core.py"]}
+
+Exit codes:
+    0 - Every script within budget, shared copies identical
+    1 - Invalid input
+    2 - Some script over budget
+    3 - Shared copies differ
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+REVIEWING = HERE.parent.parent / "reviewing-prs" / "scripts"
+PYCACHE = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "fixing-prs" / "pycache"
+# Import time allowed, as a multiple of the baseline (bare interpreter
+# startup). json and re, which every script needs, are most of what's left
+# (~0.7-1.3x, noisy); probe_merge_state and watch_ci also need pathlib and
+# each other's module-level code (~1.1-1.5x). The headroom is wide on
+# purpose: eager imports, the usual regression, are caught exactly by
+# EAGER_FORBIDDEN, and this only has to catch something heavier.
+BUDGETS = {
+    "fetch_comments": 2.0,
+    "post_reply": 2.0,
+    "update_pr_description": 2.0,
+    "probe_merge_state": 2.5,
+    "watch_ci": 2.5,
+    "post_review": 2.0,
+}
+# Only main() needs these; a script importing one at module level pays for
+# it on every pr_daemon.py hand-off and usage error.
+EAGER_FORBIDDEN = (
+    "subprocess", "argparse", "socket", "tempfile", "threading", "concurrent.futures",
+    "urllib.request", "http.client",
+)
+SCRIPT_DIRS = {"post_review": REVIEWING}
+# Modules both skills carry a copy of (skills are packaged separately).
+SHARED = ["pr_core.py", "pr_daemon_client.py"]
+TOP = 5
+
+
+def output_json(data: dict) -> None:
+    """Output structured JSON to stdout."""
+    print(json.dumps(data))
+
+
+def child_env() -> dict[str, str]:
+    env = {k: v for k, v in os.environ.items() if k != "PYTHONDONTWRITEBYTECODE"}
+    env["PYTHONPYCACHEPREFIX"] = str(PYCACHE)
+    env["PR_DAEMON"] = "0"
+    env.pop("GH_TRACE", None)
+    return env
+
+
+def import_times(script: str) -> list[tuple[int, str, int]]:
+    """(depth, module, cumulative us) per import, in -X importtime order."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {script}"],
+                          cwd=SCRIPT_DIRS.get(script, HERE), env=child_env(),
+                          capture_output=True, text=True, stdin=subprocess.DEVNULL)
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {script} failed: {proc.stderr.strip().splitlines()[-1:]}")
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        rows.append(((len(name) - len(name.lstrip())) // 2, name.strip(), int(cumulative)))
+    return rows
+
+
+def baseline(repeat: int) -> float:
+    """Best wall ms of a bare `python -c pass`."""
+    env = child_env()
+
+    def run() -> float:
+        start = time.perf_counter()
+        proc = subprocess.run([sys.executable, "-c", "pass"], env=env,
+                              capture_output=True, stdin=subprocess.DEVNULL)
+        if proc.returncode != 0:
+            raise RuntimeError(f"python -c pass failed: {proc.stderr.decode().strip()[-200:]}")
+        return (time.perf_counter() - start) * 1000
+
+    run()  # warm the bytecode cache
+    return min(run() for _ in range(repeat))
+
+
+def measure(script: str, repeat: int) -> tuple[float, list, list[str]]:
+    """(best cumulative ms, [[direct import, ms], ...] of that run, the
+    EAGER_FORBIDDEN modules the script imported)."""
+    import_times(script)  # warm the bytecode cache
+    best = None
+    for _ in range(repeat):
+        rows = import_times(script)
+        end = max(i for i, (depth, name, _) in enumerate(rows) if depth == 0 and name == script)
+        if best is None or rows[end][2] < best[end][2]:
+            best = rows
+            best_end = end
+    start = best_end
+    while start > 0 and best[start - 1][0] > 0:
+        start -= 1
+    direct = sorted(((name, us / 1000) for depth, name, us in best[start:best_end] if depth == 1),
+                    key=lambda x: -x[1])
+    loaded = {name for _, name, _ in best[start:best_end]}
+    eager = [name for name in EAGER_FORBIDDEN if name in loaded]
+    return best[best_end][2] / 1000, [[name, round(ms, 2)] for name, ms in direct[:TOP]], eager
+
+
+def differing_copies() -> list[str]:
+    """SHARED modules whose two copies aren't byte-identical (or are missing)."""
+    differ = []
+    for name in SHARED:
+        try:
+            same = (HERE / name).read_bytes() == (REVIEWING / name).read_bytes()
+        except OSError:
+            same = False
+        if not same:
+            differ.append(name)
+    return differ
+
+
+def parse_args() -> dict:
+    """Parse arguments from stdin JSON (empty input means all defaults)."""
+    if sys.stdin.isatty():
+        print("Error: This script requires JSON input via stdin", file=sys.stderr)
+        print("Usage: check_startup.py <<'EOF'", file=sys.stderr)
+        print('{"scripts": ["fetch_comments"]}', file=sys.stderr)
+        print("EOF", file=sys.stderr)
+        output_json({"error": "This script requires JSON input via stdin"})
+        sys.exit(1)
+    try:
+        text = sys.stdin.read().strip()
+        opts = json.loads(text) if text else {}
+    except json.JSONDecodeError as e:
+        print(f"Error: Invalid JSON input: {e}", file=sys.stderr)
+        output_json({"error": f"Invalid JSON input: {e}"})
+        sys.exit(1)
+    unknown = set(opts.get("scripts", [])) - set(BUDGETS)
+    if unknown:
+        print(f"Error: Unknown scripts: {sorted(unknown)}", file=sys.stderr)
+        output_json({"error": f"Unknown scripts: {sorted(unknown)}; choose from {list(BUDGETS)}"})
+        sys.exit(1)
+    return opts
+
+
+def main() -> int:
+    opts = parse_args()
+    repeat = max(1, opts.get("repeat", 11))
+    results = []
+    over = []
+    try:
+        base = baseline(repeat)
+    except RuntimeError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        output_json({"error": str(e)})
+        return 1
+    for script in opts.get("scripts", BUDGETS):
+        if "budget_ms" in opts:
+            budget, why = opts["budget_ms"], "given"
+        else:
+            budget, why = BUDGETS[script] * base, f"{BUDGETS[script]}x baseline"
+        try:
+            ms, top, eager = measure(script, repeat)
+        except RuntimeError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            output_json({"error": str(e)})
+            return 1
+        results.append({"script": script, "ms": round(ms, 2), "budget_ms": round(budget, 2),
+                        "eager": eager, "top": top})
+        over += [f"{script} imports {name} at startup" for name in eager]
+        if ms > budget:
+            over.append(f"{script}: {ms:.1f} ms > {budget:.1f} ms ({why})")
+
+    print(f"baseline (python -c pass): {base:.1f} ms", file=sys.stderr)
+    print(f"{'script':<24}{'ms':>8}{'budget':>8}  top imports (ms)", file=sys.stderr)
+    for r in results:
+        top = ", ".join(f"{name} {ms:.1f}" for name, ms in r["top"])
+        print(f"{r['script']:<24}{r['ms']:>8.1f}{r['budget_ms']:>8.1f}  {top}", file=sys.stderr)
+    for line in over:
+        print(f"OVER BUDGET {line}", file=sys.stderr)
+    differ = differing_copies()
+    for name in differ:
+        print(f"COPIES DIFFER {HERE / name} and {REVIEWING / name}", file=sys.stderr)
+
+    status = "copies_differ" if differ else "over_budget" if over else "ok"
+    output_json({"status": status, "baseline_ms": round(base, 2), "results": results,
+                 "over_budget": over, "copies_differ": differ})
+    return 3 if differ else 2 if over else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+Shared CI watcher: one process polls the check rollups of every PR that
+any `watch_ci.py --shared` caller is waiting on.
+
+Usage:
+    watch_ci.py <pr_url_or_number> --shared   # what agents run
+    ci_hub.py                                  # the hub itself (started on demand)
+
+When several agents work in parallel (e.g. a coordinate-delivery fan-out),
+separate watch_ci.py processes would each poll GitHub on their own: N PRs
+cost N requests per tick. With --shared, a caller instead drops a want file
+into the hub directory and waits for its result file. The first caller
+starts the hub in the background; the hub holds a lock so there is only
+ever one.
+
+Each tick the hub reads the want files, groups them by PR, and fetches every
+PR's rollup in a single aliased GraphQL query (batches of MAX_BATCH), so API
+load grows with ticks, not PRs × ticks. The tick interval is chosen across
+all PRs the same way watch_ci.py chooses it for one. Failed job logs
+download in the background as with watch_ci.py, into each caller's own
+log_dir. When a PR's checks are all complete and that caller's logs are on
+disk (or its timeout passes) the hub writes the result file, which the
+caller prints exactly as watch_ci.py would. A slow log download holds up
+only its own caller's result, never the polling of other PRs.
+
+Wants from callers that have exited are dropped. A poll or a PR that fails
+in any way (API error, malformed response) is logged and retried next tick;
+the hub keeps serving every other PR. Once no wants remain for
+IDLE_EXIT seconds the hub exits; a caller that finds no hub running starts a
+new one, so a crashed hub is replaced within HUB_PROBE seconds.
+
+Hub progress is logged to $XDG_CACHE_HOME/fixing-prs/ci-hub/hub.log.
+
+Exit codes: 0 (also when another hub already holds the lock)
+"""
+
+import fcntl
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from watch_ci import (
+    CACHE_DIR, CONTEXT_FIELDS, DEFAULT_INTERVAL, LOG_WORKERS, MAX_INTERVAL,
+    NO_CHECKS_GRACE, estimated_remaining, fetch_checks, fetch_job_log, graphql,
+    is_failed, load_durations, next_interval, parse_rollup, save_durations,
+)
+
+HUB_DIR = CACHE_DIR / "ci-hub"
+LOCK_PATH = HUB_DIR / "hub.lock"
+LOG_PATH = HUB_DIR / "hub.log"
+# Each PR's rollup page is up to 100 contexts; keep one query's node count
+# well inside GitHub's limits.
+MAX_BATCH = 25
+# Callers only stat a local file while they wait; cheap enough to do often.
+CLIENT_POLL = 1.0
+# How often a waiting caller checks that a hub is still running.
+HUB_PROBE = 5.0
+# Linger this long with nothing to watch, so a caller registering right
+# after the last result doesn't have to start a fresh hub.
+IDLE_EXIT = 10.0
+
+BATCH_QUERY = """
+query(%s) {
+  %s
+}
+fragment Rollup on PullRequest {
+  headRefOid
+  commits(last: 1) {
+    nodes {
+      commit {
+        statusCheckRollup {
+          contexts(first: 100) {
+            pageInfo { hasNextPage endCursor }
+            nodes { %s }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+
+def pr_key(owner: str, repo: str, num: int) -> str:
+    return f"{owner}__{repo}__{num}"
+
+
+def write_atomic(path: Path, data: dict) -> None:
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(json.dumps(data))
+    tmp.rename(path)
+
+
+# --- Caller side ---
+
+def hub_running() -> bool:
+    """True when some process holds the hub lock."""
+    with open(LOCK_PATH, "w") as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return True
+        fcntl.flock(lock, fcntl.LOCK_UN)
+        return False
+
+
+def ensure_hub() -> None:
+    """Start a hub in the background unless one is running. Two callers
+    racing here may both spawn one; the loser exits on the lock."""
+    if hub_running():
+        return
+    with open(LOG_PATH, "a") as log:
+        subprocess.Popen(
+            [sys.executable, str(Path(__file__).resolve())],
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=log,
+            start_new_session=True,
+        )
+
+
+def watch_shared(owner: str, repo: str, num: int, timeout: float, fetch_logs: bool,
+                 log_dir: Path) -> tuple[str, list[dict], list[dict]]:
+    """Register with the hub and block until it reports on this PR.
+    Returns (conclusion, checks, failed_logs) like watch_ci.watch()."""
+    HUB_DIR.mkdir(parents=True, exist_ok=True)
+    want_id = f"{pr_key(owner, repo, num)}.{os.getpid()}-{time.time_ns()}"
+    now = time.time()
+    write_atomic(HUB_DIR / f"{want_id}.want", {
+        "owner": owner, "repo": repo, "num": num, "pid": os.getpid(),
+        "registered": now, "deadline": now + timeout,
+        "fetch_logs": fetch_logs, "log_dir": str(log_dir),
+    })
+    result_path = HUB_DIR / f"{want_id}.result"
+    # A hub that dies mid-watch is replaced by the next probe; past this
+    # point nobody is coming.
+    give_up = now + timeout + 2 * MAX_INTERVAL + HUB_PROBE
+
+    ensure_hub()
+    last_probe = time.time()
+    while not result_path.exists():
+        if time.time() > give_up:
+            (HUB_DIR / f"{want_id}.want").unlink(missing_ok=True)
+            raise RuntimeError(f"CI hub stopped responding (see {LOG_PATH})")
+        time.sleep(CLIENT_POLL)
+        if time.time() - last_probe > HUB_PROBE:
+            ensure_hub()
+            last_probe = time.time()
+
+    result = json.loads(result_path.read_text())
+    result_path.unlink()
+    if result.get("error"):
+        raise RuntimeError(result["error"])
+    return result["conclusion"], result["checks"], result["failed_logs"]
+
+
+# --- Hub side ---
+
+def caller_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def load_wants() -> dict[str, list[tuple[Path, dict]]]:
+    """Live wants grouped by PR key; wants of exited callers are removed."""
+    by_pr: dict[str, list[tuple[Path, dict]]] = {}
+    for path in sorted(HUB_DIR.glob("*.want")):
+        try:
+            want = json.loads(path.read_text())
+            alive = caller_alive(want["pid"])
+        except (OSError, json.JSONDecodeError, KeyError, TypeError):
+            continue
+        if not alive:
+            print(f"Caller {want['pid']} gone; dropping {path.name}", file=sys.stderr)
+            path.unlink(missing_ok=True)
+            continue
+        by_pr.setdefault(pr_key(want["owner"], want["repo"], want["num"]), []).append((path, want))
+    return by_pr
+
+
+def batch_query(count: int) -> str:
+    params = ", ".join(f"$o{i}: String!, $r{i}: String!, $n{i}: Int!" for i in range(count))
+    fields = "\n  ".join(
+        f"p{i}: repository(owner: $o{i}, name: $r{i}) {{ pullRequest(number: $n{i}) {{ ...Rollup }} }}"
+        for i in range(count)
+    )
+    return BATCH_QUERY % (params, fields, CONTEXT_FIELDS)
+
+
+def fetch_many(prs: list[tuple[str, str, int]]) -> list[list[dict] | None | Exception]:
+    """Every PR's checks (None for a PR that can't be read, the exception for
+    one whose rollup came back malformed), one aliased query per MAX_BATCH PRs."""
+    results: list[list[dict] | None | Exception] = []
+    for offset in range(0, len(prs), MAX_BATCH):
+        batch = prs[offset:offset + MAX_BATCH]
+        variables: dict = {}
+        for i, (owner, repo, num) in enumerate(batch):
+            variables.update({f"o{i}": owner, f"r{i}": repo, f"n{i}": num})
+        data = graphql(batch_query(len(batch)), variables, partial=True)
+        for i, (owner, repo, num) in enumerate(batch):
+            pr = (data.get(f"p{i}") or {}).get("pullRequest")
+            if pr is None:
+                results.append(None)
+                continue
+            try:
+                checks, info = parse_rollup(pr)
+                if info is not None and info["hasNextPage"]:
+                    # Rare: over 100 checks. Page the rest of this one PR alone.
+                    checks += fetch_checks(owner, repo, num, info["endCursor"])
+            except (KeyError, TypeError, ValueError, RuntimeError) as e:
+                results.append(e)
+                continue
+            results.append(checks)
+    return results
+
+
+def fail_overdue(wants: list[tuple[Path, dict]], message: str) -> None:
+    """Answer, with an error, the callers of a PR that keeps failing once
+    their timeout passes; the rest wait for a later tick."""
+    now = time.time()
+    for path, want in wants:
+        if now > want["deadline"]:
+            write_atomic(path.with_suffix(".result"), {"error": message})
+            path.unlink(missing_ok=True)
+
+
+def log_entry(future) -> dict:
+    """A finished log download's failed_logs entry, or its error."""
+    try:
+        return future.result()
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+
+
+def run_hub() -> None:
+    durations = load_durations()
+    interval = DEFAULT_INTERVAL
+    idle_since = None
+    # Per PR key: (job id, log dir) pairs already queued for download, the
+    # futures per log dir, and whether the run's durations were saved
+    logs: dict[str, dict] = {}
+
+    with ThreadPoolExecutor(max_workers=LOG_WORKERS) as pool:
+        while True:
+            wants = load_wants()
+            if not wants:
+                idle_since = idle_since or time.time()
+                if time.time() - idle_since > IDLE_EXIT:
+                    print("Nothing left to watch; exiting.", file=sys.stderr)
+                    return
+                time.sleep(CLIENT_POLL)
+                continue
+            idle_since = None
+
+            keys = list(wants)
+            prs = [(w["owner"], w["repo"], w["num"]) for w in (wants[k][0][1] for k in keys)]
+            try:
+                all_checks = fetch_many(prs)
+            except Exception as e:
+                print(f"Poll failed, retrying next tick: {type(e).__name__}: {e}", file=sys.stderr)
+                interval = next_interval(None, interval)
+                time.sleep(interval)
+                continue
+            print(f"Polled {len(prs)} PRs in one tick", file=sys.stderr)
+
+            estimates = []
+            # Downloads that some finished PR's result is waiting for
+            waiting_logs = []
+            # Some PR couldn't be handled this tick and is retried next tick
+            errored = False
+            for key, (owner, repo, num), checks in zip(keys, prs, all_checks):
+                if isinstance(checks, Exception):
+                    print(f"{owner}/{repo}#{num}: unreadable rollup, retrying next tick: "
+                          f"{type(checks).__name__}: {checks}", file=sys.stderr)
+                    errored = True
+                    fail_overdue(wants[key], f"Could not read checks of {owner}/{repo}#{num}: {checks}")
+                    continue
+                if checks is None:
+                    for path, _ in wants[key]:
+                        write_atomic(path.with_suffix(".result"),
+                                     {"error": f"Could not read PR {owner}/{repo}#{num}"})
+                        path.unlink(missing_ok=True)
+                    continue
+
+                try:
+                    state = logs.setdefault(key, {"submitted": set(), "futures": {}, "saved": False})
+                    log_dirs = list(dict.fromkeys(w["log_dir"] for _, w in wants[key] if w["fetch_logs"]))
+                    for check in checks:
+                        if not (is_failed(check) and check["run_id"]):
+                            continue
+                        for log_dir in log_dirs:
+                            if (check["job_id"], log_dir) in state["submitted"]:
+                                continue
+                            state["submitted"].add((check["job_id"], log_dir))
+                            print(f"{owner}/{repo}#{num}: job failed: {check['name']} — fetching log",
+                                  file=sys.stderr)
+                            state["futures"].setdefault(log_dir, []).append(pool.submit(
+                                fetch_job_log, owner, repo, check, Path(log_dir),
+                            ))
+
+                    pending = [c for c in checks if not c["done"]]
+                    now = time.time()
+                    conclusion = None
+                    if checks and not pending:
+                        conclusion = "failure" if any(is_failed(c) for c in checks) else "success"
+                        if not state["saved"]:
+                            save_durations(durations, owner, repo, checks)
+                            state["saved"] = True
+                    remaining = []
+                    waiting = False
+                    for path, want in wants[key]:
+                        if conclusion is not None:
+                            outcome = conclusion
+                        elif not checks and now - want["registered"] > NO_CHECKS_GRACE:
+                            outcome = "success"
+                        elif now > want["deadline"]:
+                            outcome = "pending"
+                        else:
+                            remaining.append(want)
+                            continue
+                        futures = state["futures"].get(want["log_dir"], []) if want["fetch_logs"] else []
+                        unfinished = [f for f in futures if not f.done()]
+                        if outcome != "pending" and unfinished and now <= want["deadline"]:
+                            # Report once this caller's logs are on disk.
+                            waiting_logs.extend(unfinished)
+                            waiting = True
+                            continue
+                        write_atomic(path.with_suffix(".result"), {
+                            "conclusion": outcome,
+                            "checks": checks,
+                            "failed_logs": [log_entry(f) for f in futures if f.done()],
+                        })
+                        path.unlink(missing_ok=True)
+                        print(f"{owner}/{repo}#{num}: {outcome}", file=sys.stderr)
+                    if remaining:
+                        estimates.append(estimated_remaining(checks, durations, owner, repo))
+                    elif not waiting:
+                        logs.pop(key, None)
+                except Exception as e:  # one bad PR mustn't take the hub (and every caller) down
+                    print(f"{owner}/{repo}#{num}: skipped this tick: {type(e).__name__}: {e}", file=sys.stderr)
+                    errored = True
+                    fail_overdue(wants[key], f"CI hub failed on {owner}/{repo}#{num}: {type(e).__name__}: {e}")
+
+            if estimates:
+                estimate = None if None in estimates else (
+                    min(e[0] for e in estimates), max(e[1] for e in estimates),
+                )
+                interval = next_interval(estimate, interval)
+            elif errored:
+                interval = next_interval(None, interval)
+            elif not waiting_logs:
+                continue  # every PR reported; pick up new wants right away
+            if waiting_logs:
+                # Sleep, but wake as soon as a log some result waits on lands.
+                wait(waiting_logs, timeout=interval if estimates else MAX_INTERVAL,
+                     return_when=FIRST_COMPLETED)
+            else:
+                time.sleep(interval)
+
+
+def main() -> int:
+    HUB_DIR.mkdir(parents=True, exist_ok=True)
+    with open(LOCK_PATH, "w") as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return 0  # another hub is already serving
+        print(f"CI hub {os.getpid()} started", file=sys.stderr)
+        try:
+            run_hub()
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Extract the error excerpts from a (possibly huge) failed CI log.
+
+Usage (JSON via stdin):
+    extract_log_errors.py <<'EOF'
+    {"path": "/tmp/ci-123-abcd/456-789.log"}
+    EOF
+
+    # Every log watch_ci.py downloaded
+    extract_log_errors.py <<'EOF'
+    {"paths": ["/tmp/ci-123-abcd/456-789.log", "/tmp/ci-123-abcd/456-790.log"]}
+    EOF
+
+JSON input fields:
+    path/paths: Log file(s) to scan (required)
+    before: Context lines kept before each error line (default: 5)
+    after: Context lines kept after each error line (default: 10)
+    max_excerpts: Stop collecting after this many distinct excerpts per log (default: 20)
+
+The log is streamed in fixed-size blocks, so memory stays flat whether the
+log is 5 KB or 500 MB. A handful of literal searches pick out candidate
+lines, and only those are matched against the error signatures: `##[error]`,
+tracebacks, test-runner failure headers (pytest, jest, go test, cargo),
+compiler errors, and non-zero exit lines. Only the lines around a hit are
+ever decoded. Overlapping windows merge. Repeats of
+the same error (same line once timestamps, numbers and hex ids are masked)
+are counted rather than shown again.
+
+Outputs JSON to stdout:
+    {"status": "ok", "logs": [{"path": "...", "lines": 812345, "bytes": 104857600,
+      "excerpts": [{"start_line": 1200, "end_line": 1215, "match_line": 1205,
+                    "signature": "##[error]", "occurrences": 3, "text": "..."}],
+      "truncated": false}]}
+    Error: {"error": "message"}
+
+Exit codes:
+    0 - Success
+    1 - Invalid arguments or unreadable log
+"""
+
+import json
+import re
+import sys
+from collections import deque
+
+BLOCK_SIZE = 1 << 20
+DEFAULT_BEFORE = 5
+DEFAULT_AFTER = 10
+DEFAULT_MAX_EXCERPTS = 20
+# Minified bundles and base64 blobs produce single lines of megabytes.
+MAX_LINE_CHARS = 400
+# A run of distinct errors every few lines would otherwise merge into one
+# ever-growing window; split it so each excerpt stays readable.
+MAX_WINDOW_LINES = 200
+
+# Lines from the jobs API carry a timestamp; anchored signatures allow it.
+LINE_START = r"^(?:\d{4}-\d\d-\d\dT[\d:.]+Z )?"
+SIGNATURES = (
+    r"##\[error\]",                              # GitHub Actions annotations
+    r"Traceback \(most recent call last\)",       # Python
+    LINE_START + r"=+ (?:FAILURES|ERRORS) =+",     # pytest section headers
+    LINE_START + r"FAILED |" + LINE_START + r"FAIL |--- FAIL:",  # pytest/jest summaries, go test
+    r"● ",                                        # jest failing test marker
+    r"panicked at |error\[E\d+\]",                # cargo
+    r"error TS\d+:|npm ERR!",                     # tsc, npm
+    r"AssertionError|(?:^|\s)Error: ",
+    r"[Pp]rocess completed with exit code [1-9]|exit(?:ed with)? (?:code|status) [1-9]",
+    r"make: \*\*\*",
+)
+SIGNATURE_RE = re.compile("|".join(SIGNATURES).encode(), re.MULTILINE)
+# Every signature contains one of these literals. bytes.find is a fast C
+# search, while the regex alternation above crawls through every byte, so
+# the regex only ever runs on lines a needle picked out. Each needle costs a
+# full pass over the block: keep them few and shared ("rror" covers
+# `##[error]`, `error TS`, `AssertionError`...).
+NEEDLES = (b"rror", b"ERR", b"FAIL", b"Traceback", "● ".encode(), b"panicked", b"exit", b"make: ***")
+# GitHub prefixes every log line with an ISO timestamp; useless in an excerpt.
+TIMESTAMP_RE = re.compile(r"^\ufeff?\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d(?:\.\d+)?Z ?")
+# Masked before hashing so the same error on a different test/line/id dedups.
+VOLATILE_RE = re.compile(r"0x[0-9a-fA-F]+|[0-9a-f]{7,40}|\d+")
+
+
+def output_json(data: dict) -> None:
+    """Output structured JSON to stdout."""
+    print(json.dumps(data))
+
+
+def clean_line(raw: bytes) -> str:
+    line = TIMESTAMP_RE.sub("", raw.decode("utf-8", errors="replace").rstrip("\r"))
+    if len(line) > MAX_LINE_CHARS:
+        line = line[:MAX_LINE_CHARS] + " …[truncated]"
+    return line
+
+
+def dedup_key(line: str) -> str:
+    return VOLATILE_RE.sub("#", line.strip())
+
+
+def back_lines(block: bytes, end: int, floor: int, n: int) -> int:
+    """Offset of the start of the `n` lines ending just before `end`
+    (never earlier than `floor`)."""
+    pos = end
+    for _ in range(n):
+        if pos <= floor:
+            break
+        prev = block.rfind(b"\n", floor, pos - 1)
+        pos = floor if prev == -1 else prev + 1
+    return pos
+
+
+def candidate_lines(block: bytes) -> list[int]:
+    """Sorted start offsets of the lines containing any needle."""
+    starts = set()
+    for needle in NEEDLES:
+        i = block.find(needle)
+        while i != -1:
+            starts.add(block.rfind(b"\n", 0, i) + 1)
+            i = block.find(needle, block.find(b"\n", i) + 1 or len(block))
+    return sorted(starts)
+
+
+def split_lines(block: bytes, start: int, end: int) -> list[bytes]:
+    """Whole lines in block[start:end] (end sits just past a newline)."""
+    if start >= end:
+        return []
+    return block[start:end].rstrip(b"\n").split(b"\n")
+
+
+class Scanner:
+    """Merges signature hits into deduplicated excerpt windows.
+
+    State carried between blocks is bounded: the open window (capped at
+    MAX_WINDOW_LINES), the last `before` lines of the previous block, and
+    one dedup key per distinct error."""
+
+    def __init__(self, before: int, after: int, max_excerpts: int):
+        self.before = before
+        self.after = after
+        self.max_excerpts = max_excerpts
+        self.history: deque[bytes] = deque(maxlen=before)
+        self.excerpts: list[dict] = []
+        self.seen: dict[str, dict] = {}
+        self.window: dict | None = None
+        self.truncated = False
+
+    def last_line(self) -> int:
+        return self.window["start_line"] + len(self.window["lines"]) - 1
+
+    def close(self) -> None:
+        """Finish the open window in place: later repeats of its errors
+        still bump its `occurrences` through `seen`."""
+        if self.window is None:
+            return
+        w = self.window
+        w["end_line"] = self.last_line()
+        w["text"] = "\n".join(w.pop("lines"))
+        self.excerpts.append(w)
+        self.window = None
+
+    def trail(self, block: bytes, pos: int, end: int) -> int:
+        """Append the open window's outstanding trailing context from
+        block[pos:end]; returns the offset just past what was taken."""
+        if self.window is None:
+            return pos
+        stop = pos
+        for _ in range(self.window["end_line"] - self.last_line()):
+            if stop >= end:
+                break
+            stop = block.find(b"\n", stop, end) + 1 or end
+        self.window["lines"] += [clean_line(r) for r in split_lines(block, pos, stop)]
+        return stop
+
+    def scan(self, block: bytes, first_line: int) -> None:
+        """Process one block of whole lines starting at line `first_line`.
+
+        Invariant: an open window always covers every line up to `pos`, so
+        the lines between two hits are exactly block[pos:line_start]."""
+        pos, pos_line = 0, first_line
+        for line_start in candidate_lines(block):
+            line_end = block.find(b"\n", line_start) + 1 or len(block)
+            m = SIGNATURE_RE.search(block, line_start, line_end)
+            if m is None:
+                continue
+            raw = block[line_start:line_end].rstrip(b"\n")
+            line = clean_line(raw)
+            key = dedup_key(line)
+            if key in self.seen:
+                self.seen[key]["occurrences"] += 1
+                continue  # left in the stream as ordinary context
+
+            hit_line = pos_line + block.count(b"\n", pos, line_start)
+            w = self.window
+            if (w is not None and hit_line - self.last_line() - 1 <= self.after + self.before
+                    and len(w["lines"]) < MAX_WINDOW_LINES):
+                # Close enough that the contexts would touch: one window
+                w["lines"] += [clean_line(r) for r in split_lines(block, pos, line_start)]
+                w["lines"].append(line)
+                w["end_line"] = hit_line + self.after
+                self.seen[key] = w
+            else:
+                floor = self.trail(block, pos, line_start)
+                self.close()
+                if len(self.excerpts) >= self.max_excerpts:
+                    self.truncated = True
+                    return
+                lead_start = back_lines(block, line_start, floor, self.before)
+                lead = split_lines(block, lead_start, line_start)
+                if floor == 0 and lead_start == 0 and len(lead) < self.before and self.history:
+                    lead = list(self.history)[-(self.before - len(lead)):] + lead
+                self.window = {
+                    "start_line": hit_line - len(lead),
+                    "end_line": hit_line + self.after,  # target until closed
+                    "match_line": hit_line,
+                    "signature": clean_line(m.group(0)).strip(),
+                    "occurrences": 1,
+                    "lines": [clean_line(r) for r in lead] + [line],
+                }
+                self.seen[key] = self.window
+            pos, pos_line = line_end, hit_line + 1
+
+        floor = self.trail(block, pos, len(block))
+        if self.window is not None and self.last_line() >= self.window["end_line"]:
+            self.close()
+        if self.window is not None:
+            self.history.clear()  # the open window already holds these lines
+            return
+        tail = split_lines(block, back_lines(block, len(block), floor, self.before), len(block))
+        if floor > 0:
+            self.history.clear()
+        self.history.extend(tail)
+
+
+def extract(path: str, before: int = DEFAULT_BEFORE, after: int = DEFAULT_AFTER,
+            max_excerpts: int = DEFAULT_MAX_EXCERPTS) -> dict:
+    """Stream one log file and return its excerpts."""
+    scanner = Scanner(before, after, max_excerpts)
+    line = 1  # number of the first line in the next block
+    total_bytes = 0
+    carry = b""
+    overlong = False  # dropping the rest of a line longer than BLOCK_SIZE
+
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(BLOCK_SIZE)
+            # End of file is what read() said, not what's left of the chunk
+            # once an overlong line's tail is dropped from it.
+            eof = not chunk
+            total_bytes += len(chunk)
+            if scanner.truncated:
+                # Out of excerpt slots: just finish counting lines
+                line += chunk.count(b"\n")
+                if eof:
+                    break
+                continue
+            if overlong:
+                nl = chunk.find(b"\n")
+                if nl == -1 and not eof:
+                    continue
+                chunk = chunk[nl + 1:] if not eof else b""
+                carry += b"\n"
+                overlong = False
+            block = carry + chunk
+            if not eof:
+                cut = block.rfind(b"\n") + 1
+                if cut == 0:
+                    carry = block
+                    if len(carry) > BLOCK_SIZE:
+                        # Keep the head of a giant line (it's truncated for
+                        # display anyway) so memory stays bounded
+                        carry, overlong = carry[:BLOCK_SIZE], True
+                    continue
+                block, carry = block[:cut], block[cut:]
+            elif not block:
+                break
+            elif not block.endswith(b"\n"):
+                block += b"\n"  # last line had no trailing newline
+            scanner.scan(block, line)
+            line += block.count(b"\n")
+            if eof:
+                break
+
+    scanner.close()
+    return {
+        "path": path,
+        "lines": line - 1,
+        "bytes": total_bytes,
+        "excerpts": scanner.excerpts,
+        "truncated": scanner.truncated,
+    }
+
+
+def parse_args():
+    """Parse arguments from stdin JSON."""
+    if sys.stdin.isatty():
+        print("Error: This script requires JSON input via stdin", file=sys.stderr)
+        print("Usage: extract_log_errors.py <<'EOF'", file=sys.stderr)
+        print('{"path": "/tmp/ci-123/456-789.log"}', file=sys.stderr)
+        print("EOF", file=sys.stderr)
+        output_json({"error": "This script requires JSON input via stdin"})
+        sys.exit(1)
+
+    try:
+        data = json.load(sys.stdin)
+    except json.JSONDecodeError as e:
+        print(f"Error: Invalid JSON input: {e}", file=sys.stderr)
+        output_json({"error": f"Invalid JSON input: {e}"})
+        sys.exit(1)
+
+    paths = data.get("paths") or ([data["path"]] if data.get("path") else [])
+    if not paths:
+        print("Error: Missing required field 'path' or 'paths'", file=sys.stderr)
+        output_json({"error": "Missing required field 'path' or 'paths'"})
+        sys.exit(1)
+
+    class Args:
+        pass
+    args = Args()
+    args.paths = paths
+    args.before = max(0, int(data.get("before", DEFAULT_BEFORE)))
+    args.after = max(0, int(data.get("after", DEFAULT_AFTER)))
+    args.max_excerpts = max(1, int(data.get("max_excerpts", DEFAULT_MAX_EXCERPTS)))
+    return args
+
+
+def main():
+    args = parse_args()
+
+    logs = []
+    for path in args.paths:
+        print(f"Scanning {path}...", file=sys.stderr)
+        try:
+            logs.append(extract(path, args.before, args.after, args.max_excerpts))
+        except OSError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            output_json({"error": f"Could not read log {path}: {e}"})
+            return 1
+
+    output_json({"status": "ok", "logs": logs})
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,536 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the GitHub API, for benchmarking the PR scripts offline.
+
+Usage:
+    fake_github.py --comments 1000                 # serve a synthetic PR
+    fake_github.py --comments 1000 --latency-ms 80 --page-cap 20 --rate-limit-every 50
+
+    # Point the scripts at it through the gh shim:
+    PATH="$(dirname fake_github.py)/fake_gh:$PATH" FAKE_GH_URL=http://127.0.0.1:PORT \\
+        fetch_comments.py https://github.com/acme/widgets/pull/1
+
+Implements what the fixing-prs and reviewing-prs scripts call, and nothing else:
+    POST /graphql                              fetch_comments.py's four queries
+                                               (PR + threads, thread comments,
+                                               reviews, issue comments)
+    GET/PATCH  /repos/O/R/pulls/N              diff via Accept: application/vnd.github.diff
+    GET/POST   /repos/O/R/pulls/N/comments     (POST with in_reply_to)
+    POST       /repos/O/R/pulls/N/reviews
+    GET        /repos/O/R/pulls/N/reviews/ID
+    GET/POST   /repos/O/R/issues/N/comments
+    GET        /repos/O/R/issues/comments/ID
+REST lists paginate like GitHub (per_page default 30, max 100, Link
+rel="next"); GraphQL connections honour `first`, capped by --page-cap.
+Every REST GET carries an ETag, and If-None-Match gets a 304 (free against
+the rate limit, as on GitHub). REST objects carry roughly GitHub's field
+set, so byte counts are comparable.
+
+Injected trouble:
+    --latency-ms: sleep this long before every response
+    --page-cap: lower every page size, to make paging paths run on small PRs
+    --rate-limit-every N: every Nth API request gets GitHub's secondary rate
+        limit response (403, Retry-After) instead of an answer
+
+Control endpoints (not counted):
+    GET  /_fake/stats   {"calls", "bytes", "rate_limited", "by_endpoint": {...}, "log": [...]}
+    POST /_fake/reset   zero the stats; ?state=1 also restores the initial PR
+
+Prints {"status": "ok", "url": "http://127.0.0.1:PORT", "pr_url": "...", ...}
+to stdout once listening, then serves until interrupted.
+"""
+
+import argparse
+import base64
+import copy
+import hashlib
+import json
+import re
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+from synthetic_pr import synthetic_pr
+
+HOST = "127.0.0.1"
+REST_DEFAULT_PAGE = 30
+REST_MAX_PAGE = 100
+GRAPHQL_MAX_PAGE = 100
+RATE_LIMIT = 5000
+# GitHub's secondary rate limit answer, verbatim.
+SECONDARY_LIMIT_MESSAGE = (
+    "You have exceeded a secondary rate limit. Please wait a few minutes before you try again. "
+    "If you reach out to GitHub Support for help, please include the request ID."
+)
+FIRST_RE = {
+    name: re.compile(name + r"\(first:\s*(\d+)") for name in ("reviewThreads", "comments", "reviews")
+}
+REPO = r"/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)"
+ROUTES = [
+    ("pulls/N", re.compile(REPO + r"/pulls/(?P<num>\d+)$")),
+    ("pulls/N/comments", re.compile(REPO + r"/pulls/(?P<num>\d+)/comments$")),
+    ("pulls/N/reviews", re.compile(REPO + r"/pulls/(?P<num>\d+)/reviews$")),
+    ("pulls/N/reviews/ID", re.compile(REPO + r"/pulls/(?P<num>\d+)/reviews/(?P<id>\d+)$")),
+    ("issues/N/comments", re.compile(REPO + r"/issues/(?P<num>\d+)/comments$")),
+    ("issues/comments/ID", re.compile(REPO + r"/issues/comments/(?P<id>\d+)$")),
+]
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def cursor(offset: int) -> str:
+    return base64.b64encode(f"cursor:v2:{offset}".encode()).decode()
+
+
+def offset_of(value: str | None) -> int:
+    if not value:
+        return 0
+    try:
+        return int(base64.b64decode(value).decode().rsplit(":", 1)[1])
+    except (ValueError, IndexError):
+        raise ApiError(200, f"Invalid cursor: {value}") from None
+
+
+def connection(items: list, first: int, after: str | None) -> dict:
+    start = offset_of(after)
+    page = items[start:start + first]
+    end = start + len(page)
+    return {
+        "pageInfo": {"hasNextPage": end < len(items), "endCursor": cursor(end) if page else None},
+        "nodes": page,
+    }
+
+
+def rest_user(login: str) -> dict:
+    uid = int(hashlib.sha1(login.encode()).hexdigest()[:6], 16)
+    return {
+        "login": login, "id": uid, "node_id": f"U_{uid}",
+        "avatar_url": f"https://avatars.githubusercontent.com/u/{uid}?v=4",
+        "url": f"https://api.github.com/users/{login}", "html_url": f"https://github.com/{login}",
+        "type": "Bot" if login.endswith(("ai", "reviewer")) or login in ("vercel", "codecov", "linear") else "User",
+        "site_admin": False,
+    }
+
+
+class FakeGitHub:
+    """The PR state plus the request bookkeeping, shared by handler threads."""
+
+    def __init__(self, pr: dict, latency_ms: float = 0, page_cap: int | None = None,
+                 rate_limit_every: int | None = None):
+        self.initial = pr
+        self.latency = latency_ms / 1000
+        self.page_cap = page_cap
+        self.rate_limit_every = rate_limit_every
+        self.lock = threading.Lock()
+        self.reset(state=True)
+
+    def reset(self, state: bool = False) -> None:
+        with self.lock:
+            if state:
+                self.pr = copy.deepcopy(self.initial)
+                self.index()
+            self.requests = 0
+            self.log = []
+            self.remaining = {"core": RATE_LIMIT, "graphql": RATE_LIMIT}
+
+    def index(self) -> None:
+        pr = self.pr
+        self.review_comments = {}
+        for thread in pr["threads"]:
+            for i, c in enumerate(thread["comments"]):
+                c["thread"] = thread
+                c["in_reply_to"] = thread["comments"][0]["databaseId"] if i else None
+                self.review_comments[c["databaseId"]] = c
+        self.next_id = max([c["databaseId"] for c in self.review_comments.values()]
+                           + [r["databaseId"] for r in pr["reviews"]]
+                           + [c["databaseId"] for c in pr["issue_comments"]] + [0]) + 1
+        self.etag_version = 0
+
+    def stats(self) -> dict:
+        with self.lock:
+            by_endpoint = {}
+            for entry in self.log:
+                key = f"{entry['method']} {entry['endpoint']}"
+                agg = by_endpoint.setdefault(key, {"calls": 0, "bytes": 0})
+                agg["calls"] += 1
+                agg["bytes"] += entry["bytes"]
+            return {
+                "calls": len(self.log),
+                "bytes": sum(e["bytes"] for e in self.log),
+                "rate_limited": sum(1 for e in self.log if e["status"] == 403),
+                "not_modified": sum(1 for e in self.log if e["status"] == 304),
+                "by_endpoint": by_endpoint,
+                "log": self.log,
+            }
+
+    def take_id(self) -> int:
+        self.next_id += 1
+        return self.next_id
+
+    def page_size(self, requested: int, ceiling: int) -> int:
+        size = min(requested, ceiling)
+        return min(size, self.page_cap) if self.page_cap else size
+
+    # --- GraphQL: just fetch_comments.py's queries ---
+
+    def graphql(self, query: str, variables: dict) -> dict:
+        firsts = {name: int(m.group(1)) if (m := regex.search(query)) else None
+                  for name, regex in FIRST_RE.items()}
+        if "node(id: $threadId)" in query:
+            thread = next((t for t in self.pr["threads"] if t["id"] == variables.get("threadId")), None)
+            if thread is None:
+                return {"data": {"node": None}}
+            first = self.page_size(firsts["comments"] or 100, GRAPHQL_MAX_PAGE)
+            nodes = [self.gql_comment(c, with_review=False) for c in thread["comments"]]
+            return {"data": {"node": {"comments": connection(nodes, first, variables.get("cursor"))}}}
+        pr = self.find_pr(variables.get("owner"), variables.get("repo"), variables.get("num"))
+        if pr is None:
+            return {"data": {"repository": {"pullRequest": None}}}
+        if firsts["reviewThreads"]:
+            first = self.page_size(firsts["reviewThreads"], GRAPHQL_MAX_PAGE)
+            inner = self.page_size(firsts["comments"] or 100, GRAPHQL_MAX_PAGE)
+            threads = [{
+                "id": t["id"], "isResolved": t["isResolved"], "isOutdated": t["isOutdated"],
+                "path": t["path"], "line": t["line"], "originalLine": t["originalLine"],
+                "comments": connection([self.gql_comment(c) for c in t["comments"]], inner, None),
+            } for t in pr["threads"]]
+            node = {k: pr[k] for k in ("title", "state", "isDraft", "headRefName", "baseRefName",
+                                       "headRefOid", "author")}
+            node.update(number=pr["number"], url=self.html_url(),
+                        reviewThreads=connection(threads, first, variables.get("threadCursor")))
+        elif firsts["reviews"]:
+            first = self.page_size(firsts["reviews"], GRAPHQL_MAX_PAGE)
+            nodes = [dict({k: r[k] for k in ("databaseId", "author", "body", "state", "createdAt")},
+                          commit={"oid": pr["headRefOid"]})
+                     for r in pr["reviews"]]
+            node = {"reviews": connection(nodes, first, variables.get("cursor"))}
+        elif firsts["comments"]:
+            first = self.page_size(firsts["comments"], GRAPHQL_MAX_PAGE)
+            nodes = [{k: c[k] for k in ("databaseId", "author", "body", "createdAt")}
+                     for c in pr["issue_comments"]]
+            node = {"comments": connection(nodes, first, variables.get("cursor"))}
+        else:
+            return {"errors": [{"message": "fake_github.py doesn't implement this query"}]}
+        return {"data": {"repository": {"pullRequest": node}}}
+
+    def gql_comment(self, c: dict, with_review: bool = True) -> dict:
+        node = {k: c[k] for k in ("databaseId", "author", "body", "createdAt", "isMinimized", "minimizedReason")}
+        if with_review:
+            node["pullRequestReview"] = {"databaseId": c["review"]} if c["review"] else None
+        return node
+
+    # --- REST ---
+
+    def find_pr(self, owner, repo, num) -> dict | None:
+        pr = self.pr
+        if (owner, repo, int(num or 0)) == (pr["owner"], pr["repo"], pr["number"]):
+            return pr
+        return None
+
+    def html_url(self) -> str:
+        return f"https://github.com/{self.pr['owner']}/{self.pr['repo']}/pull/{self.pr['number']}"
+
+    def api_url(self, path: str) -> str:
+        return f"https://api.github.com/repos/{self.pr['owner']}/{self.pr['repo']}/{path}"
+
+    def etag(self) -> str:
+        digest = hashlib.sha1(f"{self.pr['body']}\0{self.pr['updated_at']}".encode()).hexdigest()
+        return f'W/"{digest}"'
+
+    def rest_pr(self) -> dict:
+        pr = self.pr
+        return {
+            "url": self.api_url(f"pulls/{pr['number']}"), "id": pr["number"] + 900000,
+            "node_id": f"PR_{pr['number']}", "html_url": self.html_url(), "number": pr["number"],
+            "state": pr["state"].lower(), "locked": False, "title": pr["title"],
+            "user": rest_user(pr["author"]["login"]), "body": pr["body"],
+            "created_at": "2026-01-05T09:00:00Z", "updated_at": pr["updated_at"],
+            "draft": pr["isDraft"], "mergeable": True, "mergeable_state": "clean",
+            "head": {"ref": pr["headRefName"], "sha": pr["headRefOid"]},
+            "base": {"ref": pr["baseRefName"], "sha": "0" * 40},
+            "additions": pr["additions"], "deletions": pr["deletions"],
+            "changed_files": pr["changedFiles"], "comments": len(pr["issue_comments"]),
+            "review_comments": len(self.review_comments),
+        }
+
+    def rest_review_comment(self, c: dict) -> dict:
+        t = c["thread"]
+        out = {
+            "url": self.api_url(f"pulls/comments/{c['databaseId']}"), "id": c["databaseId"],
+            "node_id": f"PRRC_{c['databaseId']}", "pull_request_review_id": c["review"],
+            "diff_hunk": f"@@ -{t['originalLine']},7 +{t['originalLine']},9 @@\n context\n-old line\n+new line",
+            "path": t["path"], "commit_id": self.pr["headRefOid"], "original_commit_id": self.pr["headRefOid"],
+            "user": rest_user(c["author"]["login"]), "body": c["body"],
+            "created_at": c["createdAt"], "updated_at": c["createdAt"],
+            "html_url": f"{self.html_url()}#discussion_r{c['databaseId']}",
+            "author_association": "MEMBER", "line": t["line"], "original_line": t["originalLine"],
+            "side": "RIGHT",
+        }
+        if c["in_reply_to"]:
+            out["in_reply_to_id"] = c["in_reply_to"]
+        return out
+
+    def rest_issue_comment(self, c: dict) -> dict:
+        return {
+            "url": self.api_url(f"issues/comments/{c['databaseId']}"), "id": c["databaseId"],
+            "node_id": f"IC_{c['databaseId']}", "html_url": f"{self.html_url()}#issuecomment-{c['databaseId']}",
+            "user": rest_user(c["author"]["login"]), "created_at": c["createdAt"],
+            "updated_at": c["createdAt"], "author_association": "MEMBER", "body": c["body"],
+        }
+
+    def rest_review(self, r: dict) -> dict:
+        return {
+            "id": r["databaseId"], "node_id": f"PRR_{r['databaseId']}", "user": rest_user(r["author"]["login"]),
+            "body": r["body"], "state": r["state"], "submitted_at": r["createdAt"],
+            "html_url": f"{self.html_url()}#pullrequestreview-{r['databaseId']}",
+            "commit_id": self.pr["headRefOid"], "author_association": "MEMBER",
+        }
+
+    def diff(self) -> str:
+        chunks = []
+        for path in self.pr["files"]:
+            chunks.append(
+                f"diff --git a/{path} b/{path}\nindex 1111111..2222222 100644\n--- a/{path}\n+++ b/{path}\n"
+                "@@ -1,12 +1,52 @@\n" + "".join(f"+added line {i} in {path}\n" for i in range(40))
+                + "".join(f"-removed line {i}\n" for i in range(12))
+            )
+        return "".join(chunks)
+
+    def rest(self, method: str, endpoint: str, match: dict, query: dict, body: dict | None,
+             headers) -> tuple[int, dict, object]:
+        """(status, extra headers, JSON-able body or str) for one REST call."""
+        pr = self.find_pr(match["owner"], match["repo"], match.get("num", self.pr["number"]))
+        if pr is None:
+            raise ApiError(404, "Not Found")
+        if endpoint == "pulls/N":
+            if method == "PATCH":
+                for key in ("title", "body"):
+                    if body and key in body:
+                        pr[key] = body[key]
+                pr["updated_at"] = now()
+                self.etag_version += 1
+                return 200, {"ETag": self.etag()}, self.rest_pr()
+            if "diff" in headers.get("Accept", ""):
+                return 200, {}, self.diff()
+            if headers.get("If-None-Match") == self.etag():
+                return 304, {"ETag": self.etag()}, None
+            return 200, {"ETag": self.etag()}, self.rest_pr()
+        if endpoint == "pulls/N/comments":
+            if method == "POST":
+                target = self.review_comments.get(int((body or {}).get("in_reply_to", 0)))
+                if target is None:
+                    raise ApiError(422, "Validation Failed: in_reply_to is not a review comment")
+                thread = target["thread"]
+                comment = {
+                    "databaseId": self.take_id(), "author": {"login": "tjmgregory"},
+                    "body": body.get("body", ""), "createdAt": now(), "isMinimized": False,
+                    "minimizedReason": None, "review": None, "thread": thread,
+                    "in_reply_to": thread["comments"][0]["databaseId"],
+                }
+                thread["comments"].append(comment)
+                self.review_comments[comment["databaseId"]] = comment
+                return 201, {}, self.rest_review_comment(comment)
+            return self.rest_list([self.rest_review_comment(c) for t in pr["threads"] for c in t["comments"]],
+                                  query)
+        if endpoint == "pulls/N/reviews":
+            payload = body or {}
+            review = {"databaseId": self.take_id(), "author": {"login": "tjmgregory"},
+                      "body": payload.get("body", ""), "createdAt": now(),
+                      "state": {"APPROVE": "APPROVED", "REQUEST_CHANGES": "CHANGES_REQUESTED"}.get(
+                          payload.get("event"), "COMMENTED")}
+            pr["reviews"].append(review)
+            for inline in payload.get("comments") or []:
+                comment = {"databaseId": self.take_id(), "author": review["author"],
+                           "body": inline.get("body", ""), "createdAt": review["createdAt"],
+                           "isMinimized": False, "minimizedReason": None,
+                           "review": review["databaseId"], "in_reply_to": None}
+                thread = {"id": f"PRRT_{comment['databaseId']}", "isResolved": False, "isOutdated": False,
+                          "path": inline.get("path", ""), "line": inline.get("line"),
+                          "originalLine": inline.get("line"), "comments": [comment]}
+                comment["thread"] = thread
+                pr["threads"].append(thread)
+                self.review_comments[comment["databaseId"]] = comment
+            return 200, {}, self.rest_review(review)
+        if endpoint == "pulls/N/reviews/ID":
+            review = next((r for r in pr["reviews"] if r["databaseId"] == int(match["id"])), None)
+            if review is None:
+                raise ApiError(404, "Not Found")
+            return 200, {}, self.rest_review(review)
+        if endpoint == "issues/N/comments":
+            if method == "POST":
+                comment = {"databaseId": self.take_id(), "author": {"login": "tjmgregory"},
+                           "body": (body or {}).get("body", ""), "createdAt": now()}
+                pr["issue_comments"].append(comment)
+                return 201, {}, self.rest_issue_comment(comment)
+            return self.rest_list([self.rest_issue_comment(c) for c in pr["issue_comments"]], query)
+        if endpoint == "issues/comments/ID":
+            comment = next((c for c in pr["issue_comments"] if c["databaseId"] == int(match["id"])), None)
+            if comment is None:
+                raise ApiError(404, "Not Found")
+            return 200, {}, self.rest_issue_comment(comment)
+        raise ApiError(404, "Not Found")
+
+    def rest_list(self, items: list, query: dict) -> tuple[int, dict, list]:
+        per_page = self.page_size(int(query.get("per_page", [REST_DEFAULT_PAGE])[0]), REST_MAX_PAGE)
+        page = max(1, int(query.get("page", ["1"])[0]))
+        start = (page - 1) * per_page
+        headers = {}
+        if start + per_page < len(items):
+            headers["Link"] = "<{path}?%s>; rel=\"next\"" % urlencode({"per_page": per_page, "page": page + 1})
+        return 200, headers, items[start:start + per_page]
+
+
+class Handler(BaseHTTPRequestHandler):
+    fake: FakeGitHub
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.dispatch("GET")
+
+    def do_POST(self):
+        self.dispatch("POST")
+
+    def do_PATCH(self):
+        self.dispatch("PATCH")
+
+    def reply(self, status: int, headers: dict, payload) -> int:
+        if payload is None:
+            data = b""
+        elif isinstance(payload, str):
+            data = payload.encode()
+        else:
+            data = json.dumps(payload).encode()
+        self.send_response(status)
+        if payload is not None:
+            self.send_header("Content-Type", "text/plain" if isinstance(payload, str) else "application/json; charset=utf-8")
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+        return len(data)
+
+    def dispatch(self, method: str) -> None:
+        url = urlsplit(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        fake = self.fake
+        if url.path.startswith("/_fake/"):
+            if url.path == "/_fake/stats":
+                self.reply(200, {}, fake.stats())
+            elif url.path == "/_fake/reset" and method == "POST":
+                fake.reset(state=parse_qs(url.query).get("state") == ["1"])
+                self.reply(200, {}, {"status": "ok"})
+            else:
+                self.reply(404, {}, {"message": "Not Found"})
+            return
+
+        if fake.latency:
+            time.sleep(fake.latency)
+        endpoint, match = ("graphql", {}) if url.path == "/graphql" else next(
+            ((name, m.groupdict()) for name, regex in ROUTES if (m := regex.match(url.path))), (url.path, None))
+        resource = "graphql" if endpoint == "graphql" else "core"
+        query = parse_qs(url.query)
+        with fake.lock:
+            fake.requests += 1
+            limited = fake.rate_limit_every and fake.requests % fake.rate_limit_every == 0
+            try:
+                body = json.loads(raw) if raw else None
+                if limited:
+                    status, headers, payload = 403, {"Retry-After": "60"}, {
+                        "message": SECONDARY_LIMIT_MESSAGE,
+                        "documentation_url": "https://docs.github.com/rest/overview/rate-limits-for-the-rest-api",
+                    }
+                elif endpoint == "graphql" and method == "POST":
+                    status, headers, payload = 200, {}, fake.graphql(body["query"], body.get("variables") or {})
+                elif match is not None:
+                    status, headers, payload = fake.rest(method, endpoint, match, query, body, self.headers)
+                else:
+                    raise ApiError(404, "Not Found")
+            except ApiError as e:
+                status, headers, payload = e.status, {}, (
+                    {"errors": [{"message": str(e)}]} if endpoint == "graphql"
+                    else {"message": str(e), "documentation_url": "https://docs.github.com/rest"})
+            except (ValueError, KeyError, TypeError) as e:
+                status, headers, payload = 400, {}, {"message": f"Problems parsing request: {e}"}
+            if "Link" in headers:
+                headers["Link"] = headers["Link"].replace("{path}", f"http://{self.headers.get('Host')}{url.path}")
+            if method == "GET" and status == 200 and "ETag" not in headers:
+                # GitHub tags every GET; a matching If-None-Match gets a 304.
+                headers["ETag"] = 'W/"%s"' % hashlib.sha1(json.dumps(payload).encode()).hexdigest()
+                if self.headers.get("If-None-Match") == headers["ETag"]:
+                    status, payload = 304, None
+            if status != 304:  # conditional requests that hit don't count, as on GitHub
+                fake.remaining[resource] = max(0, fake.remaining[resource] - 1)
+            headers.update({
+                "X-RateLimit-Limit": str(RATE_LIMIT),
+                "X-RateLimit-Remaining": str(fake.remaining[resource]),
+                "X-RateLimit-Used": str(RATE_LIMIT - fake.remaining[resource]),
+                "X-RateLimit-Reset": str(int(time.time()) + 3600),
+                "X-RateLimit-Resource": resource,
+            })
+        sent = self.reply(status, headers, payload)
+        page = query.get("page", [None])[0]
+        if endpoint == "graphql" and body:
+            variables = body.get("variables") or {}
+            page = "after" if any(variables.get(k) for k in ("cursor", "threadCursor")) else None
+        with fake.lock:
+            fake.log.append({"method": method, "endpoint": endpoint, "status": status, "bytes": sent,
+                             "page": page})
+
+
+def start(pr: dict, port: int = 0, **options) -> tuple[ThreadingHTTPServer, FakeGitHub]:
+    """Serve pr on a background thread; returns (server, fake). Stop with server.shutdown()."""
+    fake = FakeGitHub(pr, **options)
+    handler = type("FakeHandler", (Handler,), {"fake": fake})
+    server = ThreadingHTTPServer((HOST, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, fake
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Serve a synthetic PR through a fake GitHub API")
+    parser.add_argument("--comments", type=int, default=100, help="Comments in the synthetic PR (default: 100)")
+    parser.add_argument("--seed", type=int, default=1, help="Generator seed (default: 1)")
+    parser.add_argument("--state", help="Serve this synthetic_pr.py JSON instead of generating one")
+    parser.add_argument("--port", type=int, default=0, help="Port (default: any free one)")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Delay before every response")
+    parser.add_argument("--page-cap", type=int, help="Largest page size served, REST and GraphQL")
+    parser.add_argument("--rate-limit-every", type=int, help="Answer every Nth request with a secondary rate limit")
+    args = parser.parse_args()
+
+    if args.state:
+        with open(args.state) as f:
+            pr = json.load(f)
+    else:
+        pr = synthetic_pr(args.comments, args.seed)
+    server, _ = start(pr, args.port, latency_ms=args.latency_ms, page_cap=args.page_cap,
+                      rate_limit_every=args.rate_limit_every)
+    url = f"http://{HOST}:{server.server_address[1]}"
+    print(json.dumps({"status": "ok", "url": url, "pr_url": f"https://github.com/{pr['owner']}/{pr['repo']}/pull/{pr['number']}"}),
+          flush=True)
+    print(f"Fake GitHub on {url}; Ctrl-C to stop", file=sys.stderr)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -31,12 +31,20 @@ Statuses:
 --json dumps the full structured data instead (all items, no truncation).
 """
 
-import argparse
 import json
 import re
-import subprocess
 import sys
 
+import gh_trace
+import pr_core
+import pr_daemon_client
+
+# Imported on first use: a request handed to pr_daemon.py never needs them.
+argparse = pr_core.lazy_import("argparse")
+subprocess = pr_core.lazy_import("subprocess")
+
+gh_trace.install()
+
 AGENT_PREFIX = "[🤖"
 REPLY_MARKER_RE = re.compile(r"<!--\s*reply-to:\s*(issue_comment|review):(\d+)\s*-->")
 HTML_COMMENT_RE = re.compile(r"<!--.*?-->", re.DOTALL)
@@ -64,27 +72,12 @@ def die(msg: str) -> None:
 
 
 def parse_pr_reference(pr_ref: str) -> tuple[str, str, int]:
-    """Extract (owner, repo, number) from a PR URL or bare number + git remote."""
-    m = re.match(r"https?://github\.com/([^/]+)/([^/]+)/pull/(\d+)", pr_ref)
-    if m:
-        return m.group(1), m.group(2), int(m.group(3))
-
-    if not pr_ref.isdigit():
-        die(f"Invalid PR reference: {pr_ref}")
-
+    """pr_core.parse_pr_reference, exiting on a bad reference."""
     try:
-        result = subprocess.run(
-            ["git", "remote", "get-url", "origin"],
-            capture_output=True, text=True, check=True,
-        )
-    except subprocess.CalledProcessError:
-        die("Not in a git repository and no full PR URL provided")
-
-    remote = result.stdout.strip()
-    m = re.search(r"github\.com[:/]([^/]+)/(.+?)(?:\.git)?$", remote)
-    if not m:
-        die(f"Could not parse GitHub owner/repo from remote: {remote}")
-    return m.group(1), m.group(2), int(pr_ref)
+        owner, repo, number = pr_core.parse_pr_reference(pr_ref)
+    except ValueError as e:
+        die(str(e))
+    return owner, repo, int(number)
 
 
 def graphql(query: str, variables: dict) -> dict:
@@ -96,10 +89,10 @@ def graphql(query: str, variables: dict) -> dict:
             cmd += ["-f", f"{key}={value}"]
     result = subprocess.run(cmd, capture_output=True, text=True)
     if result.returncode != 0:
-        die(f"GitHub API error: {result.stderr.strip()}")
+        raise RuntimeError(f"GitHub API error: {result.stderr.strip()}")
     data = json.loads(result.stdout)
     if data.get("errors"):
-        die(f"GraphQL error: {json.dumps(data['errors'])}")
+        raise RuntimeError(f"GraphQL error: {json.dumps(data['errors'])}")
     return data["data"]
 
 
@@ -151,7 +144,7 @@ query($owner: String!, $repo: String!, $num: Int!, $cursor: String) {
     pullRequest(number: $num) {
       reviews(first: 100, after: $cursor) {
         pageInfo { hasNextPage endCursor }
-        nodes { databaseId author { login } body state createdAt }
+        nodes { databaseId author { login } body state createdAt commit { oid } }
       }
     }
   }
@@ -174,7 +167,8 @@ query($owner: String!, $repo: String!, $num: Int!, $cursor: String) {
 
 def fetch_all(owner: str, repo: str, num: int) -> dict:
     """Fetch PR info, all review threads (with complete comment lists),
-    all reviews, and all issue comments, paginating everything."""
+    all reviews, and all issue comments, paginating everything.
+    Raises RuntimeError on an API error or a missing PR."""
     print(f"Fetching PR #{num} from {owner}/{repo}...", file=sys.stderr)
 
     threads: list[dict] = []
@@ -186,7 +180,7 @@ def fetch_all(owner: str, repo: str, num: int) -> dict:
         })
         pr = data["repository"]["pullRequest"]
         if pr is None:
-            die(f"PR #{num} not found in {owner}/{repo}")
+            raise RuntimeError(f"PR #{num} not found in {owner}/{repo}")
         info = {k: pr[k] for k in (
             "number", "title", "url", "state", "isDraft",
             "headRefName", "baseRefName", "headRefOid", "author",
@@ -414,6 +408,30 @@ def thread_review_id(thread: dict) -> int | None:
     return review["databaseId"] if review else None
 
 
+def classify(data: dict) -> dict:
+    """Split annotated data into what the digest shows and what it hides.
+    `threads`, `reviews` and `issue_comments` are the actionable items."""
+    threads = data["threads"]
+    open_threads = [t for t in threads if not t["isResolved"]]
+    # Reviews: skip pending (invisible to others) and empty bodies
+    reviews = [
+        r for r in data["reviews"]
+        if r["state"] != "PENDING" and clean_body(r["body"])
+        and not is_agent(r["body"] or "")
+    ]
+    comments = [c for c in data["issue_comments"] if not is_agent(c["body"] or "")]
+    return {
+        "threads": [t for t in open_threads if t["status"] != "HANDLED"],
+        "handled": [t for t in open_threads if t["status"] == "HANDLED"],
+        "resolved": [t for t in threads if t["isResolved"]],
+        "all_reviews": reviews,
+        "reviews": [r for r in reviews if r["status"] != "HANDLED"],
+        "all_issue_comments": comments,
+        "info": [c for c in comments if c["status"] == "INFO"],
+        "issue_comments": [c for c in comments if c["status"] not in ("HANDLED", "INFO")],
+    }
+
+
 def render(data: dict, show_all: bool) -> str:
     info = data["info"]
     out: list[str] = []
@@ -429,21 +447,11 @@ def render(data: dict, show_all: bool) -> str:
     )
 
     threads = data["threads"]
-    resolved = [t for t in threads if t["isResolved"]]
-    open_threads = [t for t in threads if not t["isResolved"]]
-    handled = [t for t in open_threads if t["status"] == "HANDLED"]
-    actionable = [t for t in open_threads if t["status"] != "HANDLED"]
-
-    # Reviews: skip pending (invisible to others) and empty bodies
-    reviews = [
-        r for r in data["reviews"]
-        if r["state"] != "PENDING" and clean_body(r["body"])
-        and not is_agent(r["body"] or "")
-    ]
-    review_action = [r for r in reviews if r["status"] != "HANDLED"]
-    comments = [c for c in data["issue_comments"] if not is_agent(c["body"] or "")]
-    info_comments = [c for c in comments if c["status"] == "INFO"]
-    comment_action = [c for c in comments if c["status"] not in ("HANDLED", "INFO")]
+    groups = classify(data)
+    resolved, handled, actionable = groups["resolved"], groups["handled"], groups["threads"]
+    reviews, review_action = groups["all_reviews"], groups["reviews"]
+    comments, info_comments = groups["all_issue_comments"], groups["info"]
+    comment_action = groups["issue_comments"]
 
     out.append(
         f"actionable: {len(actionable)} threads, {len(review_action)} reviews, "
@@ -556,7 +564,10 @@ def main() -> int:
     args = parser.parse_args()
 
     owner, repo, num = parse_pr_reference(args.pr)
-    data = annotate(fetch_all(owner, repo, num))
+    try:
+        data = annotate(fetch_all(owner, repo, num))
+    except RuntimeError as e:
+        die(str(e))
 
     if args.json:
         print(json.dumps(data, indent=2))
@@ -566,4 +577,4 @@ def main() -> int:
 
 
 if __name__ == "__main__":
-    sys.exit(main())
+    sys.exit(pr_daemon_client.run(__file__, main))
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Opt-in tracing of every gh call the fixing-prs scripts make, and a cost report.
+
+Usage:
+    # Trace one iteration (every script, every gh call) to a file
+    GH_TRACE=/tmp/iteration.ndjson scripts/fetch_comments.py 123
+    GH_TRACE=/tmp/iteration.ndjson scripts/post_replies_batch.py < replies.json
+
+    # Summarize it
+    scripts/gh_trace.py /tmp/iteration.ndjson [--run NAME]
+
+Environment:
+    GH_TRACE: Trace file to append to; "1" means
+              $XDG_CACHE_HOME/fixing-prs/gh-trace.ndjson. Unset: no tracing.
+    GH_TRACE_RUN: Label for the run the calls belong to (default: "default"),
+                  so one file can hold several iterations apart.
+
+The scripts that call gh run install() at import. When GH_TRACE is set it
+wraps subprocess.run for `gh` commands only (graphql() helpers included,
+since they shell out to `gh api graphql`). `gh api` calls whose output is
+captured get --include added, so each page's status and rate-limit headers
+can be read; the headers are stripped again before the caller sees stdout,
+unless it asked for them itself.
+
+One NDJSON line per call:
+    {"ts", "run", "script", "pid", "argv" (redacted), "method", "endpoint",
+     "exit", "seconds", "bytes", "pages": [{"status", "bytes"}],
+     "rate_limit": {"resource", "limit", "remaining", "used", "reset"},
+     "key" (hash of the unredacted call, to spot repeats)}
+Redacted: Authorization/Cookie headers, anything shaped like a GitHub
+token, and long or sensitive field values (bodies become `body=<N chars>`,
+GraphQL queries `query=<N chars>`).
+
+The report (JSON on stdout, per run): totals, per-script and per-endpoint
+{calls, pages, seconds, bytes}, rate-limit budget per resource (remaining
+at the first and last call), and "redundant": identical read calls made
+more than once in the run, with the scripts that made them.
+"""
+
+import os
+import sys
+
+TRACE_ENV = "GH_TRACE"
+RUN_ENV = "GH_TRACE_RUN"
+# Field values longer than this are logged as their length only: they're
+# comment bodies and queries, bulky and possibly private.
+MAX_FIELD_VALUE = 80
+SENSITIVE_HEADERS = ("authorization", "cookie")
+SENSITIVE_FIELD_WORDS = ("token", "secret", "password", "key")
+
+_installed = False
+
+
+def default_trace_path() -> str:
+    cache = os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache"))
+    return os.path.join(cache, "fixing-prs", "gh-trace.ndjson")
+
+
+def trace_path() -> str | None:
+    value = os.environ.get(TRACE_ENV)
+    if not value:
+        return None
+    return default_trace_path() if value == "1" else value
+
+
+def install() -> None:
+    """Wrap subprocess.run to trace gh calls, if GH_TRACE is set. Idempotent."""
+    global _installed
+    if _installed or not trace_path():
+        return
+    _installed = True
+    import subprocess
+    import threading
+
+    original = subprocess.run
+    lock = threading.Lock()
+
+    def run(args, *pargs, **kwargs):
+        if not (isinstance(args, (list, tuple)) and args and args[0] == "gh"):
+            return original(args, *pargs, **kwargs)
+        return _traced(original, lock, list(args), pargs, kwargs)
+
+    subprocess.run = run
+
+
+def _traced(original, lock, argv: list[str], pargs, kwargs):
+    import subprocess
+    import time
+
+    captured = kwargs.get("capture_output") or kwargs.get("stdout") == subprocess.PIPE
+    is_api = argv[1:2] == ["api"]
+    asked_include = "--include" in argv or "-i" in argv
+    injected = is_api and captured and not asked_include
+    call = argv[:2] + ["--include"] + argv[2:] if injected else argv
+
+    out = kwargs.get("stdout")
+    size_before = _file_size(out)
+    start = time.monotonic()
+    result = original(call, *pargs, **kwargs)
+    seconds = time.monotonic() - start
+
+    pages = []
+    if is_api and captured and result.stdout:
+        text = result.stdout if isinstance(result.stdout, str) else result.stdout.decode(errors="replace")
+        pages = _split_pages(text, "--paginate" in argv)
+        if injected and pages is not None:
+            body = "".join(p["body"] for p in pages)
+            result.stdout = body if isinstance(result.stdout, str) else body.encode()
+        # Keep the caller's view: same argv back on the CompletedProcess.
+        result.args = argv
+    if captured:
+        size = len(result.stdout or b"")
+    else:
+        after = _file_size(out)
+        size = after - size_before if after is not None and size_before is not None else None
+
+    entry = _entry(argv, kwargs.get("input"), result.returncode, seconds, size, pages or [])
+    _write(lock, entry)
+    return result
+
+
+def _file_size(out) -> int | None:
+    try:
+        return os.fstat(out.fileno()).st_size
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def _split_pages(text: str, paginated: bool) -> list[dict] | None:
+    """`gh api --include` output -> [{"status", "headers", "body"}] per page;
+    None if it isn't --include output after all (gh failed before a request)."""
+    import re
+
+    status_re = re.compile(r"HTTP/[\d.]+ (\d{3})[^\r\n]*\r?\n")
+    # With --paginate, the next page's status line follows the previous
+    # body directly (or after a newline).
+    next_re = re.compile(r"(?:(?<=\n)|(?<=[\]}]))HTTP/[\d.]+ \d{3} ")
+    pages = []
+    pos = 0
+    while pos < len(text):
+        m = status_re.match(text, pos)
+        if not m:
+            return None if not pages else pages
+        head_end = re.compile(r"\r?\n\r?\n").search(text, m.end())
+        if head_end is None:
+            return None
+        headers = {}
+        for line in text[m.end():head_end.start()].splitlines():
+            key, _, value = line.partition(":")
+            headers[key.strip().lower()] = value.strip()
+        nxt = next_re.search(text, head_end.end()) if paginated else None
+        end = nxt.start() if nxt else len(text)
+        pages.append({"status": int(m.group(1)), "headers": headers, "body": text[head_end.end():end]})
+        pos = end
+    return pages
+
+
+def _redact(argv: list[str]) -> list[str]:
+    import re
+
+    token_re = re.compile(r"\b(?:gh[pousr]_[A-Za-z0-9]{20,}|github_pat_\w{20,})")
+    out = []
+    flag = None
+    for arg in argv:
+        if flag in ("-H", "--header"):
+            key, _, _ = arg.partition(":")
+            if key.strip().lower() in SENSITIVE_HEADERS:
+                arg = f"{key}: <redacted>"
+        elif flag in ("-f", "--raw-field", "-F", "--field"):
+            key, _, value = arg.partition("=")
+            if any(word in key.lower() for word in SENSITIVE_FIELD_WORDS):
+                arg = f"{key}=<redacted>"
+            elif len(value) > MAX_FIELD_VALUE or key in ("body", "query"):
+                arg = f"{key}=<{len(value)} chars>"
+        out.append(token_re.sub("<redacted>", arg))
+        flag = arg if arg.startswith("-") else None
+    return out
+
+
+def _endpoint(argv: list[str]) -> tuple[str, str]:
+    """(method, normalized endpoint): owner/repo dropped, ids as :id, GraphQL
+    calls named by the connections they page through."""
+    import re
+
+    if argv[1:2] != ["api"]:
+        return "", " ".join(a for a in argv[:3] if not a.startswith("-"))
+    method = None
+    fields = False
+    endpoint = ""
+    query = ""
+    args = iter(argv[2:])
+    for arg in args:
+        if arg in ("-X", "--method"):
+            method = next(args, "").upper()
+        elif arg in ("-f", "--raw-field", "-F", "--field"):
+            fields = True
+            value = next(args, "")
+            if value.startswith("query="):
+                query = value[len("query="):]
+        elif arg in ("-H", "--header", "--input", "--jq", "-q", "--template", "-t", "--cache"):
+            fields = fields or arg == "--input"
+            next(args, None)
+        elif not arg.startswith("-"):
+            endpoint = arg
+    if endpoint == "graphql":
+        kind = "mutation" if query.lstrip().startswith("mutation") else "query"
+        connections = list(dict.fromkeys(re.findall(r"(\w+)\((?:first|last):", query)))
+        return "POST", f"graphql {kind}" + (f" {'+'.join(connections)}" if connections else "")
+    path = endpoint.split("?", 1)[0].lstrip("/")
+    path = re.sub(r"^repos/[^/]+/[^/]+/", "", path)
+    path = re.sub(r"(?<=/)\d+(?=/|$)|^\d+(?=/|$)", ":id", path)
+    return method or ("POST" if fields else "GET"), path
+
+
+def _entry(argv: list[str], stdin, code: int, seconds: float, size: int | None, pages: list[dict]) -> dict:
+    import hashlib
+    import json
+    import time
+
+    method, endpoint = _endpoint(argv)
+    rate_limit = {}
+    if pages:
+        headers = pages[-1]["headers"]
+        for field in ("resource", "limit", "remaining", "used", "reset"):
+            value = headers.get(f"x-ratelimit-{field}")
+            if value is not None:
+                rate_limit[field] = value if field == "resource" else int(value)
+    if isinstance(stdin, bytes):
+        stdin = stdin.decode(errors="replace")
+    return {
+        "ts": round(time.time(), 3),
+        "run": os.environ.get(RUN_ENV, "default"),
+        "script": os.path.basename(sys.argv[0]) if sys.argv and sys.argv[0] else "python",
+        "pid": os.getpid(),
+        "argv": _redact(argv),
+        "method": method,
+        "endpoint": endpoint,
+        "exit": code,
+        "seconds": round(seconds, 4),
+        "bytes": size,
+        "pages": [{"status": p["status"], "bytes": len(p["body"])} for p in pages],
+        "rate_limit": rate_limit,
+        "key": hashlib.sha1(json.dumps([argv, stdin or ""]).encode()).hexdigest()[:16],
+    }
+
+
+def _write(lock, entry: dict) -> None:
+    import fcntl
+    import json
+
+    path = trace_path()
+    line = json.dumps(entry, ensure_ascii=False) + "\n"
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with lock, open(path, "a", encoding="utf-8") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            f.write(line)
+    except OSError as e:
+        # Tracing must never break the script being traced.
+        print(f"gh_trace: can't write {path}: {e}", file=sys.stderr)
+
+
+def summarize(entries: list[dict]) -> dict:
+    """Cost report for the calls of one run."""
+
+    def bucket() -> dict:
+        return {"calls": 0, "pages": 0, "seconds": 0.0, "bytes": 0}
+
+    def add(agg: dict, e: dict) -> None:
+        agg["calls"] += 1
+        agg["pages"] += max(1, len(e["pages"]))
+        agg["seconds"] = round(agg["seconds"] + e["seconds"], 4)
+        agg["bytes"] += e["bytes"] or 0
+
+    total = bucket()
+    scripts: dict[str, dict] = {}
+    endpoints: dict[str, dict] = {}
+    budget: dict[str, dict] = {}
+    repeats: dict[str, list[dict]] = {}
+    for e in sorted(entries, key=lambda e: e["ts"]):
+        add(total, e)
+        add(scripts.setdefault(e["script"], bucket()), e)
+        add(endpoints.setdefault(f"{e['method']} {e['endpoint']}".strip(), bucket()), e)
+        limit = e.get("rate_limit") or {}
+        if "remaining" in limit:
+            resource = budget.setdefault(limit.get("resource", "core"), {"requests": 0, "remaining_first": limit["remaining"]})
+            resource["requests"] += max(1, len(e["pages"]))
+            resource["remaining_last"] = limit["remaining"]
+        if e["method"] == "GET" or e["endpoint"].startswith("graphql query"):
+            repeats.setdefault(e["key"], []).append(e)
+    redundant = [
+        {"endpoint": f"{calls[0]['method']} {calls[0]['endpoint']}", "argv": calls[0]["argv"],
+         "count": len(calls), "wasted_bytes": sum(c["bytes"] or 0 for c in calls[1:]),
+         "scripts": sorted({c["script"] for c in calls})}
+        for calls in repeats.values() if len(calls) > 1
+    ]
+    redundant.sort(key=lambda r: -r["count"])
+
+    def ordered(aggs: dict) -> dict:
+        return dict(sorted(aggs.items(), key=lambda kv: -kv[1]["calls"]))
+
+    return {"total": total, "by_script": ordered(scripts), "by_endpoint": ordered(endpoints),
+            "rate_limit": budget, "redundant": redundant}
+
+
+def main() -> int:
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Summarize a GH_TRACE file")
+    parser.add_argument("trace", nargs="?", help="Trace file (default: $GH_TRACE, or the default trace path)")
+    parser.add_argument("--run", help="Only this run (default: every run, reported separately)")
+    args = parser.parse_args()
+
+    path = args.trace or trace_path() or default_trace_path()
+    try:
+        with open(path, encoding="utf-8") as f:
+            entries = [json.loads(line) for line in f if line.strip()]
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"Error: can't read trace {path}: {e}", file=sys.stderr)
+        print(json.dumps({"error": f"can't read trace {path}: {e}"}))
+        return 1
+    runs: dict[str, list[dict]] = {}
+    for e in entries:
+        if args.run is None or e["run"] == args.run:
+            runs.setdefault(e["run"], []).append(e)
+    report = {run: summarize(calls) for run, calls in runs.items()}
+    print(json.dumps({"status": "ok", "trace": path, "runs": report}, indent=2))
+    for run, summary in report.items():
+        t = summary["total"]
+        print(f"[{run}] {t['calls']} gh calls, {t['pages']} pages, {t['bytes'] / 1024:.1f} KB, "
+              f"{t['seconds']:.2f}s; {len(summary['redundant'])} repeated call(s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
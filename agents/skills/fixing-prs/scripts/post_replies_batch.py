@@ -22,20 +22,27 @@ import sys
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+import pr_daemon_client
+
 SCRIPT_DIR = Path(__file__).parent
 POST_REPLY = SCRIPT_DIR / "post_reply.py"
 MAX_WORKERS = 8
 
 
 def post_one(item: dict) -> dict:
-    """Invoke post_reply.py for a single reply item."""
+    """Invoke post_reply.py for a single reply item (in the PR daemon, if one
+    is running, which saves an interpreter and its gh processes per reply)."""
     try:
-        result = subprocess.run(
-            [sys.executable, str(POST_REPLY)],
-            input=json.dumps(item),
-            capture_output=True,
-            text=True
-        )
+        response = pr_daemon_client.request(str(POST_REPLY), [], json.dumps(item))
+        if response is not None:
+            result = subprocess.CompletedProcess([], response["exit"], response["stdout"], response["stderr"])
+        else:
+            result = subprocess.run(
+                [sys.executable, str(POST_REPLY)],
+                input=json.dumps(item),
+                capture_output=True,
+                text=True
+            )
         if result.stderr:
             print(result.stderr, file=sys.stderr, end="")
         if result.stdout.strip():
@@ -47,39 +47,21 @@ Exit codes:
 """
 
 import json
-import subprocess
 import sys
-import re
 
+import gh_trace
+import pr_daemon_client
+from pr_core import lazy_import, parse_pr_reference
 
-def output_json(data: dict) -> None:
-    """Output structured JSON to stdout."""
-    print(json.dumps(data))
+# Imported on first use: a request handed to pr_daemon.py never needs it.
+subprocess = lazy_import("subprocess")
 
+gh_trace.install()
 
-def parse_pr_reference(pr_ref: str) -> tuple[str, str, str]:
-    """Parse PR reference to extract owner, repo, and PR number."""
-    url_match = re.match(r'https?://github\.com/([^/]+)/([^/]+)/pull/(\d+)', pr_ref)
-    if url_match:
-        return url_match.group(1), url_match.group(2), url_match.group(3)
 
-    if not pr_ref.isdigit():
-        raise ValueError(f"Invalid PR reference: {pr_ref}")
-
-    try:
-        result = subprocess.run(
-            ['git', 'remote', 'get-url', 'origin'],
-            capture_output=True, text=True, check=True
-        )
-        remote_url = result.stdout.strip()
-    except subprocess.CalledProcessError:
-        raise ValueError("Not in a git repository and no full PR URL provided")
-
-    remote_match = re.search(r'github\.com[:/]([^/]+)/(.+?)(?:\.git)?$', remote_url)
-    if not remote_match:
-        raise ValueError(f"Could not parse GitHub owner/repo from remote: {remote_url}")
-
-    return remote_match.group(1), remote_match.group(2), pr_ref
+def output_json(data: dict) -> None:
+    """Output structured JSON to stdout."""
+    print(json.dumps(data))
 
 
 def reply_to_marker(comment_type: str, comment_id: int) -> str:
@@ -413,4 +395,4 @@ def main():
 
 
 if __name__ == '__main__':
-    sys.exit(main())
+    sys.exit(pr_daemon_client.run(__file__, main, reads_stdin=True))
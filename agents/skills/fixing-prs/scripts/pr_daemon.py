@@ -0,0 +1,681 @@
+#!/usr/bin/env python3
+"""
+Resident PR-tools daemon: runs the fixing-prs and reviewing-prs scripts
+in one warm process, with a pooled GitHub connection and per-PR caches.
+
+Usage:
+    pr_daemon.py start [--idle-exit SECONDS] [--api-url URL]   # background; no-op if running
+    pr_daemon.py status
+    pr_daemon.py stop
+    pr_daemon.py serve [...]                                    # foreground
+
+Optional. With a daemon up, these scripts hand their request (argv, stdin,
+cwd) to it over a Unix socket and print what it sends back:
+    fetch_comments.py, post_reply.py (and so post_replies_batch.py),
+    update_pr_description.py, probe_merge_state.py,
+    reviewing-prs/scripts/post_review.py
+With no daemon they run standalone, unchanged (see pr_daemon_client.py).
+
+What a request saves over a standalone run:
+    - interpreter startup and imports: each script's module is loaded once
+      and its main() runs on a thread with its own argv/stdin/stdout/stderr
+    - a gh process per API call: `gh api` calls are answered in-process over
+      a pool of keep-alive HTTPS connections, with the token read once
+      (GH_TOKEN, GITHUB_TOKEN, else `gh auth token`; re-read after a 401)
+    - repeated reads: GET responses are cached per PR with their ETag and
+      revalidated with If-None-Match (a 304 is free against the rate limit);
+      any write to a PR drops that PR's entries
+Other gh commands (gh pr view, ...) and unfamiliar `gh api` flags still run
+the real gh.
+
+The daemon serves only scripts in its own directory and reviewing-prs'.
+If any of their files changed since it loaded them, it declines requests
+(clients run standalone) and exits, so the next start loads the new code.
+It exits after --idle-exit seconds without requests (default: 1800).
+The environment (GH_TOKEN, XDG_CACHE_HOME, ...) is the one it started with.
+
+Files: $XDG_CACHE_HOME/fixing-prs/pr-daemon/{daemon.sock,daemon.lock,daemon.log}
+
+Outputs JSON to stdout (start/status/stop):
+    {"status": "ok", "running": true, "pid": 4242, "socket": "...",
+     "uptime": 12.5, "requests": 31, "api_calls": 57, "cache_hits": 9,
+     "cache_entries": 14, "api_url": "https://api.github.com"}
+    Error: {"error": "message"}
+
+Exit codes:
+    0 - Success (serve: also when another daemon already holds the lock)
+    1 - The daemon didn't come up, or isn't running (stop/status)
+"""
+
+import argparse
+import fcntl
+import http.client
+import io
+import json
+import os
+import re
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from collections import OrderedDict
+from importlib.util import module_from_spec, spec_from_file_location
+from pathlib import Path
+from urllib.parse import urlencode, urlsplit
+
+import pr_daemon_client
+from watch_ci import CACHE_DIR
+
+HERE = Path(__file__).resolve().parent
+SCRIPT_DIRS = (HERE, HERE.parent.parent / "reviewing-prs" / "scripts")
+SERVED = {
+    "fetch_comments.py", "post_reply.py", "update_pr_description.py",
+    "probe_merge_state.py", "post_review.py",
+}
+DAEMON_DIR = CACHE_DIR / "pr-daemon"
+SOCKET_PATH = Path(pr_daemon_client.SOCKET_PATH)
+LOCK_PATH = DAEMON_DIR / "daemon.lock"
+LOG_PATH = DAEMON_DIR / "daemon.log"
+DEFAULT_API_URL = "https://api.github.com"
+# An agent's fix/reply/CI loop has gaps of minutes; half an hour covers a
+# session without leaving a process around all day.
+IDLE_EXIT = 1800
+START_WAIT = 5.0
+HTTP_TIMEOUT = 30
+# Cached GET responses: PR comment lists are the big ones (a few MB for a
+# thousand-comment PR), so bound both count and size.
+CACHE_MAX_ENTRIES = 2000
+CACHE_MAX_BYTES = 64 << 20
+# Idle keep-alive connections kept for reuse; more than the busiest fan-out
+# (post_replies_batch's 8 workers) buys nothing.
+POOL_SIZE = 8
+PR_PATH_RE = re.compile(r"^/(?:api/v3/)?repos/([^/]+)/([^/]+)/(?:pulls|issues)/(\d+)(?:/|$)")
+LINK_NEXT_RE = re.compile(r'<([^>]+)>;\s*rel="next"')
+
+_local = threading.local()
+
+
+# --- Per-request process state ---
+
+class _StreamProxy:
+    """sys.stdin/stdout/stderr stand-in: the current request's stream on
+    request threads, the daemon's own elsewhere."""
+
+    def __init__(self, name: str, default):
+        self._name = name
+        self._default = default
+
+    def _target(self):
+        return getattr(_local, self._name, None) or self._default
+
+    def __getattr__(self, attr):
+        return getattr(self._target(), attr)
+
+    def __iter__(self):
+        return iter(self._target())
+
+
+class _ArgvProxy(list):
+    """sys.argv stand-in, per request (argparse reads sys.argv at parse time)."""
+
+    def _target(self) -> list:
+        return getattr(_local, "argv", None) or _daemon_argv
+
+    def __getitem__(self, index):
+        return self._target()[index]
+
+    def __len__(self):
+        return len(self._target())
+
+    def __iter__(self):
+        return iter(self._target())
+
+    def __repr__(self):
+        return repr(self._target())
+
+
+def _getcwd(real=os.getcwd) -> str:
+    """os.getcwd stand-in: the request's cwd on request threads (pr_core finds
+    the repository for a bare PR number from it)."""
+    return getattr(_local, "cwd", None) or real()
+
+
+class _Tty(io.StringIO):
+    def isatty(self) -> bool:
+        return True
+
+
+_daemon_argv = list(sys.argv)
+
+
+# --- gh api, in-process ---
+
+class Unsupported(Exception):
+    """A gh invocation this module doesn't emulate; run the real gh."""
+
+
+class ResponseCache:
+    """GET bodies by URL with their ETags, droppable per PR."""
+
+    def __init__(self):
+        self.entries: OrderedDict[str, tuple[str, int, str, dict, bytes]] = OrderedDict()
+        self.size = 0
+        self.lock = threading.Lock()
+        self.hits = 0
+
+    def get(self, key: str):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry:
+                self.entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, etag: str, status: int, reason: str, headers: dict, body: bytes) -> None:
+        with self.lock:
+            self._drop(key)
+            self.entries[key] = (etag, status, reason, headers, body)
+            self.size += len(body)
+            while self.entries and (len(self.entries) > CACHE_MAX_ENTRIES or self.size > CACHE_MAX_BYTES):
+                self._drop(next(iter(self.entries)))
+
+    def drop_pr(self, pr: tuple[str, str, str]) -> None:
+        with self.lock:
+            for key in [k for k in self.entries if pr_of(urlsplit(k.split(" ", 1)[1]).path) == pr]:
+                self._drop(key)
+
+    def _drop(self, key: str) -> None:
+        entry = self.entries.pop(key, None)
+        if entry:
+            self.size -= len(entry[4])
+
+
+def pr_of(path: str) -> tuple[str, str, str] | None:
+    m = PR_PATH_RE.match(path)
+    return (m.group(1).lower(), m.group(2).lower(), m.group(3)) if m else None
+
+
+class GitHub:
+    """Just enough of `gh api` for the PR scripts, over pooled connections."""
+
+    def __init__(self, api_url: str, run_real):
+        self.base = urlsplit(api_url.rstrip("/"))
+        self.run_real = run_real
+        self.token = None
+        self.token_lock = threading.Lock()
+        self.cache = ResponseCache()
+        self.calls = 0
+        self.pool: list[http.client.HTTPConnection] = []
+        self.pool_lock = threading.Lock()
+
+    def auth_token(self, refresh: bool = False) -> str | None:
+        with self.token_lock:
+            if self.token is None or refresh:
+                token = os.environ.get("GH_TOKEN") or os.environ.get("GITHUB_TOKEN")
+                if not token:
+                    try:
+                        result = self.run_real(["gh", "auth", "token"], capture_output=True, text=True)
+                        token = result.stdout.strip() if result.returncode == 0 else None
+                    except OSError:
+                        token = None
+                self.token = token
+            return self.token
+
+    def acquire(self, fresh: bool = False) -> tuple[http.client.HTTPConnection, bool]:
+        """(connection, whether it has been used before)."""
+        if not fresh:
+            with self.pool_lock:
+                if self.pool:
+                    return self.pool.pop(), True
+        cls = http.client.HTTPSConnection if self.base.scheme == "https" else http.client.HTTPConnection
+        return cls(self.base.netloc, timeout=HTTP_TIMEOUT), False
+
+    def release(self, conn: http.client.HTTPConnection) -> None:
+        with self.pool_lock:
+            if len(self.pool) < POOL_SIZE:
+                self.pool.append(conn)
+                return
+        conn.close()
+
+    def send(self, method: str, path: str, headers: dict, body: bytes | None):
+        """(status, reason, headers, body); retries once on a dropped keep-alive."""
+        for attempt in (0, 1):
+            conn, reused = self.acquire(fresh=attempt > 0)
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                resp = conn.getresponse()
+                data = resp.read()
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                conn.close()
+                # The server closed an idle connection before reading the
+                # request: nothing was processed, so sending again is safe.
+                if attempt or not reused:
+                    raise
+                continue
+            except BaseException:
+                conn.close()
+                raise
+            if resp.will_close:
+                conn.close()
+            else:
+                self.release(conn)
+            self.calls += 1
+            return resp.status, resp.reason, {k: v for k, v in resp.getheaders()}, data
+        raise ConnectionError("unreachable")
+
+    def request(self, method: str, url: str, headers: dict, body: bytes | None):
+        token = self.auth_token()
+        parts = urlsplit(url)
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+        headers = dict(headers)
+        if token:
+            headers["Authorization"] = f"token {token}"
+        headers.setdefault("User-Agent", "pr-daemon")
+        key = f"{headers.get('Accept', '')} {url}"
+        cached = None
+        if method == "GET" and "If-None-Match" not in headers:
+            cached = self.cache.get(key)
+            if cached:
+                headers["If-None-Match"] = cached[0]
+        status, reason, resp_headers, data = self.send(method, path, headers, body)
+        if status == 401 and token:
+            headers["Authorization"] = f"token {self.auth_token(refresh=True)}"
+            status, reason, resp_headers, data = self.send(method, path, headers, body)
+        if cached and status == 304:
+            self.cache.hits += 1
+            etag, status, reason, old_headers, data = cached
+            resp_headers = dict(old_headers, **{k: v for k, v in resp_headers.items() if k.lower().startswith("x-ratelimit")})
+        elif method == "GET" and status == 200 and resp_headers.get("ETag"):
+            self.cache.put(key, resp_headers["ETag"], status, reason, resp_headers, data)
+        if method != "GET" and (pr := pr_of(parts.path)):
+            self.cache.drop_pr(pr)
+        return status, reason, resp_headers, data
+
+    def url(self, endpoint: str) -> str:
+        if re.match(r"https?://", endpoint):
+            return endpoint
+        prefix = self.base.path
+        if endpoint == "graphql" and prefix.endswith("/api/v3"):
+            prefix = prefix[:-len("/v3")]  # GitHub Enterprise: /api/v3 -> /api/graphql
+        return f"{self.base.scheme}://{self.base.netloc}{prefix}/{endpoint.lstrip('/')}"
+
+    def api(self, argv: list[str], stdin: bytes | None, cwd: str) -> tuple[int, bytes, bytes]:
+        """(exit code, stdout, stderr) of `gh api ...`, as gh would print them."""
+        method = None
+        headers = {"Accept": "application/vnd.github+json"}
+        fields: dict = {}
+        input_path = None
+        paginate = include = False
+        endpoint = None
+        args = iter(argv)
+        for arg in args:
+            if arg in ("-X", "--method"):
+                method = next(args).upper()
+            elif arg in ("-H", "--header"):
+                key, _, value = next(args).partition(":")
+                headers[key.strip()] = value.strip()
+            elif arg in ("-f", "--raw-field"):
+                key, _, value = next(args).partition("=")
+                fields[key] = value
+            elif arg in ("-F", "--field"):
+                key, _, value = next(args).partition("=")
+                fields[key] = typed_field(value, stdin, cwd)
+            elif arg == "--input":
+                input_path = next(args)
+            elif arg == "--paginate":
+                paginate = True
+            elif arg in ("-i", "--include"):
+                include = True
+            elif arg.startswith("-") or endpoint is not None:
+                raise Unsupported(arg)
+            else:
+                endpoint = arg
+        if endpoint is None:
+            raise Unsupported("no endpoint")
+
+        graphql = endpoint == "graphql"
+        method = method or ("POST" if fields or input_path or graphql else "GET")
+        url = self.url(endpoint)
+        body = None
+        if input_path:
+            body = (stdin or b"") if input_path == "-" else Path(cwd, input_path).read_bytes()
+        elif graphql:
+            query = fields.pop("query", "")
+            body = json.dumps({"query": query, "variables": fields}).encode()
+        elif fields and method == "GET":
+            url += ("&" if "?" in url else "?") + urlencode(fields)
+        elif fields:
+            body = json.dumps(fields).encode()
+        if body is not None:
+            headers["Content-Type"] = "application/json"
+
+        out = io.BytesIO()
+        while True:
+            status, reason, resp_headers, data = self.request(method, url, headers, body)
+            if include:
+                out.write(f"HTTP/2.0 {status} {reason}\r\n".encode())
+                for key, value in resp_headers.items():
+                    out.write(f"{key}: {value}\r\n".encode())
+                out.write(b"\r\n")
+            if status == 304:
+                return 1, out.getvalue(), b""
+            out.write(data)
+            if status >= 400:
+                return 1, out.getvalue(), f"gh: {error_message(data)} (HTTP {status})\n".encode()
+            if graphql and b'"errors"' in data:
+                try:
+                    errors = json.loads(data).get("errors")
+                except ValueError:
+                    errors = None
+                if errors:
+                    return 1, out.getvalue(), f"gh: {error_message(data)}\n".encode()
+            next_link = LINK_NEXT_RE.search(resp_headers.get("Link", ""))
+            if not (paginate and next_link):
+                return 0, out.getvalue(), b""
+            url = next_link.group(1)
+
+
+def typed_field(value: str, stdin: bytes | None, cwd: str):
+    """gh's -F conversion: numbers, booleans, null, @file."""
+    if value.startswith("@"):
+        return (stdin or b"").decode() if value == "@-" else Path(cwd, value[1:]).read_text()
+    if value in ("true", "false"):
+        return value == "true"
+    if value == "null":
+        return None
+    if re.fullmatch(r"-?\d+", value):
+        return int(value)
+    return value
+
+
+def error_message(body: bytes) -> str:
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return body.decode(errors="replace").strip()
+    if isinstance(data, dict):
+        if data.get("errors"):
+            return "; ".join(e.get("message", "") for e in data["errors"])
+        return data.get("message", "")
+    return ""
+
+
+def install_subprocess_hook(github: GitHub, real_run) -> None:
+    """Route `gh api` through `github`; give other commands the request's cwd."""
+
+    def run(args, *pargs, **kwargs):
+        cwd = getattr(_local, "cwd", None)
+        if cwd and "cwd" not in kwargs:
+            kwargs["cwd"] = cwd
+        if not (isinstance(args, (list, tuple)) and list(args[:2]) == ["gh", "api"]) or pargs:
+            return real_run(args, *pargs, **kwargs)
+        text = kwargs.get("text") or kwargs.get("universal_newlines") or kwargs.get("encoding")
+        stdin = kwargs.get("input")
+        if isinstance(stdin, str):
+            stdin = stdin.encode()
+        try:
+            code, out, err = github.api(list(args[2:]), stdin, kwargs.get("cwd") or os.getcwd())
+        except Unsupported:
+            return real_run(args, **kwargs)
+        except (OSError, http.client.HTTPException) as e:
+            code, out, err = 1, b"", f"gh: {e}\n".encode()
+        captured = kwargs.get("capture_output") or kwargs.get("stdout") == subprocess.PIPE
+        target = kwargs.get("stdout")
+        if not captured:
+            if hasattr(target, "write"):
+                target.write(out)
+            else:
+                sys.stdout.write(out.decode(errors="replace"))
+        stderr_captured = kwargs.get("capture_output") or kwargs.get("stderr") == subprocess.PIPE
+        if not stderr_captured:
+            sys.stderr.write(err.decode(errors="replace"))
+        result = subprocess.CompletedProcess(
+            list(args), code,
+            (out.decode() if text else out) if captured else None,
+            (err.decode() if text else err) if stderr_captured else None,
+        )
+        if kwargs.get("check") and code:
+            raise subprocess.CalledProcessError(code, list(args), result.stdout, result.stderr)
+        return result
+
+    subprocess.run = run
+
+
+# --- Serving ---
+
+class Daemon:
+    def __init__(self, api_url: str, idle_exit: float):
+        self.api_url = api_url
+        self.idle_exit = idle_exit
+        self.started = time.time()
+        self.last_activity = time.time()
+        self.requests = 0
+        self.active = 0
+        self.lock = threading.Lock()
+        self.mtimes: dict[str, float] = {}
+        self.stale = False
+        self.server = None
+        real_run = subprocess.run
+        self.github = GitHub(api_url, real_run)
+        install_subprocess_hook(self.github, real_run)
+        for directory in SCRIPT_DIRS:
+            if str(directory) not in sys.path:
+                sys.path.append(str(directory))
+        sys.stdin = _StreamProxy("stdin", sys.stdin)
+        sys.stdout = _StreamProxy("stdout", sys.stdout)
+        sys.stderr = _StreamProxy("stderr", sys.stderr)
+        sys.argv = _ArgvProxy()
+        os.getcwd = _getcwd
+        self.track()
+
+    def status(self) -> dict:
+        return {
+            "status": "ok", "running": True, "pid": os.getpid(), "socket": str(SOCKET_PATH),
+            "uptime": round(time.time() - self.started, 1), "requests": self.requests,
+            "api_calls": self.github.calls, "cache_hits": self.github.cache.hits,
+            "cache_entries": len(self.github.cache.entries), "api_url": self.api_url,
+        }
+
+    def code_changed(self) -> bool:
+        """Any loaded script module edited since it was loaded."""
+        for path, mtime in list(self.mtimes.items()):
+            try:
+                if os.stat(path).st_mtime != mtime:
+                    return True
+            except OSError:
+                return True
+        return False
+
+    def track(self) -> None:
+        """Note the mtime of every loaded script module not yet tracked."""
+        for mod in list(sys.modules.values()):
+            file = getattr(mod, "__file__", None)
+            if file and file not in self.mtimes and Path(file).resolve().parent in SCRIPT_DIRS:
+                self.mtimes[file] = os.stat(file).st_mtime
+
+    def module(self, path: Path):
+        """The script's module, loaded once (under its plain name, so the
+        scripts' imports of each other share it); None on a name clash
+        between the two script dirs."""
+        with self.lock:
+            module = sys.modules.get(path.stem)
+            if module is not None:
+                return module if Path(module.__file__).resolve() == path else None
+            spec = spec_from_file_location(path.stem, path)
+            module = module_from_spec(spec)
+            sys.modules[path.stem] = module
+            try:
+                spec.loader.exec_module(module)
+            except BaseException:
+                del sys.modules[path.stem]
+                raise
+            self.track()
+            return module
+
+    def run(self, message: dict) -> dict:
+        path = Path(message.get("script", "")).resolve()
+        if path.parent not in SCRIPT_DIRS or path.name not in SERVED:
+            return {"fallback": True, "reason": "not served"}
+        if self.stale or self.code_changed():
+            if not self.stale:
+                print("Script code changed; exiting", file=sys.stderr)
+            self.stale = True
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+            return {"fallback": True, "reason": "code changed; restarting"}
+        module = self.module(path)
+        if module is None or not hasattr(module, "main"):
+            return {"fallback": True, "reason": "not loadable"}
+
+        stdin = message.get("stdin")
+        _local.stdin = _Tty() if message.get("stdin_tty") else io.StringIO(stdin or "")
+        _local.stdout = io.StringIO()
+        _local.stderr = io.StringIO()
+        _local.argv = [str(path), *message.get("argv", [])]
+        _local.cwd = message.get("cwd")
+        try:
+            code = module.main()
+        except SystemExit as e:
+            if e.code is None or isinstance(e.code, int):
+                code = e.code or 0
+            else:
+                print(e.code, file=sys.stderr)
+                code = 1
+        except Exception:
+            traceback.print_exc(file=_local.stderr)
+            code = 1
+        finally:
+            response = {"stdout": _local.stdout.getvalue(), "stderr": _local.stderr.getvalue()}
+            for name in ("stdin", "stdout", "stderr", "argv", "cwd"):
+                setattr(_local, name, None)
+        response["exit"] = code if isinstance(code, int) else 0
+        return response
+
+    def handle(self, message: dict) -> dict:
+        op = message.get("op")
+        if op == "status":
+            return self.status()
+        if op == "stop":
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+            return dict(self.status(), running=False)
+        if op == "run":
+            with self.lock:
+                self.requests += 1
+                self.active += 1
+            try:
+                return self.run(message)
+            finally:
+                with self.lock:
+                    self.active -= 1
+                    self.last_activity = time.time()
+        return {"error": f"unknown op: {op}"}
+
+    def watch_idle(self) -> None:
+        while True:
+            time.sleep(min(60.0, self.idle_exit / 4))
+            with self.lock:
+                idle = not self.active and time.time() - self.last_activity > self.idle_exit
+            if idle:
+                print(f"Idle for {self.idle_exit:.0f}s; exiting", file=sys.stderr)
+                self.server.shutdown()
+                return
+
+
+def make_handler(daemon: Daemon):
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            try:
+                message = json.loads(self.rfile.read() or b"{}")
+            except ValueError as e:
+                response = {"error": f"invalid request: {e}"}
+            else:
+                response = daemon.handle(message)
+            self.wfile.write(json.dumps(response).encode())
+
+    return Handler
+
+
+def serve(api_url: str, idle_exit: float) -> int:
+    DAEMON_DIR.mkdir(parents=True, exist_ok=True, mode=0o700)
+    with open(LOCK_PATH, "w") as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return 0  # another daemon is already serving
+        SOCKET_PATH.unlink(missing_ok=True)
+        daemon = Daemon(api_url, idle_exit)
+        server = socketserver.ThreadingUnixStreamServer(str(SOCKET_PATH), make_handler(daemon))
+        server.daemon_threads = True
+        os.chmod(SOCKET_PATH, 0o600)
+        daemon.server = server
+        threading.Thread(target=daemon.watch_idle, daemon=True).start()
+        print(f"PR daemon {os.getpid()} serving on {SOCKET_PATH} ({api_url})", file=sys.stderr)
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+            SOCKET_PATH.unlink(missing_ok=True)
+            fcntl.flock(lock, fcntl.LOCK_UN)
+    return 0
+
+
+# --- Caller side ---
+
+def query(op: str) -> dict | None:
+    """The daemon's answer to a control op, or None if none is listening."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(SOCKET_PATH))
+    except OSError:
+        sock.close()
+        return None
+    sock.settimeout(10)
+    try:
+        return pr_daemon_client.send(sock, {"op": op})
+    except (OSError, ValueError):
+        return None
+
+
+def start(api_url: str, idle_exit: float) -> dict:
+    running = query("status")
+    if running:
+        return dict(running, started=False)
+    DAEMON_DIR.mkdir(parents=True, exist_ok=True, mode=0o700)
+    with open(LOG_PATH, "a") as log:
+        subprocess.Popen(
+            [sys.executable, str(Path(__file__).resolve()), "serve",
+             "--api-url", api_url, "--idle-exit", str(idle_exit)],
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=log,
+            start_new_session=True,
+        )
+    deadline = time.time() + START_WAIT
+    while time.time() < deadline:
+        running = query("status")
+        if running:
+            return dict(running, started=True)
+        time.sleep(0.05)
+    return {"error": f"daemon didn't start; see {LOG_PATH}"}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Resident daemon for the PR scripts")
+    parser.add_argument("command", choices=("start", "status", "stop", "serve"))
+    parser.add_argument("--api-url", default=DEFAULT_API_URL,
+                        help=f"GitHub API base URL (default: {DEFAULT_API_URL})")
+    parser.add_argument("--idle-exit", type=float, default=IDLE_EXIT,
+                        help=f"Exit after this many seconds without requests (default: {IDLE_EXIT})")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        return serve(args.api_url, args.idle_exit)
+    if args.command == "start":
+        result = start(args.api_url, args.idle_exit)
+    else:
+        result = query(args.command) or {"error": "no daemon running"}
+    print(json.dumps(result))
+    return 1 if "error" in result else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
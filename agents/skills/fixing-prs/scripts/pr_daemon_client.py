@@ -0,0 +1,107 @@
+"""
+Client side of pr_daemon.py: run a PR script inside the resident daemon
+when one is up, or right here when not.
+
+    if __name__ == "__main__":
+        sys.exit(pr_daemon_client.run(__file__, main, reads_stdin=True))
+
+Only the standard library's lightest modules are imported, since this runs
+in every script's startup (socket only once a daemon's socket exists). The
+daemon is skipped (the script runs standalone, exactly as before) when:
+    - no daemon is listening
+    - PR_DAEMON=0 is set
+    - GH_TRACE is set: traces measure the standalone gh calls
+    - the daemon declines the request (e.g. its code is older than the
+      script's; it then exits so the next start picks up the new code)
+Once the daemon has accepted a request there is no fallback: it may have
+posted already, and running again could post twice.
+
+fixing-prs and reviewing-prs each carry this file (skills are packaged
+separately); keep the two copies identical (check_startup.py fails
+when they differ).
+"""
+
+import json
+import os
+import sys
+
+# Must match pr_daemon.py.
+SOCKET_PATH = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")),
+    "fixing-prs", "pr-daemon", "daemon.sock",
+)
+# A request runs a whole script (paging through a big PR included).
+TIMEOUT = 600
+
+
+def enabled() -> bool:
+    return os.environ.get("PR_DAEMON") != "0" and not os.environ.get("GH_TRACE")
+
+
+def connect() -> "socket.socket | None":
+    if not enabled() or not os.path.exists(SOCKET_PATH):
+        return None
+    import socket
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(SOCKET_PATH)
+    except OSError:
+        sock.close()
+        return None
+    sock.settimeout(TIMEOUT)
+    return sock
+
+
+def send(sock: "socket.socket", message: dict) -> dict:
+    import socket
+
+    with sock:
+        sock.sendall(json.dumps(message).encode())
+        sock.shutdown(socket.SHUT_WR)
+        chunks = []
+        while chunk := sock.recv(65536):
+            chunks.append(chunk)
+    return json.loads(b"".join(chunks) or b"{}")
+
+
+def request(script: str, argv: list[str], stdin: str | None = None) -> dict | None:
+    """Run `script argv` in the daemon: {"stdout", "stderr", "exit"}, or None
+    if no daemon took it (nothing ran)."""
+    sock = connect()
+    if sock is None:
+        return None
+    try:
+        response = send(sock, {
+            "op": "run", "script": os.path.realpath(script), "argv": argv,
+            "stdin": stdin, "cwd": os.getcwd(),
+        })
+    except (OSError, ValueError) as e:
+        return {"stdout": "", "stderr": f"pr daemon: request failed: {e}\n", "exit": 1}
+    return None if response.get("fallback") else response
+
+
+def run(script: str, main, reads_stdin: bool = False) -> int:
+    """main()'s exit code, from the daemon if one takes the request."""
+    sock = connect()
+    if sock is None:
+        return main()
+    stdin = None
+    if reads_stdin and not sys.stdin.isatty():
+        stdin = sys.stdin.read()
+    try:
+        response = send(sock, {
+            "op": "run", "script": os.path.realpath(script), "argv": sys.argv[1:],
+            "stdin": stdin, "stdin_tty": reads_stdin and stdin is None, "cwd": os.getcwd(),
+        })
+    except (OSError, ValueError) as e:
+        print(f"pr daemon: request failed: {e}", file=sys.stderr)
+        return 1
+    if response.get("fallback"):
+        if stdin is not None:
+            import io
+            sys.stdin = io.StringIO(stdin)
+        return main()
+    sys.stderr.write(response.get("stderr", ""))
+    sys.stdout.write(response.get("stdout", ""))
+    return response.get("exit", 1)
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Probe whether a PR meets all four ready-to-merge criteria, in one request.
+
+Usage:
+    probe_merge_state.py <pr_url_or_number> [--no-cache]
+
+One GraphQL query reads the head SHA, merge state, check rollup, every
+review and every comment conversation. The conversations go through
+fetch_comments.py's own annotate()/classify(), so "handled" means exactly
+what the fetch_comments digest means by it. (Threads, reviews or comments
+past the first 100 fall back to fetch_comments' full pagination.)
+
+Criteria, as ready-to-merge defines them:
+    quiet_ai_pass   — every AI reviewer on the PR (AI_REVIEWER_LOGINS) has
+                      reviewed or commented since the head commit, and none
+                      of what it posted since then is still actionable
+    threads_handled — fetch_comments would show nothing actionable
+    ci_green        — every check complete and passing (success/neutral/skipped)
+    up_to_date      — mergeStateStatus is CLEAN, HAS_HOOKS or UNSTABLE, or
+                      BLOCKED only on required human review
+                      ("awaiting_human_review": a human must clear that)
+
+"Nothing changed" polls are nearly free: the previous verdict is cached
+with the ETags of the PR and of its base branch ref. The next probe first
+sends conditional GETs for both — a 304 doesn't count against the rate
+limit — and if neither changed, the cached verdict is returned. Check runs
+don't touch the PR's ETag, so this only applies once the cached CI state is
+final, and a cached verdict is trusted for at most CACHE_TTL seconds
+(re-runs of a finished check are otherwise invisible).
+
+Outputs JSON to stdout:
+    {"status": "ok", "ready": false, "cached": false, "pr": 123, "head": "abc123...",
+     "criteria": {
+       "quiet_ai_pass": {"ok": false, "waiting_on": ["coderabbitai"], "new_items_from": []},
+       "threads_handled": {"ok": true, "threads": 0, "reviews": 0, "issue_comments": 0},
+       "ci_green": {"ok": false, "pending": ["test"], "failed": []},
+       "up_to_date": {"ok": true, "merge_state": "CLEAN", "awaiting_human_review": false}},
+     "reviewers": [{"login": "coderabbitai", "state": "COMMENTED", "on_head": false, "new_items": 0}]}
+    Error: {"error": "message"}
+
+Exit codes:
+    0 - Probe succeeded (see "ready")
+    1 - Invalid arguments
+    2 - GitHub API error
+"""
+
+import json
+import sys
+import time
+
+import gh_trace
+import pr_daemon_client
+from fetch_comments import annotate, classify, fetch_all, parse_pr_reference
+from pr_core import lazy_import
+from update_pr_description import split_http_response
+from watch_ci import CACHE_DIR, CONTEXT_FIELDS, fetch_checks, graphql, is_failed, parse_rollup
+
+# Imported on first use: a request handed to pr_daemon.py never needs them.
+argparse = lazy_import("argparse")
+subprocess = lazy_import("subprocess")
+
+gh_trace.install()
+
+# The AI reviewers quiet_ai_pass waits for (logins minus any "[bot]"). Other
+# bots (changeset-bot, dependabot, ...) don't review every push, so waiting
+# on them would never end.
+AI_REVIEWER_LOGINS = {"copilot-pull-request-reviewer", "coderabbitai", "claude", "cursor"}
+# mergeStateStatus values with nothing left for the branch to do: HAS_HOOKS
+# is CLEAN plus pre-receive hooks, UNSTABLE is CLEAN with failing
+# non-required checks (which ci_green reports).
+MERGEABLE_STATES = {"CLEAN", "HAS_HOOKS", "UNSTABLE"}
+# Upper bound on trusting a cached verdict without a full probe.
+CACHE_TTL = 600
+PROBE_CACHE_DIR = CACHE_DIR / "merge-probe"
+
+PROBE_QUERY = """
+query($owner: String!, $repo: String!, $num: Int!) {
+  repository(owner: $owner, name: $repo) {
+    pullRequest(number: $num) {
+      number url state headRefOid baseRefName mergeStateStatus reviewDecision
+      commits(last: 1) {
+        nodes {
+          commit {
+            committedDate
+            statusCheckRollup {
+              contexts(first: 100) {
+                pageInfo { hasNextPage endCursor }
+                nodes { %s }
+              }
+            }
+          }
+        }
+      }
+      reviewThreads(first: 100) {
+        pageInfo { hasNextPage }
+        nodes {
+          isResolved
+          comments(first: 100) {
+            pageInfo { hasNextPage }
+            nodes { databaseId author { login } body createdAt }
+          }
+        }
+      }
+      reviews(first: 100) {
+        pageInfo { hasNextPage }
+        nodes { databaseId author { login } body state createdAt commit { oid } }
+      }
+      comments(first: 100) {
+        pageInfo { hasNextPage }
+        nodes { databaseId author { login } body createdAt }
+      }
+    }
+  }
+}
+""" % CONTEXT_FIELDS
+
+
+def conditional_get(path: str, etag: str | None) -> tuple[int, dict, str]:
+    """GET a REST path, conditionally when `etag` is given (304 = unchanged)."""
+    cmd = ["gh", "api", "--include", path]
+    if etag:
+        cmd += ["-H", f"If-None-Match: {etag}"]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    status, headers, body = split_http_response(result.stdout)
+    if status not in (200, 304):
+        raise RuntimeError(f"GET {path} failed: {result.stderr.strip() or body.strip()}")
+    return status, headers, body
+
+
+def is_ai_reviewer(author: dict | None) -> bool:
+    return bool(author) and author["login"].removesuffix("[bot]") in AI_REVIEWER_LOGINS
+
+
+def conversations(pr: dict, owner: str, repo: str, num: int) -> dict:
+    """fetch_comments-shaped data, straight from the probe when it fit in
+    one page, otherwise from a full fetch."""
+    conns = (pr["reviewThreads"], pr["reviews"], pr["comments"])
+    truncated = any(c["pageInfo"]["hasNextPage"] for c in conns) or any(
+        t["comments"]["pageInfo"]["hasNextPage"] for t in pr["reviewThreads"]["nodes"]
+    )
+    if truncated:
+        print("Over 100 conversations; paging through them in full...", file=sys.stderr)
+        return fetch_all(owner, repo, num)
+    threads = [dict(t, comments=t["comments"]["nodes"]) for t in pr["reviewThreads"]["nodes"]]
+    return {"threads": threads, "reviews": pr["reviews"]["nodes"],
+            "issue_comments": pr["comments"]["nodes"]}
+
+
+def reviewer_activity(data: dict, groups: dict, head: str, head_date: str) -> list[dict]:
+    """Per AI reviewer: latest review state, whether it has reviewed or
+    commented since the head commit, and how many of the actionable
+    conversations (classify()'s) hold something it posted since then."""
+    by_login: dict[str, dict] = {}
+
+    def seen(author: dict | None) -> dict | None:
+        if not is_ai_reviewer(author):
+            return None
+        return by_login.setdefault(author["login"], {
+            "login": author["login"], "state": None, "on_head": False, "new_items": 0,
+        })
+
+    def on_head(review: dict) -> bool:
+        return (review.get("commit") or {}).get("oid") == head or review["createdAt"] >= head_date
+
+    for review in sorted(data["reviews"], key=lambda r: r["createdAt"]):
+        entry = seen(review.get("author"))
+        if entry is None or review["state"] == "PENDING":
+            continue
+        entry["state"] = review["state"]
+        if on_head(review):
+            entry["on_head"] = True
+    comments = [c for t in data["threads"] for c in t["comments"]] + data["issue_comments"]
+    for comment in comments:
+        entry = seen(comment.get("author"))
+        if entry is not None and comment["createdAt"] >= head_date:
+            entry["on_head"] = True
+
+    new_posts = [[c for c in t["comments"] if c["createdAt"] >= head_date] for t in groups["threads"]]
+    new_posts += [[r] for r in groups["reviews"] if on_head(r)]
+    new_posts += [[c] for c in groups["issue_comments"] if c["createdAt"] >= head_date]
+    for posts in new_posts:
+        for author in {p["author"]["login"] for p in posts if is_ai_reviewer(p.get("author"))}:
+            by_login[author]["new_items"] += 1
+    return sorted(by_login.values(), key=lambda e: e["login"])
+
+
+def full_probe(owner: str, repo: str, num: int) -> dict:
+    pr = graphql(PROBE_QUERY, {"owner": owner, "repo": repo, "num": num})["repository"]["pullRequest"]
+    if pr is None:
+        raise RuntimeError(f"PR #{num} not found in {owner}/{repo}")
+
+    head = pr["headRefOid"]
+    commits = pr["commits"]["nodes"]
+    head_date = commits[0]["commit"]["committedDate"] if commits else ""
+    checks, page = parse_rollup(pr)
+    if page is not None and page["hasNextPage"]:
+        checks += fetch_checks(owner, repo, num, page["endCursor"])
+
+    data = annotate(conversations(pr, owner, repo, num))
+    groups = classify(data)
+    reviewers = reviewer_activity(data, groups, head, head_date)
+
+    pending = [c["name"] for c in checks if not c["done"]]
+    failed = [c["name"] for c in checks if is_failed(c)]
+    waiting = [r["login"] for r in reviewers if not r["on_head"]]
+    new_items_from = [r["login"] for r in reviewers if r["new_items"]]
+    merge_state = pr["mergeStateStatus"]
+    # Required human review is for a human to clear, not another loop round.
+    awaiting_human = merge_state == "BLOCKED" and pr.get("reviewDecision") == "REVIEW_REQUIRED"
+    criteria = {
+        "quiet_ai_pass": {"ok": not waiting and not new_items_from, "waiting_on": waiting,
+                          "new_items_from": new_items_from},
+        "threads_handled": {
+            "ok": not (groups["threads"] or groups["reviews"] or groups["issue_comments"]),
+            "threads": len(groups["threads"]),
+            "reviews": len(groups["reviews"]),
+            "issue_comments": len(groups["issue_comments"]),
+        },
+        "ci_green": {"ok": not pending and not failed, "pending": pending, "failed": failed},
+        "up_to_date": {"ok": merge_state in MERGEABLE_STATES or awaiting_human,
+                       "merge_state": merge_state, "awaiting_human_review": awaiting_human},
+    }
+    return {
+        "status": "ok",
+        "ready": all(c["ok"] for c in criteria.values()),
+        "cached": False,
+        "pr": pr["number"],
+        "head": head,
+        "base": pr["baseRefName"],
+        "criteria": criteria,
+        "reviewers": reviewers,
+    }
+
+
+def probe(owner: str, repo: str, num: int, use_cache: bool) -> dict:
+    """Cached verdict when neither the PR nor its base moved, else a full probe."""
+    cache_path = PROBE_CACHE_DIR / f"{owner}__{repo}__{num}.json"
+    try:
+        cached = json.loads(cache_path.read_text()) if use_cache else None
+    except (OSError, json.JSONDecodeError):
+        cached = None
+    if cached and (time.time() - cached["fetched_at"] > CACHE_TTL
+                   or cached["verdict"]["criteria"]["ci_green"]["pending"]):
+        cached = None
+
+    # ETags are taken before the full query, so anything that changes
+    # while it runs shows up as a change on the next probe.
+    status, headers, body = conditional_get(
+        f"repos/{owner}/{repo}/pulls/{num}", cached and cached["pr_etag"],
+    )
+    pr_etag = headers.get("etag")
+    base = json.loads(body)["base"]["ref"] if status == 200 else cached["verdict"]["base"]
+    base_status, base_headers, _ = conditional_get(
+        f"repos/{owner}/{repo}/git/ref/heads/{base}",
+        cached and status == 304 and cached["base_etag"],
+    )
+    if cached and status == 304 and base_status == 304:
+        print("Nothing changed since the last probe.", file=sys.stderr)
+        return dict(cached["verdict"], cached=True)
+
+    verdict = full_probe(owner, repo, num)
+    try:
+        PROBE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = cache_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({
+            "fetched_at": time.time(),
+            "pr_etag": pr_etag or (cached and cached["pr_etag"]),
+            "base_etag": base_headers.get("etag"),
+            "verdict": verdict,
+        }))
+        tmp.replace(cache_path)
+    except OSError:
+        pass
+    return verdict
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("pr", help="PR number or URL")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="always run the full probe")
+    args = parser.parse_args()
+
+    owner, repo, num = parse_pr_reference(args.pr)
+    try:
+        verdict = probe(owner, repo, num, not args.no_cache)
+    except RuntimeError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        print(json.dumps({"error": str(e)}))
+        return 2
+    print(json.dumps(verdict, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(pr_daemon_client.run(__file__, main))
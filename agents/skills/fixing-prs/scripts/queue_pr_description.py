@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Queue a "Comments Addressed" summary for a PR; parallel callers are
+coalesced into one description edit per window.
+
+Usage (JSON via stdin) — same input as update_pr_description.py:
+    queue_pr_description.py <<'EOF'
+    {"pr": "123", "summary": "- Fixed null check"}
+    EOF
+
+JSON input fields:
+    pr/pr_ref: PR number or URL (required)
+    summary: Summary of changes made (required)
+    replace: Boolean, replace existing section instead of appending
+    window: Seconds to wait for other callers before flushing (default: 2)
+
+Use this instead of update_pr_description.py when several fixer agents work
+the same PR at once. Each caller drops its summary into a per-PR spool
+directory and takes the spool lock. Whoever gets the lock first waits out
+the window, then merges every pending summary in arrival order and applies
+them in a single update_pr_description edit. The other callers are blocked
+on the lock while that happens; when they get it, their result is already
+waiting. If a flusher dies mid-window, the next caller to take the lock
+flushes whatever is still pending, so no summary is lost. Results left
+behind by callers that died before reading them are removed at the next
+flush. Whatever goes wrong in a flush, every summary it claimed gets an
+error result; a caller that still finds none withdraws its summary and
+reports an error.
+
+Outputs JSON to stdout (once the flush containing this summary completes):
+    Success: {"status": "ok", "action": "created|appended|replaced|unchanged|superseded",
+              "pr_number": 123, "batch_size": 3}
+    Error:   {"error": "message"}
+
+`action` is what this caller's summary did, as if the batch were applied
+one summary at a time: the first summary creates the section, later ones
+append to it, and a replace resets it. "superseded" means a later replace
+in the same batch threw this summary away; "unchanged" means the batch
+left the description as it was.
+
+Exit codes:
+    0 - Success
+    1 - Invalid arguments
+    2 - GitHub API error
+"""
+
+import fcntl
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+from update_pr_description import (
+    DEFAULT_HEADING, apply_updates, output_json, parse_pr_reference,
+)
+
+# Fixers that finish together land within a second or two of each other;
+# a short window catches them without noticeably delaying a lone caller.
+DEFAULT_WINDOW = 2.0
+
+QUEUE_ROOT = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "fixing-prs" / "description-queue"
+
+
+def spool_dir(owner: str, repo: str, pr_num: str) -> Path:
+    path = QUEUE_ROOT / f"{owner}__{repo}__{pr_num}"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def enqueue(spool: Path, summary: str, replace: bool) -> str:
+    """Write an entry atomically; its name sorts by arrival time."""
+    entry_id = f"{time.time_ns():020d}-{os.getpid()}"
+    tmp = spool / f".{entry_id}.tmp"
+    tmp.write_text(json.dumps({"summary": summary, "replace": replace}))
+    tmp.rename(spool / f"{entry_id}.json")
+    return entry_id
+
+
+def merge_entries(entries: list[dict]) -> dict:
+    """Fold summaries in arrival order into one update: appends concatenate,
+    a replace discards everything queued before it."""
+    content = ""
+    replace = False
+    for entry in entries:
+        if entry["replace"]:
+            content, replace = entry["summary"], True
+        else:
+            content = f"{content}\n{entry['summary']}" if content else entry["summary"]
+    return {"heading": DEFAULT_HEADING, "content": content, "mode": "replace" if replace else "append"}
+
+
+def per_entry_actions(entries: list[dict], merged_action: str) -> list[str]:
+    """Each caller's action as if the batch were applied sequentially."""
+    if merged_action == "unchanged":
+        return ["unchanged"] * len(entries)
+    # merge_entries() dropped everything before the last replace
+    kept = max((i for i, entry in enumerate(entries) if entry["replace"]), default=0)
+    actions = ["superseded"] * kept
+    for i, entry in enumerate(entries[kept:]):
+        if i == 0 and merged_action == "created":
+            # The merged edit created the section; that's the first kept entry's doing
+            actions.append("created")
+        else:
+            actions.append("replaced" if entry["replace"] else "appended")
+    return actions
+
+
+def remove_orphaned_results(spool: Path) -> None:
+    """Drop results whose caller died before reading them. Entry names end
+    in the caller's pid; a live caller reads its result right after the
+    flush, so only a dead one leaves it behind."""
+    for path in spool.glob("*.result"):
+        try:
+            os.kill(int(path.stem.rsplit("-", 1)[1]), 0)
+        except ProcessLookupError:
+            path.unlink(missing_ok=True)
+        except (ValueError, IndexError, PermissionError):
+            pass
+
+
+def flush(spool: Path, owner: str, repo: str, pr_num: str) -> None:
+    """Apply every pending entry in one edit and publish each caller's result."""
+    remove_orphaned_results(spool)
+    paths = sorted(spool.glob("*.json"))
+    if not paths:
+        return
+    print(f"Flushing {len(paths)} queued summaries for PR #{pr_num}...", file=sys.stderr)
+
+    try:
+        entries = [json.loads(p.read_text()) for p in paths]
+        actions, _ = apply_updates(owner, repo, pr_num, [merge_entries(entries)])
+        per_entry = per_entry_actions(entries, actions[0])
+        results = [
+            {"status": "ok", "action": action, "pr_number": int(pr_num), "batch_size": len(entries)}
+            for action in per_entry
+        ]
+    except RuntimeError as e:
+        results = [{"error": str(e)}] * len(paths)
+    except Exception as e:  # gh missing, malformed spool or API output: still answer everyone
+        results = [{"error": f"Flush failed: {type(e).__name__}: {e}"}] * len(paths)
+
+    for path, result in zip(paths, results):
+        tmp = path.with_name(f".{path.stem}.result.tmp")
+        tmp.write_text(json.dumps(result))
+        tmp.rename(path.with_suffix(".result"))
+        path.unlink()
+
+
+def submit(owner: str, repo: str, pr_num: str, summary: str, replace: bool,
+           window: float) -> dict:
+    """Queue one summary and block until the flush that includes it is done."""
+    spool = spool_dir(owner, repo, pr_num)
+    entry_id = enqueue(spool, summary, replace)
+    result_path = spool / f"{entry_id}.result"
+
+    failure = "the flush that should have included it published nothing"
+    with open(spool / "lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            if not result_path.exists():
+                time.sleep(window)
+                try:
+                    flush(spool, owner, repo, pr_num)
+                except Exception as e:
+                    failure = f"flush failed: {type(e).__name__}: {e}"
+            if not result_path.exists():
+                # Withdraw it, so no later flush applies a summary reported as failed.
+                (spool / f"{entry_id}.json").unlink(missing_ok=True)
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+    try:
+        result = json.loads(result_path.read_text())
+    except (OSError, json.JSONDecodeError):
+        return {"error": f"No result for this summary; {failure}"}
+    result_path.unlink(missing_ok=True)
+    return result
+
+
+def parse_args():
+    """Parse arguments from stdin JSON."""
+    if sys.stdin.isatty():
+        print("Error: This script requires JSON input via stdin", file=sys.stderr)
+        print("Usage: queue_pr_description.py <<'EOF'", file=sys.stderr)
+        print('{"pr": "123", "summary": "- Fixed X\\n- Added Y"}', file=sys.stderr)
+        print("EOF", file=sys.stderr)
+        output_json({"error": "This script requires JSON input via stdin"})
+        sys.exit(1)
+
+    try:
+        data = json.load(sys.stdin)
+        pr_ref = data.get("pr") or data.get("pr_ref")
+        summary = data.get("summary")
+
+        if not pr_ref:
+            print("Error: Missing required field 'pr' or 'pr_ref'", file=sys.stderr)
+            output_json({"error": "Missing required field 'pr' or 'pr_ref'"})
+            sys.exit(1)
+        if not summary:
+            print("Error: Missing required field 'summary'", file=sys.stderr)
+            output_json({"error": "Missing required field 'summary'"})
+            sys.exit(1)
+
+        class Args:
+            pass
+        args = Args()
+        args.pr_ref = pr_ref
+        # Convert literal \n to newlines
+        args.summary = summary.replace('\\n', '\n')
+        args.replace = data.get("replace", False)
+        args.window = float(data.get("window", DEFAULT_WINDOW))
+        return args
+    except (json.JSONDecodeError, TypeError, ValueError) as e:
+        print(f"Error: Invalid JSON input: {e}", file=sys.stderr)
+        output_json({"error": f"Invalid JSON input: {e}"})
+        sys.exit(1)
+
+
+def main():
+    args = parse_args()
+
+    try:
+        owner, repo, pr_num = parse_pr_reference(args.pr_ref)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        output_json({"error": str(e)})
+        return 1
+
+    result = submit(owner, repo, pr_num, args.summary, args.replace, args.window)
+    output_json(result)
+    if result.get("error"):
+        print(f"Error: {result['error']}", file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Generate a realistic synthetic pull request, for benchmarks that can't touch GitHub.
+
+Usage (JSON via stdin):
+    synthetic_pr.py <<'EOF'
+    {"comments": 1000, "seed": 1}
+    EOF
+
+JSON input fields (all optional):
+    comments: Total comments across review threads, reviews and issue comments (default: 100)
+    seed: RNG seed; the same seed and size always give the same PR (default: 1)
+    owner, repo, number: Where the PR claims to live (default: acme/widgets#1)
+
+The PR looks like the ones fixing-prs deals with: human and bot reviewers,
+review threads from one comment to well past the 100-comment GraphQL page,
+agent replies (`[🤖 Author - Claude]: ...`) with and without follow-ups,
+resolved, outdated and minimized comments, bot walkthroughs with nested
+<details> blocks, housekeeping bots (vercel, codecov, linear), and
+marker-based replies to reviews and issue comments. Roughly 80% of the
+comments land in review threads, 15% are issue comments, 5% are reviews.
+
+fake_github.py serves this state; bench scripts also use it directly.
+
+Outputs JSON to stdout: the PR state (see synthetic_pr()).
+"""
+
+import hashlib
+import json
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+
+HUMANS = ("alice", "bob", "carol", "dmitri", "erin")
+REVIEW_BOTS = ("coderabbitai", "copilot-pull-request-reviewer")
+NOISE_BOTS = ("vercel", "codecov", "linear")
+AGENT = "tjmgregory"
+FILES = (
+    "src/api/client.ts", "src/api/retry.ts", "src/worker/queue.py", "src/worker/handlers.py",
+    "src/ui/Table.tsx", "src/ui/Form.tsx", "tests/test_queue.py", "tests/client.test.ts",
+    "docs/architecture.md", "infra/terraform/main.tf",
+)
+REMARKS = (
+    "This will throw if `payload` is undefined — can we guard it?",
+    "nit: prefer `const` here.",
+    "Should this retry on 429 as well as 5xx?",
+    "The lock is released before the write completes; is that intentional?",
+    "Can we add a test for the empty-list case?",
+    "This duplicates the helper in `utils/time.ts`.",
+    "Naming: `data2` doesn't say much. Maybe `pendingJobs`?",
+    "Why not use the existing `withTimeout` wrapper?",
+    "This query runs once per row; could we batch it?",
+    "LGTM once the typo in the docstring is fixed.",
+)
+FOLLOW_UPS = (
+    "Thanks — but the same issue exists in the sibling function below.",
+    "Not quite: this still fails when the list is empty.",
+    "Makes sense, resolving.",
+    "Could you also update the docs for this?",
+)
+AGENT_REPLIES = (
+    "Fixed in {sha} — added a guard and a regression test.",
+    "Good catch. Switched to the shared helper in {sha}.",
+    "Intentional: the write is idempotent, so releasing early is safe. Added a comment in {sha}.",
+    "Won't fix here — tracked separately so this PR stays focused.",
+)
+MINIMIZED_REASONS = ("OUTDATED", "RESOLVED", "DUPLICATE", "OFF_TOPIC")
+START = datetime(2026, 1, 5, 9, 0, tzinfo=timezone.utc)
+
+
+def output_json(data: dict) -> None:
+    """Output structured JSON to stdout."""
+    print(json.dumps(data))
+
+
+def sha(rng: random.Random) -> str:
+    return "%07x" % rng.getrandbits(28)
+
+
+def walkthrough(rng: random.Random, files: int) -> str:
+    """A review-bot summary: nested <details>, a changes table, hidden markers."""
+    rows = "\n".join(
+        f"| `{rng.choice(FILES)}` | {rng.choice(REMARKS)} |" for _ in range(files)
+    )
+    tips = "\n".join(f"- {rng.choice(REMARKS)}" for _ in range(rng.randint(3, 8)))
+    return (
+        "<!-- This is an auto-generated comment: summarize by coderabbit.ai -->\n"
+        "<details>\n<summary>📝 Walkthrough</summary>\n\n"
+        "## Walkthrough\n\nThe change reworks the retry path and the job queue.\n\n"
+        "<details>\n<summary>Changes</summary>\n\n"
+        f"| File | Summary |\n|---|---|\n{rows}\n\n</details>\n\n"
+        "<details>\n<summary>Sequence Diagram(s)</summary>\n\n"
+        "```mermaid\nsequenceDiagram\n    Client->>API: request\n    API-->>Client: 429\n```\n\n"
+        "</details>\n\n</details>\n\n"
+        f"<details>\n<summary>🪧 Tips</summary>\n\n{tips}\n\n</details>\n"
+        "<!-- end of auto-generated comment: summarize by coderabbit.ai -->"
+    )
+
+
+def bot_remark(rng: random.Random) -> str:
+    return (
+        f"_⚠️ Potential issue_\n\n**{rng.choice(REMARKS)}**\n\n"
+        "<details>\n<summary>🤖 Prompt for AI Agents</summary>\n\n"
+        f"In {rng.choice(FILES)} around line {rng.randint(1, 400)}, {rng.choice(REMARKS)}\n\n"
+        "</details>\n\n<!-- fingerprinting:phantom:medusa:falcon -->"
+    )
+
+
+def noise(rng: random.Random, bot: str) -> str:
+    if bot == "vercel":
+        return "[vc]: #deploy-preview\n**The latest updates on your projects.**\n\n| Name | Status |\n|---|---|\n| web | ✅ Ready |"
+    if bot == "codecov":
+        return f"## Codecov Report\nAll modified lines are covered by tests ✅\n\nProject coverage is {rng.uniform(70, 95):.2f}%."
+    return "<p><a href=\"https://linear.app/acme/issue/ENG-123\">ENG-123</a></p>"
+
+
+def synthetic_pr(comments: int = 100, seed: int = 1, owner: str = "acme", repo: str = "widgets",
+                 number: int = 1) -> dict:
+    """A PR with `comments` comments in total. Every comment and review has a
+    unique databaseId; threads have GraphQL-style node ids.
+
+    Returns {"owner", "repo", "number", "title", "body", "author", "state",
+    "isDraft", "headRefName", "baseRefName", "headRefOid", "updated_at",
+    "additions", "deletions", "changedFiles", "files",
+    "threads": [{"id", "isResolved", "isOutdated", "path", "line",
+                 "originalLine", "comments": [...]}],
+    "reviews": [{"databaseId", "author", "body", "state", "createdAt"}],
+    "issue_comments": [{"databaseId", "author", "body", "createdAt"}]}
+    where a comment is {"databaseId", "author", "body", "createdAt",
+    "isMinimized", "minimizedReason", "review"}."""
+    rng = random.Random(seed)
+    clock = [START]
+    next_id = [1000]
+
+    def tick() -> str:
+        clock[0] += timedelta(seconds=rng.randint(5, 900))
+        return clock[0].strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    def new_id() -> int:
+        next_id[0] += rng.randint(1, 50)
+        return next_id[0]
+
+    n_reviews = max(1, comments // 20)
+    n_issue = max(1, comments * 15 // 100)
+    n_review_comments = max(1, comments - n_reviews - n_issue)
+
+    reviews = []
+    for _ in range(n_reviews):
+        author = rng.choice(HUMANS + REVIEW_BOTS)
+        if author == "coderabbitai":
+            body = f"**Actionable comments posted: {rng.randint(1, 9)}**\n\n" + walkthrough(rng, rng.randint(2, 6))
+        else:
+            body = rng.choice(("", "", rng.choice(REMARKS)))
+        reviews.append({
+            "databaseId": new_id(), "author": {"login": author}, "body": body,
+            "state": rng.choice(("COMMENTED", "COMMENTED", "CHANGES_REQUESTED", "APPROVED")),
+            "createdAt": tick(),
+        })
+
+    threads = []
+    remaining = n_review_comments
+    while remaining > 0:
+        # Mostly short threads; now and then one long enough to need a
+        # second GraphQL page of comments.
+        size = 1 + min(int(rng.expovariate(0.6)), 8)
+        if rng.random() < 0.01:
+            size = rng.randint(101, 160)
+        size = min(size, remaining)
+        remaining -= size
+        review = rng.choice(reviews)
+        reviewer = review["author"]["login"]
+        thread_comments = []
+        for i in range(size):
+            if i == 0:
+                author = reviewer
+                body = bot_remark(rng) if reviewer in REVIEW_BOTS else rng.choice(REMARKS)
+            elif i % 2 == 1 and rng.random() < 0.7:
+                author = AGENT
+                body = "[🤖 Author - Claude]: " + rng.choice(AGENT_REPLIES).format(sha=sha(rng))
+            else:
+                author = rng.choice(HUMANS)
+                body = rng.choice(FOLLOW_UPS)
+            minimized = rng.random() < 0.03
+            thread_comments.append({
+                "databaseId": new_id(), "author": {"login": author}, "body": body,
+                "createdAt": tick(), "isMinimized": minimized,
+                "minimizedReason": rng.choice(MINIMIZED_REASONS) if minimized else None,
+                "review": review["databaseId"] if i == 0 else None,
+            })
+        line = rng.randint(1, 400)
+        outdated = rng.random() < 0.2
+        threads.append({
+            "id": "PRRT_" + hashlib.sha1(str(thread_comments[0]["databaseId"]).encode()).hexdigest()[:16],
+            "isResolved": rng.random() < 0.3, "isOutdated": outdated,
+            "path": rng.choice(FILES), "line": None if outdated else line, "originalLine": line,
+            "comments": thread_comments,
+        })
+
+    issue_comments = []
+    targets = []
+    for _ in range(n_issue):
+        roll = rng.random()
+        if roll < 0.15:
+            bot = rng.choice(NOISE_BOTS)
+            comment = {"author": {"login": bot}, "body": noise(rng, bot)}
+        elif roll < 0.25:
+            comment = {"author": {"login": "coderabbitai"}, "body": walkthrough(rng, rng.randint(3, 12))}
+        elif roll < 0.55 and targets:
+            kind, target = rng.choice(targets)
+            comment = {
+                "author": {"login": AGENT},
+                "body": (f"<!-- reply-to: {kind}:{target} -->\n\n> {rng.choice(REMARKS)}\n\n"
+                         "[🤖 Author - Claude]: " + rng.choice(AGENT_REPLIES).format(sha=sha(rng))),
+            }
+        else:
+            comment = {"author": {"login": rng.choice(HUMANS)}, "body": rng.choice(REMARKS + FOLLOW_UPS)}
+        comment["databaseId"] = new_id()
+        comment["createdAt"] = tick()
+        issue_comments.append(comment)
+        if comment["author"]["login"] in HUMANS:
+            targets.append(("issue_comment", comment["databaseId"]))
+        if not targets or rng.random() < 0.1:
+            targets.append(("review", rng.choice(reviews)["databaseId"]))
+
+    return {
+        "owner": owner, "repo": repo, "number": number,
+        "title": "Rework retry path and job queue", "body": "## Summary\n\nReworks retries.\n",
+        "author": {"login": AGENT}, "state": "OPEN", "isDraft": False,
+        "headRefName": "feature/retries", "baseRefName": "main",
+        "headRefOid": hashlib.sha1(f"{seed}:{comments}".encode()).hexdigest(),
+        "updated_at": tick(),
+        "additions": 40 * len(FILES), "deletions": 12 * len(FILES), "changedFiles": len(FILES),
+        "files": list(FILES),
+        "threads": threads, "reviews": reviews, "issue_comments": issue_comments,
+    }
+
+
+def main() -> int:
+    text = "" if sys.stdin.isatty() else sys.stdin.read().strip()
+    try:
+        data = json.loads(text) if text else {}
+    except json.JSONDecodeError as e:
+        print(f"Error: Invalid JSON input: {e}", file=sys.stderr)
+        output_json({"error": f"Invalid JSON input: {e}"})
+        return 1
+    output_json(synthetic_pr(
+        int(data.get("comments", 100)), int(data.get("seed", 1)),
+        data.get("owner", "acme"), data.get("repo", "widgets"), int(data.get("number", 1)),
+    ))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,21 +1,47 @@
 #!/usr/bin/env python3
 """
-Append a "Comments Addressed" section to a PR description.
+Append a "Comments Addressed" section to a PR description, or patch any set
+of markdown sections in one write.
 
 Usage (JSON via stdin):
     update_pr_description.py <<'EOF'
     {"pr": "123", "summary": "- Fixed null check\n- Added error handling"}
     EOF
 
+    # Several sections in one write
+    update_pr_description.py <<'EOF'
+    {"pr": "123", "sections": [
+        {"heading": "Comments Addressed", "content": "- Fixed null check"},
+        {"heading": "Testing", "content": "- Added unit tests", "mode": "replace"}
+    ]}
+    EOF
+
 JSON input fields:
     pr/pr_ref: PR number or URL (required)
-    summary: Summary of changes made (required)
-    replace: Boolean, replace existing section instead of appending
-
-The script safely appends to existing PR body without overwriting.
+    summary: Summary of changes made (shorthand for one "Comments Addressed" section)
+    replace: Boolean, replace existing section instead of appending (with summary)
+    sections: Array of {"heading", "content", "mode": "append|replace"} (instead of summary;
+              mode defaults to append)
+
+The body is parsed once into a section tree (ATX headings; `---` rules also
+end a section, matching how this script has always delimited its own
+sections). Each update appends to or replaces its section's content, or
+creates the section at the end of the body, and all updates land in a
+single edit. Several updates to the same missing heading create it once.
+Existing text outside the targeted sections is never touched.
+
+A run is one GET and one PATCH. Concurrent writers are handled
+best-effort: GitHub's PATCH takes no If-Match, so an edit landing between
+the read and the write is overwritten. Only when the read is more than
+RECHECK_AFTER seconds old by the time the body is patched is the PR's
+`updated_at` (plus its ETag) checked by a conditional GET first — free
+against the rate limit when nothing changed — and on a concurrent edit the
+updates are re-applied onto the body that came back with it. A fresh read
+leaves no wider window than that check would.
 
 Outputs JSON to stdout:
-    Success: {"status": "ok", "action": "created|appended|replaced", "pr_number": 123}
+    Success: {"status": "ok", "action": "created|appended|replaced|unchanged", "pr_number": 123,
+              "sections": [{"heading": "...", "action": "..."}], "attempts": 1}
     Error:   {"error": "message"}
 
 Exit codes:
@@ -24,60 +50,210 @@ Exit codes:
     2 - GitHub API error
 """
 
-import subprocess
 import sys
 import re
 import json
+import time
 
+import gh_trace
+import pr_daemon_client
+from pr_core import lazy_import, parse_pr_reference
 
-def output_json(data: dict) -> None:
-    """Output structured JSON to stdout."""
-    print(json.dumps(data))
-
+# Imported on first use: a request handed to pr_daemon.py never needs it.
+subprocess = lazy_import("subprocess")
 
-def parse_pr_reference(pr_ref: str) -> tuple[str, str, str]:
-    """Parse PR reference to extract owner, repo, and PR number."""
-    url_match = re.match(r'https?://github\.com/([^/]+)/([^/]+)/pull/(\d+)', pr_ref)
-    if url_match:
-        return url_match.group(1), url_match.group(2), url_match.group(3)
+gh_trace.install()
 
-    if not pr_ref.isdigit():
-        raise ValueError(f"Invalid PR reference: {pr_ref}")
+DEFAULT_HEADING = "Comments Addressed"
+# Each conflicting edit costs one conditional GET and a re-merge; more than a
+# few in a row means something is rewriting the body in a loop.
+MAX_ATTEMPTS = 5
+# A read older than this (seconds) is re-checked before the write; a fresher
+# one is as current as the check would be, so it's written straight away.
+RECHECK_AFTER = 1.0
+UPDATE_MODES = ("append", "replace")
 
-    try:
-        result = subprocess.run(
-            ['git', 'remote', 'get-url', 'origin'],
-            capture_output=True, text=True, check=True
-        )
-        remote_url = result.stdout.strip()
-    except subprocess.CalledProcessError:
-        raise ValueError("Not in a git repository and no full PR URL provided")
+# A closing `#` sequence is only stripped after whitespace, so `## C#` is "C#".
+HEADING_RE = re.compile(r'^(#{1,6})[ \t]+(.+?)(?:[ \t]+#+)?[ \t]*$')
+RULE_RE = re.compile(r'^ {0,3}(?:-[ \t]*){3,}$')
+FENCE_RE = re.compile(r'^ {0,3}(`{3,}|~{3,})')
 
-    remote_match = re.search(r'github\.com[:/]([^/]+)/(.+?)(?:\.git)?$', remote_url)
-    if not remote_match:
-        raise ValueError(f"Could not parse GitHub owner/repo from remote: {remote_url}")
 
-    return remote_match.group(1), remote_match.group(2), pr_ref
+def output_json(data: dict) -> None:
+    """Output structured JSON to stdout."""
+    print(json.dumps(data))
 
 
-def get_pr_body(owner: str, repo: str, pr_num: str) -> str:
-    """Fetch current PR body."""
-    cmd = ['gh', 'pr', 'view', pr_num, '--repo', f'{owner}/{repo}', '--json', 'body', '-q', '.body']
+def split_http_response(raw: str) -> tuple[int, dict, str]:
+    """Split `gh api --include` output into (status, headers, body)."""
+    head, _, body = raw.replace('\r\n', '\n').partition('\n\n')
+    lines = head.split('\n')
+    status_match = re.match(r'HTTP/[\d.]+ (\d{3})', lines[0])
+    status = int(status_match.group(1)) if status_match else 0
+    headers = {}
+    for line in lines[1:]:
+        key, _, value = line.partition(':')
+        headers[key.strip().lower()] = value.strip()
+    return status, headers, body
+
+
+def get_pr(owner: str, repo: str, pr_num: str, etag: str | None = None) -> dict | None:
+    """Fetch body, updated_at and ETag in one call. With `etag`, the request is
+    conditional and returns None when the PR is unchanged (HTTP 304)."""
+    cmd = ['gh', 'api', '--include', f'repos/{owner}/{repo}/pulls/{pr_num}']
+    if etag:
+        cmd += ['-H', f'If-None-Match: {etag}']
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    status, headers, body = split_http_response(result.stdout)
+    if status == 304:
+        return None
+    if result.returncode != 0 or status != 200:
+        raise RuntimeError(f"Failed to fetch PR body: {result.stderr.strip() or body.strip()}")
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        return result.stdout.strip()
-    except subprocess.CalledProcessError as e:
-        raise RuntimeError(f"Failed to fetch PR body: {e.stderr}")
-
-
-def update_pr_body(owner: str, repo: str, pr_num: str, new_body: str) -> None:
-    """Update PR body."""
-    cmd = ['gh', 'pr', 'edit', pr_num, '--repo', f'{owner}/{repo}', '--body', new_body]
+        pr = json.loads(body)
+    except json.JSONDecodeError as e:
+        raise RuntimeError(f"Failed to fetch PR body: malformed response ({e})") from None
+    return {
+        "body": pr.get("body") or "",
+        "updated_at": pr.get("updated_at"),
+        "etag": headers.get("etag"),
+        "read_at": time.monotonic(),
+    }
+
+
+def update_pr_body(owner: str, repo: str, pr_num: str, new_body: str) -> dict:
+    """Update PR body; returns the updated PR."""
+    cmd = ['gh', 'api', '-X', 'PATCH', f'repos/{owner}/{repo}/pulls/{pr_num}', '--input', '-']
     try:
-        subprocess.run(cmd, capture_output=True, text=True, check=True)
-        print(f"PR description updated.", file=sys.stderr)
+        result = subprocess.run(
+            cmd, input=json.dumps({"body": new_body}),
+            capture_output=True, text=True, check=True
+        )
+        print("PR description updated.", file=sys.stderr)
+        return json.loads(result.stdout) if result.stdout else {}
     except subprocess.CalledProcessError as e:
         raise RuntimeError(f"Failed to update PR body: {e.stderr}")
+    except json.JSONDecodeError as e:
+        raise RuntimeError(f"PR body updated, but the response was malformed ({e})") from None
+
+
+def parse_sections(lines: list[str]) -> list[dict]:
+    """One pass over the body: every heading becomes a section spanning
+    [start, end) lines, where end is the next heading at the same or a higher
+    level, a `---` rule, or the end of the body. Headings inside fenced code
+    blocks are ignored. Deeper headings nest inside (their lines fall within
+    the parent's span)."""
+    sections: list[dict] = []
+    open_stack: list[dict] = []
+    fence = None
+
+    def close(predicate, at: int) -> None:
+        while open_stack and predicate(open_stack[-1]):
+            open_stack.pop()["end"] = at
+
+    for i, line in enumerate(lines):
+        fence_match = FENCE_RE.match(line)
+        if fence:
+            if fence_match and fence_match.group(1)[0] == fence[0] and len(fence_match.group(1)) >= len(fence):
+                fence = None
+            continue
+        if fence_match:
+            fence = fence_match.group(1)
+            continue
+        if RULE_RE.match(line):
+            close(lambda s: True, i)
+            continue
+        m = HEADING_RE.match(line)
+        if m:
+            level = len(m.group(1))
+            close(lambda s: s["level"] >= level, i)
+            section = {"title": m.group(2).strip(), "level": level, "start": i, "end": len(lines)}
+            sections.append(section)
+            open_stack.append(section)
+    close(lambda s: True, len(lines))
+    return sections
+
+
+def content_end(lines: list[str], section: dict) -> int:
+    """Index just past the section's last non-blank line."""
+    end = section["end"]
+    while end > section["start"] + 1 and not lines[end - 1].strip():
+        end -= 1
+    return end
+
+
+def patch_body(body: str, updates: list[dict]) -> tuple[str, list[str]]:
+    """Apply every update to a single parse of `body`. Returns the new body
+    and the per-update action (created, appended or replaced)."""
+    lines = body.split('\n') if body else []
+    by_title: dict[str, dict] = {}
+    for section in parse_sections(lines):
+        by_title.setdefault(section["title"].lower(), section)
+
+    edits: list[tuple[int, int, list[str]]] = []
+    # Sections created by this call, by lowercased heading, so a later update
+    # to the same heading lands in them instead of creating it again.
+    creates: dict[str, dict] = {}
+    actions: list[str] = []
+    for update in updates:
+        content = update["content"].split('\n')
+        section = by_title.get(update["heading"].lower())
+        created = creates.get(update["heading"].lower())
+        if created is not None:
+            if update.get("mode") == "replace":
+                created["content"] = update["content"]
+                actions.append("replaced")
+            else:
+                created["content"] += '\n' + update["content"]
+                actions.append("appended")
+        elif section is None:
+            creates[update["heading"].lower()] = {
+                "heading": update["heading"], "level": update.get("level", 2), "content": update["content"]}
+            actions.append("created")
+        elif update.get("mode") == "replace":
+            trailing = lines[content_end(lines, section):section["end"]]
+            edits.append((section["start"] + 1, section["end"], content + trailing))
+            actions.append("replaced")
+        else:
+            end = content_end(lines, section)
+            edits.append((end, end, content))
+            actions.append("appended")
+
+    # Splice bottom-up so earlier indices stay valid; at the same index the
+    # later update goes in first so input order is preserved.
+    order = sorted(range(len(edits)), key=lambda i: (edits[i][0], i), reverse=True)
+    for i in order:
+        start, end, replacement = edits[i]
+        lines[start:end] = replacement
+    new_body = '\n'.join(lines)
+    if creates:
+        blocks = [f"---\n{'#' * c['level']} {c['heading']}\n{c['content']}" for c in creates.values()]
+        new_body = '\n\n'.join([new_body.rstrip('\n')] + blocks) if new_body.strip() else '\n\n'.join(blocks)
+    return new_body, actions
+
+
+def apply_updates(owner: str, repo: str, pr_num: str,
+                  updates: list[dict]) -> tuple[list[str], int]:
+    """Read, patch and write the body; a read older than RECHECK_AFTER is
+    re-checked first, re-merging an edit that check sees (best-effort: one
+    landing after it is lost). Returns (per-update actions, attempts used)."""
+    pr = get_pr(owner, repo, pr_num)
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        new_body, actions = patch_body(pr["body"], updates)
+        if new_body == pr["body"]:
+            return ["unchanged"] * len(actions), attempt
+        if time.monotonic() - pr["read_at"] <= RECHECK_AFTER:
+            update_pr_body(owner, repo, pr_num, new_body)
+            return actions, attempt
+        # Precondition: nobody edited the PR since we read it
+        latest = get_pr(owner, repo, pr_num, etag=pr["etag"])
+        if latest is not None and latest["updated_at"] != pr["updated_at"]:
+            print(f"PR edited concurrently; re-merging (attempt {attempt})...", file=sys.stderr)
+            pr = latest
+            continue
+        update_pr_body(owner, repo, pr_num, new_body)
+        return actions, attempt
+    raise RuntimeError(f"PR body kept changing; gave up after {MAX_ATTEMPTS} attempts")
 
 
 def parse_args():
@@ -94,15 +270,28 @@ def parse_args():
         data = json.load(sys.stdin)
         pr_ref = data.get("pr") or data.get("pr_ref")
         summary = data.get("summary")
+        sections = data.get("sections")
 
         # Validate required fields
         if not pr_ref:
             print("Error: Missing required field 'pr' or 'pr_ref'", file=sys.stderr)
             output_json({"error": "Missing required field 'pr' or 'pr_ref'"})
             sys.exit(1)
-        if not summary:
-            print("Error: Missing required field 'summary'", file=sys.stderr)
-            output_json({"error": "Missing required field 'summary'"})
+        if not summary and not sections:
+            print("Error: Missing required field 'summary' or 'sections'", file=sys.stderr)
+            output_json({"error": "Missing required field 'summary' or 'sections'"})
+            sys.exit(1)
+        if sections and not all(
+            isinstance(s, dict) and s.get("heading") and isinstance(s.get("content"), str)
+            for s in sections
+        ):
+            print("Error: Each section needs 'heading' and 'content'", file=sys.stderr)
+            output_json({"error": "Each section needs 'heading' and 'content'"})
+            sys.exit(1)
+        bad_modes = [s["mode"] for s in sections or [] if s.get("mode", "append") not in UPDATE_MODES]
+        if bad_modes:
+            print(f"Error: Invalid section mode {bad_modes[0]!r}", file=sys.stderr)
+            output_json({"error": f"Invalid section mode {bad_modes[0]!r}; use 'append' or 'replace'"})
             sys.exit(1)
 
         # Create a namespace object for consistency
@@ -110,8 +299,15 @@ def parse_args():
             pass
         args = Args()
         args.pr_ref = pr_ref
-        args.summary = summary
-        args.replace = data.get("replace", False)
+        if sections:
+            args.updates = sections
+        else:
+            # Convert literal \n to newlines
+            args.updates = [{
+                "heading": DEFAULT_HEADING,
+                "content": summary.replace('\\n', '\n'),
+                "mode": "replace" if data.get("replace", False) else "append",
+            }]
         return args
     except json.JSONDecodeError as e:
         print(f"Error: Invalid JSON input: {e}", file=sys.stderr)
@@ -129,52 +325,24 @@ def main():
         output_json({"error": str(e)})
         return 1
 
-    # Fetch current body
     try:
-        current_body = get_pr_body(owner, repo, pr_num)
+        actions, attempts = apply_updates(owner, repo, pr_num, args.updates)
     except RuntimeError as e:
         print(f"Error: {e}", file=sys.stderr)
         output_json({"error": str(e)})
         return 2
 
-    # Process summary (convert literal \n to newlines)
-    summary = args.summary.replace('\\n', '\n')
-
-    # Build the new section
-    section_header = "## Comments Addressed"
-    new_section = f"\n\n---\n{section_header}\n{summary}"
-
-    # Check if section already exists
-    section_existed = section_header in current_body
-    if section_existed:
-        if args.replace:
-            # Replace existing section (everything from header to next --- or end)
-            pattern = rf'\n*---\n{re.escape(section_header)}.*?(?=\n---|\Z)'
-            new_body = re.sub(pattern, new_section, current_body, flags=re.DOTALL)
-        else:
-            # Append to existing section
-            pattern = rf'({re.escape(section_header)}.*?)(?=\n---|\Z)'
-            match = re.search(pattern, current_body, flags=re.DOTALL)
-            if match:
-                existing = match.group(1)
-                updated = f"{existing}\n{summary}"
-                new_body = current_body.replace(existing, updated)
-            else:
-                new_body = current_body + new_section
-    else:
-        new_body = current_body + new_section
-
-    # Update the PR
-    try:
-        update_pr_body(owner, repo, pr_num, new_body)
-        action = "replaced" if (section_existed and args.replace) else "appended" if section_existed else "created"
-        output_json({"status": "ok", "action": action, "pr_number": int(pr_num)})
-        return 0
-    except RuntimeError as e:
-        print(f"Error: {e}", file=sys.stderr)
-        output_json({"error": str(e)})
-        return 2
+    output_json({
+        "status": "ok",
+        "action": actions[0],
+        "pr_number": int(pr_num),
+        "sections": [
+            {"heading": u["heading"], "action": a} for u, a in zip(args.updates, actions)
+        ],
+        "attempts": attempts,
+    })
+    return 0
 
 
 if __name__ == '__main__':
-    sys.exit(main())
+    sys.exit(pr_daemon_client.run(__file__, main, reads_stdin=True))
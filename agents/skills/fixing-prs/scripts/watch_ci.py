@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Watch a PR's CI checks until all complete, fetching failed job logs as soon
+as each job fails.
+
+Usage:
+    watch_ci.py <pr_url_or_number> [--timeout SECONDS] [--no-logs] [--log-dir DIR] [--shared]
+
+One GraphQL request per poll reads the head commit's whole check rollup
+(Actions check runs and legacy commit statuses). The poll interval follows
+the estimated time left: each check's typical duration is remembered across
+runs, and the next poll is timed for when the next pending check should
+finish — so a 10-minute pipeline isn't polled every 15 seconds for its first
+9 minutes. Checks with no history (or running past their usual time) fall
+back to a gradually lengthening interval.
+
+The moment any Actions job fails, its log starts downloading in the
+background while the rest of the pipeline keeps running. By the time the
+last check finishes, the failed logs are usually already on disk.
+
+With --shared, the PR is handed to the shared hub (ci_hub.py) instead of
+polled from this process: when several agents watch CI at once, one process
+polls all their PRs in a single query per tick. Output and exit codes are
+the same either way.
+
+Outputs JSON to stdout (same shape as watch_ci.sh always had, plus logs):
+    {
+      "conclusion": "success|failure|pending",
+      "checks": [{"name": "...", "conclusion": "..."}],
+      "failed_runs": [123, 456],
+      "failed_logs": [{"name": "...", "run_id": 123, "job_id": 789, "path": "/tmp/..."}]
+    }
+
+Exit codes: 0=all passed, 1=some failed, 2=timed out, 3=error
+"""
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import gh_trace
+from pr_core import lazy_import, parse_pr_reference
+
+# Imported on first use: probe_merge_state.py and ci_hub.py only need the
+# check queries from here.
+argparse = lazy_import("argparse")
+calendar = lazy_import("calendar")
+concurrent_futures = lazy_import("concurrent.futures")
+fcntl = lazy_import("fcntl")
+subprocess = lazy_import("subprocess")
+tempfile = lazy_import("tempfile")
+
+gh_trace.install()
+
+# Matches the old `gh pr checks --watch --interval 15` when there's nothing
+# better to go on.
+DEFAULT_INTERVAL = 15
+MIN_INTERVAL = 5
+MAX_INTERVAL = 60
+# Checks past their usual duration: lengthen the interval by this factor
+# per poll so a stuck job doesn't burn API calls.
+BACKOFF = 1.5
+# Right after a push, checks can take a while to register at all.
+NO_CHECKS_GRACE = 90
+DEFAULT_TIMEOUT = 3600
+LOG_WORKERS = 4
+# Weight of the newest observation in each check's running-average duration.
+DURATION_ALPHA = 0.3
+# gh api retries: transient 5xx / network blips shouldn't end a long watch.
+API_RETRIES = 3
+
+PASSING = {"success", "skipped", "neutral"}
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "fixing-prs"
+DURATIONS_PATH = CACHE_DIR / "ci-durations.json"
+DURATIONS_LOCK = CACHE_DIR / "ci-durations.lock"
+
+# Selection shared with the batched multi-PR query in ci_hub.py.
+CONTEXT_FIELDS = """
+  __typename
+  ... on CheckRun {
+    databaseId name status conclusion startedAt completedAt
+    checkSuite { workflowRun { databaseId } }
+  }
+  ... on StatusContext {
+    context state createdAt
+  }
+"""
+
+ROLLUP_QUERY = """
+query($owner: String!, $repo: String!, $num: Int!, $cursor: String) {
+  repository(owner: $owner, name: $repo) {
+    pullRequest(number: $num) {
+      headRefOid
+      commits(last: 1) {
+        nodes {
+          commit {
+            statusCheckRollup {
+              contexts(first: 100, after: $cursor) {
+                pageInfo { hasNextPage endCursor }
+                nodes { %s }
+              }
+            }
+          }
+        }
+      }
+    }
+  }
+}
+""" % CONTEXT_FIELDS
+
+
+def graphql(query: str, variables: dict, partial: bool = False) -> dict:
+    """Run a query with retries. With `partial`, data that came back alongside
+    errors (e.g. one missing PR in a batched query) is returned as-is."""
+    cmd = ["gh", "api", "graphql", "-f", f"query={query}"]
+    for key, value in variables.items():
+        if isinstance(value, int):
+            cmd += ["-F", f"{key}={value}"]
+        else:
+            cmd += ["-f", f"{key}={value}"]
+    error = ""
+    for attempt in range(API_RETRIES):
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        if result.returncode == 0:
+            data = json.loads(result.stdout)
+            if not data.get("errors") or (partial and data.get("data")):
+                return data["data"]
+            error = json.dumps(data["errors"])
+        else:
+            error = result.stderr.strip()
+        time.sleep(2 ** attempt)
+    raise RuntimeError(f"GitHub API error: {error}")
+
+
+def iso_seconds(stamp: str | None) -> float | None:
+    if not stamp:
+        return None
+    return calendar.timegm(time.strptime(stamp, "%Y-%m-%dT%H:%M:%SZ"))
+
+
+def parse_rollup(pr: dict) -> tuple[list[dict], dict | None]:
+    """Normalise one page of a pullRequest's rollup into
+    {name, conclusion, done, run_id, job_id, started, finished}; also
+    returns the page info (None when there is no rollup yet)."""
+    commits = pr["commits"]["nodes"]
+    rollup = commits[0]["commit"]["statusCheckRollup"] if commits else None
+    if not rollup:
+        return [], None
+    checks = []
+    for node in rollup["contexts"]["nodes"]:
+        if node["__typename"] == "CheckRun":
+            done = node["status"] == "COMPLETED"
+            run = (node.get("checkSuite") or {}).get("workflowRun") or {}
+            checks.append({
+                "name": node["name"],
+                "conclusion": (node["conclusion"] or "").lower() or None,
+                "done": done,
+                "run_id": run.get("databaseId"),
+                "job_id": node["databaseId"],
+                "started": iso_seconds(node["startedAt"]),
+                "finished": iso_seconds(node["completedAt"]),
+            })
+        else:
+            state = node["state"].lower()
+            done = state not in ("pending", "expected")
+            checks.append({
+                "name": node["context"],
+                "conclusion": state if done else None,
+                "done": done,
+                "run_id": None,
+                "job_id": None,
+                "started": iso_seconds(node["createdAt"]),
+                "finished": None,
+            })
+    return checks, rollup["contexts"]["pageInfo"]
+
+
+def fetch_checks(owner: str, repo: str, num: int, cursor: str = "") -> list[dict]:
+    """Every check in the rollup (from `cursor` on, when resuming a page)."""
+    checks: list[dict] = []
+    while True:
+        pr = graphql(ROLLUP_QUERY, {
+            "owner": owner, "repo": repo, "num": num, "cursor": cursor,
+        })["repository"]["pullRequest"]
+        page, info = parse_rollup(pr)
+        checks += page
+        if info is None or not info["hasNextPage"]:
+            return checks
+        cursor = info["endCursor"]
+
+
+def is_failed(check: dict) -> bool:
+    return check["done"] and check["conclusion"] is not None and check["conclusion"] not in PASSING
+
+
+def load_durations() -> dict:
+    try:
+        return json.loads(DURATIONS_PATH.read_text())
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def save_durations(durations: dict, owner: str, repo: str, checks: list[dict]) -> None:
+    """Fold this run's completed check durations into the running averages.
+
+    Other watchers save too, so the fold is applied to the file as it is now,
+    under a lock, and `durations` is refreshed from the merged result."""
+    took = {
+        f"{owner}/{repo}:{check['name']}": check["finished"] - check["started"]
+        for check in checks if check["done"] and check["started"] and check["finished"]
+    }
+    if not took:
+        return
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(DURATIONS_LOCK, "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            merged = load_durations()
+            for key, seconds in took.items():
+                prev = merged.get(key)
+                merged[key] = seconds if prev is None else prev + DURATION_ALPHA * (seconds - prev)
+            tmp = DURATIONS_PATH.with_name(f".{DURATIONS_PATH.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(merged))
+            tmp.replace(DURATIONS_PATH)
+    except OSError:
+        return
+    durations.clear()
+    durations.update(merged)
+
+
+def estimated_remaining(checks: list[dict], durations: dict, owner: str,
+                        repo: str) -> tuple[float, float] | None:
+    """(seconds until the next pending check should finish, seconds until the
+    last one should), or None when a pending check has no history or has
+    already overrun it."""
+    now = time.time()
+    lefts = []
+    for check in checks:
+        if check["done"]:
+            continue
+        expected = durations.get(f"{owner}/{repo}:{check['name']}")
+        if expected is None or not check["started"]:
+            return None
+        left = expected - (now - check["started"])
+        if left <= 0:
+            return None
+        lefts.append(left)
+    return (min(lefts), max(lefts)) if lefts else None
+
+
+def next_interval(estimate: tuple[float, float] | None, previous: float) -> float:
+    """Poll when the next check should finish, so a failure surfaces (and its
+    log download starts) promptly; with no estimate, back off from the default."""
+    if estimate is not None:
+        return min(MAX_INTERVAL, max(MIN_INTERVAL, estimate[0]))
+    return min(MAX_INTERVAL, max(DEFAULT_INTERVAL, previous * BACKOFF))
+
+
+def fetch_job_log(owner: str, repo: str, check: dict, log_dir: Path) -> dict:
+    """Stream one failed job's log to disk (never held in memory)."""
+    entry = {"name": check["name"], "run_id": check["run_id"], "job_id": check["job_id"]}
+    path = log_dir / f"{check['run_id']}-{check['job_id']}.log"
+    cmd = ["gh", "api", f"repos/{owner}/{repo}/actions/jobs/{check['job_id']}/logs"]
+    with open(path, "wb") as out:
+        result = subprocess.run(cmd, stdout=out, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        entry["error"] = result.stderr.decode(errors="replace").strip()
+    else:
+        entry["path"] = str(path)
+        print(f"Fetched log for failed job {check['name']} -> {path}", file=sys.stderr)
+    return entry
+
+
+def watch(owner: str, repo: str, num: int, timeout: float, fetch_logs: bool,
+          log_dir: Path) -> tuple[str, list[dict], list[dict]]:
+    """Poll until every check completes (or timeout). Returns
+    (conclusion, checks, failed_logs)."""
+    durations = load_durations()
+    start = time.time()
+    interval = DEFAULT_INTERVAL
+    submitted: set[int] = set()
+    futures = []
+    checks: list[dict] = []
+    conclusion = "pending"
+
+    with concurrent_futures.ThreadPoolExecutor(max_workers=LOG_WORKERS) as pool:
+        while True:
+            checks = fetch_checks(owner, repo, num)
+            for check in checks:
+                if fetch_logs and is_failed(check) and check["run_id"] and check["job_id"] not in submitted:
+                    submitted.add(check["job_id"])
+                    print(f"Job failed: {check['name']} — fetching log", file=sys.stderr)
+                    futures.append(pool.submit(fetch_job_log, owner, repo, check, log_dir))
+
+            pending = [c for c in checks if not c["done"]]
+            elapsed = time.time() - start
+            if checks and not pending:
+                conclusion = "failure" if any(is_failed(c) for c in checks) else "success"
+                break
+            if not checks and elapsed > NO_CHECKS_GRACE:
+                print("No checks reported for this PR.", file=sys.stderr)
+                conclusion = "success"
+                break
+            if elapsed > timeout:
+                print(f"Timed out after {int(elapsed)}s with {len(pending)} checks pending.",
+                      file=sys.stderr)
+                break
+
+            estimate = estimated_remaining(checks, durations, owner, repo)
+            interval = next_interval(estimate, interval)
+            done_count = len(checks) - len(pending)
+            eta = f", ~{int(estimate[1])}s left" if estimate is not None else ""
+            print(f"{done_count}/{len(checks)} checks complete{eta}; next poll in {int(interval)}s",
+                  file=sys.stderr)
+            time.sleep(min(interval, max(1, timeout - elapsed)))
+
+        failed_logs = [f.result() for f in futures]
+
+    save_durations(durations, owner, repo, checks)
+    return conclusion, checks, failed_logs
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("pr", help="PR number or URL")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help=f"give up after this many seconds (default {DEFAULT_TIMEOUT})")
+    parser.add_argument("--no-logs", action="store_true",
+                        help="don't download failed job logs")
+    parser.add_argument("--log-dir", help="where to write failed job logs (default: a temp dir)")
+    parser.add_argument("--shared", action="store_true",
+                        help="watch through the shared multi-PR hub (for parallel agents)")
+    try:
+        args = parser.parse_args()
+    except SystemExit as e:
+        # Usage errors are errors (3) here; argparse's own 2 means timed out.
+        return 3 if e.code else 0
+
+    try:
+        owner, repo, num = parse_pr_reference(args.pr)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        print(json.dumps({"error": str(e)}))
+        return 3
+    num = int(num)
+    log_dir = Path(args.log_dir) if args.log_dir else Path(tempfile.mkdtemp(prefix=f"ci-{num}-"))
+    log_dir.mkdir(parents=True, exist_ok=True)
+
+    print(f"Watching CI checks for PR {args.pr}...", file=sys.stderr)
+    if args.shared:
+        # Imported here: ci_hub builds on this module
+        from ci_hub import watch_shared
+        run = watch_shared
+    else:
+        run = watch
+    try:
+        conclusion, checks, failed_logs = run(
+            owner, repo, num, args.timeout, not args.no_logs, log_dir,
+        )
+    except RuntimeError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        print(json.dumps({"error": str(e)}))
+        return 3
+
+    failed_runs = sorted({c["run_id"] for c in checks if is_failed(c) and c["run_id"]})
+    print(json.dumps({
+        "conclusion": conclusion,
+        "checks": [{"name": c["name"], "conclusion": c["conclusion"]} for c in checks],
+        "failed_runs": failed_runs,
+        "failed_logs": failed_logs,
+    }, indent=2))
+    return {"success": 0, "failure": 1}.get(conclusion, 2)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
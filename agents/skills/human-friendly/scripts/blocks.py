@@ -0,0 +1,218 @@
+"""
+Block trees of human-friendly artifacts: stable ids and in-place patches.
+
+An artifact's blocks are the top-level elements inside <main> (headings,
+paragraphs, lists, tables, ...). write_artifact.py stamps each with a
+data-block id, keeping the id a block had in the previous version of the
+file, so a revision can be described as "these blocks changed, in this
+order". serve.py sends that description to open pages, which swap just
+those blocks instead of reloading.
+
+Everything here errs towards None, which means "reload the whole page":
+markup this parser can't split cleanly (text directly inside <main>, an
+unclosed element) is never patched.
+"""
+
+import difflib
+import re
+from html import unescape
+from html.parser import HTMLParser
+
+# Elements with no end tag; a block that is one of these ends with its start tag.
+VOID = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+BLOCK_ID_ATTR_RE = re.compile(r'\s+data-block\s*=\s*("[^"]*"|\'[^\']*\'|[^\s>]+)')
+TITLE_RE = re.compile(r"(<title>)(.*?)(</title>)", re.S | re.I)
+START_TAG_RE = re.compile(r"<[A-Za-z][\w-]*")
+
+
+class Block:
+    __slots__ = ("tag", "id", "html")
+
+    def __init__(self, tag: str, id: str | None, html: str):
+        self.tag = tag
+        self.id = id
+        self.html = html
+
+    def content(self) -> str:
+        """The block's markup without its id, for comparing versions."""
+        return BLOCK_ID_ATTR_RE.sub("", self.html, count=1)
+
+    def with_id(self, id: str) -> str:
+        tag = START_TAG_RE.match(self.content()).group()
+        return f'{tag} data-block="{id}"{self.content()[len(tag):]}'
+
+
+class Artifact:
+    """An artifact split into the shell around <main>'s content and its blocks."""
+
+    def __init__(self, before: str, blocks: list[Block], after: str):
+        self.before = before
+        self.blocks = blocks
+        self.after = after
+
+    @property
+    def title(self) -> str:
+        match = TITLE_RE.search(self.before)
+        return unescape(match.group(2)) if match else ""
+
+    def shell(self) -> tuple[str, str]:
+        """before/after with the title blanked: what a patch can't change."""
+        return TITLE_RE.sub(r"\1\3", self.before, count=1), self.after
+
+    def html(self) -> str:
+        body = "".join(f"\n    {b.html}" for b in self.blocks)
+        return f"{self.before}{body}\n  {self.after}"
+
+
+class _Splitter(HTMLParser):
+    def __init__(self, text: str):
+        super().__init__(convert_charrefs=True)
+        self.text = text
+        self.line_starts = [0] + [m.end() for m in re.finditer("\n", text)]
+        self.depth = 0  # 0 outside <main>, 1 directly inside it
+        self.main_start = self.main_end = None
+        self.block_start = None
+        self.block_tag = self.block_id = None
+        self.blocks = []
+        self.stray_text = False
+
+    def position(self) -> int:
+        line, col = self.getpos()
+        return self.line_starts[line - 1] + col
+
+    def handle_starttag(self, tag, attrs):
+        if self.main_end is not None:
+            return
+        if self.depth == 0:
+            if tag == "main" and self.main_start is None:
+                self.main_start = self.position() + len(self.get_starttag_text())
+                self.depth = 1
+            return
+        if self.depth == 1:
+            self.block_start = self.position()
+            self.block_tag = tag
+            self.block_id = dict(attrs).get("data-block")
+            if tag in VOID:
+                self._close(self.block_start + len(self.get_starttag_text()))
+                return
+        if tag not in VOID:
+            self.depth += 1
+
+    def handle_startendtag(self, tag, attrs):
+        if self.depth == 1 and self.main_end is None:
+            start = self.position()
+            self.block_start, self.block_tag = start, tag
+            self.block_id = dict(attrs).get("data-block")
+            self._close(start + len(self.get_starttag_text()))
+
+    def handle_endtag(self, tag):
+        if self.depth == 0 or self.main_end is not None:
+            return
+        if self.depth == 1:
+            if tag == "main":
+                self.main_end = self.position()
+                self.depth = 0
+            return
+        self.depth -= 1
+        if self.depth == 1:
+            if tag != self.block_tag:
+                raise ValueError(f"</{tag}> closes <{self.block_tag}>")
+            self._close(self.text.index(">", self.position()) + 1)
+
+    def handle_data(self, data):
+        if self.depth == 1 and self.main_end is None and data.strip():
+            self.stray_text = True
+
+    def _close(self, end: int) -> None:
+        self.blocks.append(Block(self.block_tag, self.block_id, self.text[self.block_start:end]))
+        self.block_start = None
+
+
+def parse(text: str) -> Artifact | None:
+    """Split an artifact into shell and blocks; None if it can't be split cleanly."""
+    splitter = _Splitter(text)
+    try:
+        splitter.feed(text)
+        splitter.close()
+    except (ValueError, AssertionError):
+        return None
+    if splitter.main_start is None or splitter.main_end is None or splitter.stray_text:
+        return None
+    return Artifact(text[:splitter.main_start].rstrip(), splitter.blocks,
+                    text[splitter.main_end:])
+
+
+def assign_ids(old: list[Block], new: list[Block]) -> tuple[list[str], int]:
+    """Ids for the new blocks, reusing the old block ids where a block survived:
+    unchanged blocks keep theirs (even if they moved), and a changed block
+    keeps the id of the old block of the same tag it replaced.
+    Returns (ids, how many blocks are new or changed)."""
+    # A block the user duplicated in the browser (Enter clones attributes)
+    # shares its id with the original; only the first keeps it.
+    old_ids = []
+    seen = set()
+    for block in old:
+        old_ids.append(block.id if block.id and block.id not in seen else None)
+        seen.add(block.id)
+    numbers = [int(i[1:]) for i in old_ids if i and re.fullmatch(r"b\d+", i)]
+    counter = max(numbers, default=0)
+    ids = [None] * len(new)
+    old_content = [b.content() for b in old]
+    new_content = [b.content() for b in new]
+    # A revision usually touches a few blocks in the middle; matching the
+    # unchanged head and tail directly keeps SequenceMatcher (quadratic on
+    # repetitive blocks) to the part that changed.
+    head = 0
+    while head < min(len(old), len(new)) and old_content[head] == new_content[head]:
+        ids[head] = old_ids[head]
+        head += 1
+    tail = 0
+    while tail < min(len(old), len(new)) - head and old_content[-1 - tail] == new_content[-1 - tail]:
+        ids[len(new) - 1 - tail] = old_ids[len(old) - 1 - tail]
+        tail += 1
+    matcher = difflib.SequenceMatcher(None, old_content[head:len(old) - tail],
+                                      new_content[head:len(new) - tail], autojunk=False)
+    for op, i1, i2, j1, j2 in matcher.get_opcodes():
+        if op == "equal":
+            for i, j in zip(range(i1, i2), range(j1, j2)):
+                ids[head + j] = old_ids[head + i]
+        elif op == "replace":
+            for i, j in zip(range(i1, i2), range(j1, j2)):
+                if old[head + i].tag == new[head + j].tag:
+                    ids[head + j] = old_ids[head + i]
+    # Blocks that moved past others: same content, different position.
+    unused = {}
+    assigned = set(ids)
+    for i, content in zip(old_ids, old_content):
+        if i and i not in assigned:
+            unused.setdefault(content, []).append(i)
+    for j, content in enumerate(new_content):
+        if ids[j] is None and unused.get(content):
+            ids[j] = unused[content].pop(0)
+    used = set()
+    for j, block in enumerate(new):
+        if ids[j] is None or ids[j] in used:
+            counter += 1
+            ids[j] = f"b{counter}"
+        used.add(ids[j])
+    old_by_id = {i: content for i, content in zip(old_ids, old_content) if i}
+    changed = sum(1 for i, content in zip(ids, new_content) if old_by_id.get(i) != content)
+    return ids, changed
+
+
+def diff(old_text: str, new_text: str) -> dict | None:
+    """A patch turning the page for old_text into new_text:
+    {"title": ..., "order": [block ids], "html": {id: markup of new or changed blocks}}.
+    None when only a full reload will do."""
+    old, new = parse(old_text), parse(new_text)
+    if not old or not new or old.shell() != new.shell():
+        return None
+    ids = [b.id for b in new.blocks]
+    if not all(ids) or len(set(ids)) != len(ids):
+        return None
+    before = {b.id: b.html for b in old.blocks if b.id}
+    return {
+        "title": new.title,
+        "order": ids,
+        "html": {b.id: b.html for b in new.blocks if before.get(b.id) != b.html},
+    }
@@ -0,0 +1,476 @@
+#!/usr/bin/env python3
+"""
+Serve human-friendly artifacts over localhost and push live reloads.
+
+Usage:
+    serve.py ~/Desktop/oauth-migration.html   # what the skill runs, then `open <url>`
+    serve.py --root ~/Desktop --foreground    # run the server in this terminal
+
+The first call starts the server in the background (one per port) and
+prints the artifact's URL; later calls reuse the running server. Pages
+served from it subscribe to a Server-Sent Events stream instead of polling:
+the server watches the artifact's directory (inotify on Linux, kqueue on
+macOS, a 50 ms stat loop elsewhere) and pushes a "change" event with the
+file's new mtime as soon as a write is closed. The page applies the same
+rule it always has — reload only if the change is newer than its own last
+save and its DOM is clean — so an external edit never clobbers unsaved
+typing.
+
+The server keeps the text of each watched file, and when both versions
+carry write_artifact.py's block ids the event also carries a patch (see
+blocks.py): the new block order plus the markup of only the new and changed
+blocks, which the page swaps in place, keeping its scroll position. The
+patch names the version it applies to; a page showing any other version
+reloads instead.
+
+Only .html files directly addressable under the root are served, only on
+127.0.0.1, and only to requests whose Host header names this server (so a
+web page can't DNS-rebind its way to the Desktop). With no page connected
+for IDLE_EXIT seconds the server exits; the next call starts a new one.
+
+Outputs JSON to stdout:
+    {"status": "ok", "url": "http://127.0.0.1:47823/oauth-migration.html",
+     "root": "/Users/me/Desktop", "pid": 12345, "watcher": "kqueue", "started": true}
+    Error: {"error": "message"}
+
+Server log: $XDG_CACHE_HOME/human-friendly/serve.log
+
+Exit codes:
+    0 - Server running (or, with --foreground, stopped cleanly)
+    1 - Invalid arguments, or the port is taken by something else
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import http.client
+import json
+import os
+import select
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, quote, urlsplit
+
+from blocks import diff
+
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "human-friendly"
+LOG_PATH = CACHE_DIR / "serve.log"
+HOST = "127.0.0.1"
+# Fixed so every artifact (and every reload after a restart) gets the same
+# origin; high enough to stay clear of common dev servers.
+DEFAULT_PORT = 47823
+EVENTS_PATH = "/__live/events"
+HEALTH_PATH = "/__live/health"
+# An editor's save can arrive as several writes; wait this long after the
+# first event so the page reloads once, on the finished file.
+DEBOUNCE = 0.02
+# Fallback watcher's stat interval; keeps edits under the 100 ms mark.
+POLL_INTERVAL = 0.05
+# SSE comment sent on a quiet stream so dead connections get noticed.
+KEEPALIVE = 15.0
+# How long EventSource waits before reconnecting (ms).
+RETRY_MS = 500
+# With no page open, the server lingers this long before exiting.
+IDLE_EXIT = 3600.0
+STARTUP_TIMEOUT = 3.0
+
+# <sys/inotify.h>
+IN_ATTRIB = 0x004
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0)
+
+
+def output_json(data: dict) -> None:
+    """Output structured JSON to stdout."""
+    print(json.dumps(data))
+
+
+# --- Watchers ---
+# Each watcher is told which files pages are subscribed to (watch) and
+# blocks in wait() until something under them may have changed. The caller
+# then re-stats the subscribed files, so a spurious wakeup costs a few
+# stat() calls and a missed one is caught by the next timeout.
+
+class InotifyWatcher:
+    name = "inotify"
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.dirs = set()
+
+    def watch(self, path: str) -> None:
+        # Watch the directory, not the file: editors and the browser's
+        # File System Access API replace the file by renaming over it.
+        directory = os.path.dirname(path)
+        if directory in self.dirs:
+            return
+        mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_ATTRIB
+        if self._add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed: {directory}")
+        self.dirs.add(directory)
+
+    def wait(self, timeout: float) -> bool:
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return False
+        time.sleep(DEBOUNCE)
+        try:
+            while os.read(self.fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+        return True
+
+
+class KqueueWatcher:
+    name = "kqueue"
+
+    def __init__(self):
+        self.kq = select.kqueue()
+        self.fds = {}  # path -> fd
+        self.lock = threading.Lock()
+
+    def _add(self, path: str) -> None:
+        fd = os.open(path, getattr(os, "O_EVTONLY", os.O_RDONLY))
+        flags = (select.KQ_NOTE_WRITE | select.KQ_NOTE_EXTEND | select.KQ_NOTE_ATTRIB
+                 | select.KQ_NOTE_DELETE | select.KQ_NOTE_RENAME)
+        event = select.kevent(fd, filter=select.KQ_FILTER_VNODE,
+                              flags=select.KQ_EV_ADD | select.KQ_EV_CLEAR, fflags=flags, udata=fd)
+        self.kq.control([event], 0)
+        self.fds[path] = fd
+
+    def watch(self, path: str) -> None:
+        # The file itself for in-place writes; its directory for renames
+        # over it, after which the file is watched again by its new vnode.
+        with self.lock:
+            for target in (os.path.dirname(path), path):
+                if target not in self.fds:
+                    try:
+                        self._add(target)
+                    except OSError:
+                        pass  # not there (yet); the next watch() retries
+
+    def wait(self, timeout: float) -> bool:
+        events = self.kq.control(None, 64, timeout)
+        if not events:
+            return False
+        time.sleep(DEBOUNCE)
+        events += self.kq.control(None, 64, 0)
+        gone = {e.ident for e in events if e.fflags & (select.KQ_NOTE_DELETE | select.KQ_NOTE_RENAME)}
+        if gone:
+            with self.lock:
+                for path, fd in list(self.fds.items()):
+                    if fd in gone:
+                        os.close(fd)
+                        del self.fds[path]
+        return True
+
+
+class PollWatcher:
+    name = "poll"
+
+    def watch(self, path: str) -> None:
+        pass
+
+    def wait(self, timeout: float) -> bool:
+        time.sleep(POLL_INTERVAL)
+        return True
+
+
+def make_watcher():
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher()
+        except (OSError, AttributeError):
+            pass
+    if hasattr(select, "kqueue"):
+        return KqueueWatcher()
+    return PollWatcher()
+
+
+# --- Server ---
+
+def signature(path: str) -> tuple[int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def read_text(path: str) -> str | None:
+    try:
+        return Path(path).read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+class Hub:
+    """Stat signatures (and contents) of the files open pages are subscribed to."""
+
+    def __init__(self, watcher):
+        self.watcher = watcher
+        self.cond = threading.Condition()
+        self.signatures = {}  # path -> (mtime_ns, size) or None
+        self.contents = {}  # path -> text as of that signature
+        self.patches = {}  # path -> (signature it applies to, blocks.diff() or None)
+        self.subscribers = {}  # path -> count
+        self.last_active = time.monotonic()
+
+    def subscribe(self, path: str) -> None:
+        self.watcher.watch(path)
+        with self.cond:
+            self.subscribers[path] = self.subscribers.get(path, 0) + 1
+            if path not in self.signatures:
+                self.signatures[path] = signature(path)
+                self.contents[path] = read_text(path)
+
+    def unsubscribe(self, path: str) -> None:
+        with self.cond:
+            self.subscribers[path] -= 1
+            if not self.subscribers[path]:
+                for table in (self.subscribers, self.signatures, self.contents):
+                    del table[path]
+                self.patches.pop(path, None)
+            self.last_active = time.monotonic()
+
+    def wait_change(self, path: str, seen, timeout: float):
+        """Block until path's signature differs from seen (or timeout).
+        Returns (signature, patch from seen to it, if there is one)."""
+        with self.cond:
+            self.cond.wait_for(lambda: self.signatures.get(path) != seen, timeout)
+            base, patch = self.patches.get(path, (None, None))
+            return self.signatures.get(path), patch if base == seen else None
+
+    def rescan(self) -> None:
+        with self.cond:
+            known = dict(self.signatures)
+        for path in known:
+            self.watcher.watch(path)
+        changed = {}
+        for path, old in known.items():
+            sig = signature(path)
+            if sig != old:
+                changed[path] = sig, read_text(path)
+        if not changed:
+            return
+        with self.cond:
+            for path, (sig, text) in changed.items():
+                if self.signatures.get(path) != known[path]:
+                    continue  # unsubscribed (or resubscribed) meanwhile
+                old_text = self.contents[path]
+                patch = diff(old_text, text) if old_text and text else None
+                self.patches[path] = (known[path], patch)
+                self.signatures[path] = sig
+                self.contents[path] = text
+            self.cond.notify_all()
+
+    def idle_for(self) -> float:
+        with self.cond:
+            return 0.0 if self.subscribers else time.monotonic() - self.last_active
+
+
+def run_watcher(hub: Hub, server: ThreadingHTTPServer, idle_exit: float) -> None:
+    while True:
+        hub.watcher.wait(1.0)
+        hub.rescan()
+        if hub.idle_for() > idle_exit:
+            print(f"No pages open for {idle_exit:.0f}s; exiting", file=sys.stderr)
+            server.shutdown()
+            return
+
+
+class Handler(SimpleHTTPRequestHandler):
+    hub: Hub
+    root: Path
+
+    def end_headers(self):
+        self.send_header("Cache-Control", "no-store")
+        super().end_headers()
+
+    def host_allowed(self) -> bool:
+        port = self.server.server_address[1]
+        return self.headers.get("Host") in (f"{HOST}:{port}", f"localhost:{port}")
+
+    def artifact(self, url_path: str) -> str | None:
+        """The file behind a URL path, if it's an .html file under the root."""
+        if not url_path.lower().endswith(".html"):
+            return None
+        path = self.translate_path(url_path)
+        return path if os.path.isfile(path) else None
+
+    def do_GET(self):
+        if not self.host_allowed():
+            self.send_error(403, "Unknown host")
+            return
+        url = urlsplit(self.path)
+        if url.path == HEALTH_PATH:
+            body = json.dumps({"root": str(self.root), "pid": os.getpid(),
+                               "watcher": self.hub.watcher.name}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif url.path == EVENTS_PATH:
+            self.stream_events(parse_qs(url.query).get("path", [""])[0])
+        else:
+            super().do_GET()
+
+    def do_HEAD(self):
+        if not self.host_allowed():
+            self.send_error(403, "Unknown host")
+            return
+        super().do_HEAD()
+
+    def send_head(self):
+        # No directory listings, nothing but the artifacts themselves.
+        if not self.artifact(urlsplit(self.path).path):
+            self.send_error(404, "Not found")
+            return None
+        return super().send_head()
+
+    def stream_events(self, url_path: str) -> None:
+        path = self.artifact(url_path)
+        if not path:
+            self.send_error(404, "Not found")
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        self.hub.subscribe(path)
+        seen = object()
+        try:
+            self.wfile.write(f"retry: {RETRY_MS}\n\n".encode())
+            while True:
+                sig, patch = self.hub.wait_change(path, seen, KEEPALIVE)
+                if sig == seen or sig is None:
+                    self.wfile.write(b": keepalive\n\n")
+                else:
+                    event = {"path": url_path, "mtime": sig[0] // 1_000_000}
+                    if patch is not None:
+                        event.update(base=seen[0] // 1_000_000, patch=patch)
+                    data = json.dumps(event)
+                    self.wfile.write(f"event: change\ndata: {data}\n\n".encode())
+                seen = sig
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            self.hub.unsubscribe(path)
+
+
+def serve(root: Path, port: int, idle_exit: float) -> None:
+    hub = Hub(make_watcher())
+    handler = type("ArtifactHandler", (Handler,), {"hub": hub, "root": root})
+    server = ThreadingHTTPServer((HOST, port), partial(handler, directory=str(root)))
+    server.daemon_threads = True
+    threading.Thread(target=run_watcher, args=(hub, server, idle_exit), daemon=True).start()
+    print(f"Serving {root} on http://{HOST}:{port}/ ({hub.watcher.name}, pid {os.getpid()})",
+          file=sys.stderr)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+# --- Caller side ---
+
+def health(port: int) -> dict | None:
+    """The running server's health report; None if nothing answers;
+    {} if something else owns the port."""
+    try:
+        with urllib.request.urlopen(f"http://{HOST}:{port}{HEALTH_PATH}", timeout=1) as response:
+            return json.loads(response.read())
+    except urllib.error.URLError as e:
+        return None if isinstance(e.reason, ConnectionRefusedError) else {}
+    except (OSError, ValueError, http.client.HTTPException):
+        return {}
+
+
+def ensure_server(root: Path, port: int, idle_exit: float) -> tuple[dict, bool]:
+    """Start a background server for root unless one is already running.
+    Returns (its health report, whether this call started it)."""
+    running = health(port)
+    if running is None:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(LOG_PATH, "a") as log:
+            subprocess.Popen(
+                [sys.executable, str(Path(__file__).resolve()), "--foreground", "--root", str(root),
+                 "--port", str(port), "--idle-exit", str(idle_exit)],
+                stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=log,
+                start_new_session=True,
+            )
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while running is None and time.monotonic() < deadline:
+            time.sleep(0.05)
+            running = health(port)
+        if running is None:
+            raise RuntimeError(f"Server didn't start within {STARTUP_TIMEOUT:.0f}s; see {LOG_PATH}")
+        return running, True
+    if not running:
+        raise RuntimeError(f"Port {port} is in use by something else; pass --port")
+    if running["root"] != str(root):
+        raise RuntimeError(f"Port {port} is serving {running['root']}; pass --port for {root}")
+    return running, False
+
+
+def fail(message: str) -> int:
+    print(f"Error: {message}", file=sys.stderr)
+    output_json({"error": message})
+    return 1
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Serve human-friendly artifacts with live reload")
+    parser.add_argument("file", nargs="?", help="Artifact to print the URL of (default root: its directory)")
+    parser.add_argument("--root", help="Directory to serve (default: the file's directory, else ~/Desktop)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port (default: {DEFAULT_PORT})")
+    parser.add_argument("--foreground", action="store_true", help="Run the server in this process")
+    parser.add_argument("--idle-exit", type=float, default=IDLE_EXIT,
+                        help=f"Exit after this many seconds with no page open (default: {IDLE_EXIT:.0f})")
+    args = parser.parse_args()
+
+    file = Path(args.file).expanduser().resolve() if args.file else None
+    if args.root:
+        root = Path(args.root).expanduser().resolve()
+    else:
+        root = file.parent if file else (Path.home() / "Desktop").resolve()
+    if not root.is_dir():
+        return fail(f"Not a directory: {root}")
+    if file and (not file.is_file() or file.suffix.lower() != ".html"):
+        return fail(f"Not an .html file: {file}")
+    if file and not file.is_relative_to(root):
+        return fail(f"{file} is outside {root}")
+
+    if args.foreground:
+        serve(root, args.port, args.idle_exit)
+        return 0
+    try:
+        running, started = ensure_server(root, args.port, args.idle_exit)
+    except RuntimeError as e:
+        return fail(str(e))
+    url = f"http://{HOST}:{args.port}/"
+    if file:
+        url += quote(file.relative_to(root).as_posix())
+    output_json({"status": "ok", "url": url, "root": str(root), "pid": running["pid"],
+                 "watcher": running["watcher"], "started": started})
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
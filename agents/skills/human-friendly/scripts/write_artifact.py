@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Write (or revise) a human-friendly artifact from the template.
+
+Usage (JSON via stdin):
+    scripts/write_artifact.py <<'EOF'
+    {"path": "~/Desktop/oauth-migration.html", "title": "OAuth Migration Plan",
+     "body": "<h1>OAuth Migration Plan</h1>\\n<p class=\\"subtitle\\">...</p>"}
+    EOF
+
+JSON input fields:
+    path: Where to write the artifact (required)
+    title: Plan title, plain text, for <title> (required)
+    body: The HTML that goes inside <main> (required)
+    revise: Replace the body of the existing file at path instead of picking
+            a free name (default: false)
+
+This makes the template substitutions from the skill's procedure (the
+<title> text and everything inside <main>) and stamps each top-level block
+of the body with a data-block id. A new artifact that would overwrite an
+existing file goes to the first free -2, -3, ... name instead.
+
+With "revise", the existing file's shell (head, styles, script — whatever
+the user's browser saved) is kept and only the title and body change. Each
+block keeps the id it had in the file when its content is unchanged, or
+when it is an edit of the block it replaces, so pages served by serve.py
+patch just the new and changed blocks in place instead of reloading.
+
+Outputs JSON to stdout:
+    {"status": "ok", "path": "/Users/me/Desktop/oauth-migration.html",
+     "blocks": 24, "changed": 3, "patchable": true}
+    Error: {"error": "message"}
+
+Exit codes:
+    0 - Artifact written
+    1 - Invalid arguments, or the body can't be split into blocks
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+from blocks import Artifact, Block, TITLE_RE, assign_ids, parse
+
+TEMPLATE = Path(__file__).resolve().parent.parent / "assets" / "template.html"
+
+
+def output_json(data: dict) -> None:
+    """Output structured JSON to stdout."""
+    print(json.dumps(data))
+
+
+def fail(message: str) -> None:
+    print(f"Error: {message}", file=sys.stderr)
+    output_json({"error": message})
+    sys.exit(1)
+
+
+def parse_args() -> dict:
+    """Parse arguments from stdin JSON."""
+    if sys.stdin.isatty():
+        print("Error: This script requires JSON input via stdin", file=sys.stderr)
+        print("Usage: scripts/write_artifact.py <<'EOF'", file=sys.stderr)
+        print('{"path": "~/Desktop/plan.html", "title": "Plan", "body": "<h1>Plan</h1>"}', file=sys.stderr)
+        print("EOF", file=sys.stderr)
+        output_json({"error": "This script requires JSON input via stdin"})
+        sys.exit(1)
+    try:
+        data = json.load(sys.stdin)
+    except json.JSONDecodeError as e:
+        fail(f"Invalid JSON input: {e}")
+    for field in ("path", "title", "body"):
+        if not isinstance(data.get(field), str) or not data[field].strip():
+            fail(f"Missing required field: {field}")
+    return data
+
+
+def free_path(path: Path) -> Path:
+    n = 1
+    candidate = path
+    while candidate.exists():
+        n += 1
+        candidate = path.with_name(f"{path.stem}-{n}{path.suffix}")
+    return candidate
+
+
+def escape_title(title: str) -> str:
+    return title.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def main() -> int:
+    data = parse_args()
+    path = Path(data["path"]).expanduser().resolve()
+    revise = data.get("revise", False)
+    if revise and not path.is_file():
+        fail(f"No artifact to revise at {path}")
+    if not revise:
+        path = free_path(path)
+
+    shell = parse(path.read_text(encoding="utf-8")) if revise else None
+    # The user's copy may not split (e.g. hand-edited markup); then start
+    # over from the template, and open pages reload rather than patch.
+    patchable = shell is not None
+    if shell is None:
+        shell = parse(TEMPLATE.read_text(encoding="utf-8"))
+        if shell is None:
+            fail(f"Template has no parseable <main>: {TEMPLATE}")
+    body = parse(f"<main>{data['body']}</main>")
+    if body is None:
+        fail("body must be a sequence of closed elements (no bare text, no unclosed tags)")
+
+    old = shell.blocks if patchable else []
+    ids, changed = assign_ids(old, body.blocks)
+    title = escape_title(data["title"].strip())
+    before = TITLE_RE.sub(lambda m: m.group(1) + title + m.group(3), shell.before, count=1)
+    artifact = Artifact(before, [Block(b.tag, i, b.with_id(i)) for b, i in zip(body.blocks, ids)], shell.after)
+
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(artifact.html(), encoding="utf-8")
+    os.replace(tmp, path)
+    output_json({
+        "status": "ok",
+        "path": str(path),
+        "blocks": len(ids),
+        "changed": changed,
+        "patchable": patchable,
+    })
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark chunk_diff.py on a synthetic diff: packing time and chunk balance.
+
+Usage (JSON via stdin):
+    bench_chunk_diff.py <<'EOF'
+    {"files": 10000, "token_budget": 20000, "seed": 1}
+    EOF
+
+JSON input fields (all optional):
+    files: Number of changed files in the synthetic diff (default: 10000)
+    token_budget: Budget passed to the chunker (default: chunk_diff's default)
+    seed: RNG seed so runs are comparable (default: 1)
+    repeat: Timed runs; the best is reported (default: 3)
+
+The synthetic tree mimics a monorepo: a few top-level packages, nested
+directories of uneven depth, and file sizes drawn from a long-tailed
+distribution (most edits small, a handful of generated or vendored files
+that blow past the budget on their own).
+
+Outputs JSON to stdout:
+    {"status": "ok", "files": 10000, "diff_bytes": ..., "parse_ms": ...,
+     "pack_ms": ..., "chunks": ..., "imbalance": ..., ...}
+"""
+
+import json
+import random
+import sys
+import time
+
+from chunk_diff import DEFAULT_TOKEN_BUDGET, chunk_stats, group_files, pack_groups, split_files
+
+
+def output_json(data: dict) -> None:
+    """Output structured JSON to stdout."""
+    print(json.dumps(data))
+
+
+def synthetic_diff(n_files: int, seed: int) -> str:
+    """A unified diff touching n_files files across a monorepo-shaped tree."""
+    rng = random.Random(seed)
+    packages = [f"packages/pkg{i}" for i in range(max(1, n_files // 400))]
+    parts = []
+    for i in range(n_files):
+        depth = rng.choice((0, 1, 1, 2, 2, 3))
+        path = rng.choice(packages) + "".join(
+            f"/d{rng.randrange(6)}" for _ in range(depth)
+        ) + f"/file{i}.ts"
+        # Long tail: ~1% of files are huge (lockfiles, generated code)
+        lines = int(rng.paretovariate(1.3) * 6) if rng.random() > 0.01 else 3000
+        start = rng.randrange(1, 500)
+        body = "\n".join(
+            ("+" if rng.random() < 0.6 else " ") + f"  const value{j} = compute({j});"
+            for j in range(lines)
+        )
+        parts.append(
+            f"diff --git a/{path} b/{path}\n"
+            f"index 0000000..1111111 100644\n--- a/{path}\n+++ b/{path}\n"
+            f"@@ -{start},{lines} +{start},{lines} @@\n{body}\n"
+        )
+    return "".join(parts)
+
+
+def parse_args() -> dict:
+    """Parse arguments from stdin JSON (empty input means all defaults)."""
+    if sys.stdin.isatty():
+        print("Error: This script requires JSON input via stdin", file=sys.stderr)
+        print("Usage: bench_chunk_diff.py <<'EOF'", file=sys.stderr)
+        print('{"files": 10000}', file=sys.stderr)
+        print("EOF", file=sys.stderr)
+        output_json({"error": "This script requires JSON input via stdin"})
+        sys.exit(1)
+    try:
+        text = sys.stdin.read().strip()
+        return json.loads(text) if text else {}
+    except json.JSONDecodeError as e:
+        print(f"Error: Invalid JSON input: {e}", file=sys.stderr)
+        output_json({"error": f"Invalid JSON input: {e}"})
+        sys.exit(1)
+
+
+def main() -> int:
+    opts = parse_args()
+    n_files = opts.get("files", 10000)
+    budget = opts.get("token_budget", DEFAULT_TOKEN_BUDGET)
+    repeat = max(1, opts.get("repeat", 3))
+
+    print(f"Generating synthetic diff with {n_files} files...", file=sys.stderr)
+    diff = synthetic_diff(n_files, opts.get("seed", 1))
+
+    parse_times, pack_times = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        files = split_files(diff)
+        parsed = time.perf_counter()
+        chunks = pack_groups(group_files(files, budget), budget)
+        packed = time.perf_counter()
+        parse_times.append(parsed - start)
+        pack_times.append(packed - parsed)
+
+    stats = chunk_stats(chunks, budget)
+    # Directory cohesion: how many chunks each directory's files land in.
+    spread: dict[str, set[int]] = {}
+    for idx, chunk in enumerate(chunks):
+        for f in chunk:
+            spread.setdefault(f["path"].rsplit("/", 1)[0], set()).add(idx)
+    split_dirs = sum(1 for ids in spread.values() if len(ids) > 1)
+
+    output_json({
+        "status": "ok",
+        "files": n_files,
+        "diff_bytes": len(diff),
+        "token_budget": budget,
+        "parse_ms": round(min(parse_times) * 1000, 1),
+        "pack_ms": round(min(pack_times) * 1000, 1),
+        **stats,
+        "directories": len(spread),
+        "directories_split": split_dirs,
+    })
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
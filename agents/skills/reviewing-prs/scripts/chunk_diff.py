@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Split a PR diff into balanced, token-budgeted chunks for parallel review.
+
+Usage (JSON via stdin):
+    chunk_diff.py <<'EOF'
+    {"pr": "123", "token_budget": 20000, "output_dir": "/tmp/pr-123-chunks"}
+    EOF
+
+    # Chunk a diff already on disk (raw unified diff, or fetch_pr_data.sh JSON)
+    chunk_diff.py <<'EOF'
+    {"diff_file": "/tmp/pr-123.json", "output_dir": "/tmp/pr-123-chunks"}
+    EOF
+
+JSON input fields:
+    pr/pr_ref: PR number or URL (required unless diff_file is given)
+    diff_file: Path to a unified diff or fetch_pr_data.sh output (optional)
+    token_budget: Max estimated tokens per chunk (default: 20000)
+    output_dir: Where to write the manifest and chunk diffs (required)
+
+Files are grouped by directory first; small directories roll up into their
+parent so a module's files stay together. Groups are then packed
+largest-first into the least-loaded chunk that still has room, which keeps
+chunk sizes even. A single file larger than the budget gets a chunk of its
+own (flagged "oversize") rather than being split mid-hunk.
+
+Writes to output_dir:
+    manifest.json   - chunks with files, token estimates and line anchors
+    chunk-NN.diff   - the diff text for each chunk
+
+Each file's "anchors" are [start, end] ranges of new-file line numbers that
+appear in the diff (added or context lines) — exactly the lines
+post_review.py accepts as an inline comment "line".
+
+Outputs JSON to stdout:
+    Success: {"status": "ok", "manifest": "/path/manifest.json", "chunks": 4, ...}
+    Error:   {"error": "message"}
+
+Exit codes:
+    0 - Success
+    1 - Invalid arguments
+    2 - GitHub API error
+"""
+
+import heapq
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+from pr_core import parse_pr_reference
+
+# Chunks sized for one sub-agent pass: well inside a reviewer's context
+# window, leaving room for base-branch reads and the agent's own reasoning.
+DEFAULT_TOKEN_BUDGET = 20000
+# Rough chars-per-token for code diffs; only relative sizes matter for packing.
+CHARS_PER_TOKEN = 4
+# Directories smaller than this fraction of the budget merge into their
+# parent's group, so a chunk isn't a scatter of one-file directories.
+ROLLUP_FRACTION = 4
+
+FILE_HEADER_RE = re.compile(r"^diff --git a/(.*?) b/(.*)$", re.MULTILINE)
+HUNK_RE = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,\d+)? @@")
+
+
+def output_json(data: dict) -> None:
+    """Output structured JSON to stdout."""
+    print(json.dumps(data))
+
+
+def fetch_diff(owner: str, repo: str, pr_num: str) -> str:
+    """Fetch the PR's unified diff."""
+    cmd = ['gh', 'pr', 'diff', pr_num, '--repo', f'{owner}/{repo}']
+    print(f"Fetching diff for {owner}/{repo}#{pr_num}...", file=sys.stderr)
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        return result.stdout
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"Failed to fetch PR diff: {e.stderr.strip()}")
+
+
+def read_diff_file(path: str) -> str:
+    """Read a raw diff, or pull the `diff` field out of fetch_pr_data.sh JSON."""
+    text = Path(path).expanduser().read_text()
+    if text.lstrip().startswith("{"):
+        return json.loads(text).get("diff", "")
+    return text
+
+
+def line_anchors(file_diff: str) -> list[list[int]]:
+    """Commentable new-file line ranges: every `+` and context line in each hunk."""
+    ranges: list[list[int]] = []
+    new_line = 0
+    in_hunk = False
+    for line in file_diff.split("\n"):
+        m = HUNK_RE.match(line)
+        if m:
+            new_line = int(m.group(1))
+            in_hunk = True
+            continue
+        if not in_hunk or not line or line[0] not in " +-":
+            continue
+        if line[0] == "-":
+            continue
+        if ranges and ranges[-1][1] == new_line - 1:
+            ranges[-1][1] = new_line
+        else:
+            ranges.append([new_line, new_line])
+        new_line += 1
+    return ranges
+
+
+def split_files(diff: str) -> list[dict]:
+    """Split a unified diff into per-file records with token estimates."""
+    headers = list(FILE_HEADER_RE.finditer(diff))
+    files = []
+    for i, m in enumerate(headers):
+        end = headers[i + 1].start() if i + 1 < len(headers) else len(diff)
+        text = diff[m.start():end]
+        if "\nnew file mode" in text[:300]:
+            status = "added"
+        elif "\ndeleted file mode" in text[:300]:
+            status = "deleted"
+        elif m.group(1) != m.group(2):
+            status = "renamed"
+        else:
+            status = "modified"
+        files.append({
+            "path": m.group(2),
+            "status": status,
+            "tokens": max(1, len(text) // CHARS_PER_TOKEN),
+            "text": text,
+        })
+    return files
+
+
+def parent_dir(path: str) -> str:
+    """POSIX dirname with "." for top-level paths (the root's parent is itself)."""
+    head, sep, _ = path.rpartition("/")
+    return head if sep else "."
+
+
+def group_files(files: list[dict], budget: int) -> list[list[dict]]:
+    """Group files by directory, rolling small directories up into their parent.
+
+    Deepest directories are visited first so a subtree accumulates before its
+    parent decides whether it is big enough to stand alone. Groups that end up
+    over budget are cut into consecutive runs that fit."""
+    min_group = budget // ROLLUP_FRACTION
+    groups: dict[str, list[dict]] = {}
+    sizes: dict[str, int] = {}
+    for f in files:
+        parent = parent_dir(f["path"])
+        groups.setdefault(parent, []).append(f)
+        sizes[parent] = sizes.get(parent, 0) + f["tokens"]
+
+    # Include every ancestor so a directory that only gains files via roll-up
+    # still gets its own chance to roll further up.
+    directories = set()
+    for directory in groups:
+        while directory not in directories:
+            directories.add(directory)
+            directory = parent_dir(directory)
+    for directory in sorted(directories, key=lambda d: d.count("/"), reverse=True):
+        if directory == "." or directory not in groups or sizes[directory] >= min_group:
+            continue
+        parent = parent_dir(directory)
+        groups.setdefault(parent, []).extend(groups.pop(directory))
+        sizes[parent] = sizes.get(parent, 0) + sizes.pop(directory)
+
+    result: list[list[dict]] = []
+    for directory in sorted(groups):
+        members = sorted(groups[directory], key=lambda f: f["path"])
+        run: list[dict] = []
+        run_tokens = 0
+        for f in members:
+            if run and run_tokens + f["tokens"] > budget:
+                result.append(run)
+                run, run_tokens = [], 0
+            run.append(f)
+            run_tokens += f["tokens"]
+        if run:
+            result.append(run)
+    return result
+
+
+def pack_groups(groups: list[list[dict]], budget: int) -> list[list[dict]]:
+    """Longest-processing-time packing: largest group first, into the
+    least-loaded chunk with room, opening a new chunk only when none fits."""
+    sized = sorted(
+        ((sum(f["tokens"] for f in g), g) for g in groups),
+        key=lambda item: item[0], reverse=True,
+    )
+    total = sum(size for size, _ in sized)
+    target = max(1, -(-total // budget))
+
+    chunks: list[list[dict]] = [[] for _ in range(target)]
+    heap = [(0, i) for i in range(target)]
+    for size, group in sized:
+        load, idx = heapq.heappop(heap)
+        if load and load + size > budget:
+            heapq.heappush(heap, (load, idx))
+            idx = len(chunks)
+            chunks.append([])
+            load = 0
+        chunks[idx].extend(group)
+        heapq.heappush(heap, (load + size, idx))
+
+    chunks = [sorted(c, key=lambda f: f["path"]) for c in chunks if c]
+    chunks.sort(key=lambda c: c[0]["path"])
+    return chunks
+
+
+def chunk_diff(diff: str, budget: int) -> list[list[dict]]:
+    """Parse, group and pack a unified diff into review chunks."""
+    files = split_files(diff)
+    if not files:
+        return []
+    return pack_groups(group_files(files, budget), budget)
+
+
+def chunk_stats(chunks: list[list[dict]], budget: int) -> dict:
+    """Balance summary. Oversize single-file chunks can't be balanced, so the
+    imbalance ratio (largest / mean) only covers chunks within budget."""
+    loads = [sum(f["tokens"] for f in c) for c in chunks]
+    if not loads:
+        return {"chunks": 0, "total_tokens": 0}
+    fitting = [load for load in loads if load <= budget] or loads
+    mean = sum(fitting) / len(fitting)
+    return {
+        "chunks": len(loads),
+        "total_tokens": sum(loads),
+        "min_tokens": min(loads),
+        "max_tokens": max(loads),
+        "oversize": len(loads) - len([load for load in loads if load <= budget]),
+        "imbalance": round(max(fitting) / mean, 3),
+    }
+
+
+def write_manifest(chunks: list[list[dict]], budget: int, output_dir: Path,
+                   pr: str | None) -> Path:
+    """Write chunk-NN.diff files plus manifest.json; return the manifest path."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    width = max(2, len(str(len(chunks))))
+    entries = []
+    for n, chunk in enumerate(chunks, start=1):
+        diff_path = output_dir / f"chunk-{n:0{width}d}.diff"
+        diff_path.write_text("".join(f["text"] for f in chunk))
+        tokens = sum(f["tokens"] for f in chunk)
+        entries.append({
+            "id": n,
+            "tokens": tokens,
+            "oversize": tokens > budget,
+            "diff_path": str(diff_path),
+            "files": [
+                {
+                    "path": f["path"],
+                    "status": f["status"],
+                    "tokens": f["tokens"],
+                    "anchors": line_anchors(f["text"]),
+                }
+                for f in chunk
+            ],
+        })
+
+    manifest = {
+        "pr": pr,
+        "token_budget": budget,
+        "stats": chunk_stats(chunks, budget),
+        "chunks": entries,
+    }
+    manifest_path = output_dir / "manifest.json"
+    manifest_path.write_text(json.dumps(manifest, indent=2))
+    return manifest_path
+
+
+def parse_args():
+    """Parse arguments from stdin JSON."""
+    if sys.stdin.isatty():
+        print("Error: This script requires JSON input via stdin", file=sys.stderr)
+        print("Usage: chunk_diff.py <<'EOF'", file=sys.stderr)
+        print('{"pr": "123", "output_dir": "/tmp/pr-123-chunks"}', file=sys.stderr)
+        print("EOF", file=sys.stderr)
+        output_json({"error": "This script requires JSON input via stdin"})
+        sys.exit(1)
+
+    try:
+        data = json.load(sys.stdin)
+    except json.JSONDecodeError as e:
+        print(f"Error: Invalid JSON input: {e}", file=sys.stderr)
+        output_json({"error": f"Invalid JSON input: {e}"})
+        sys.exit(1)
+
+    pr_ref = data.get("pr") or data.get("pr_ref")
+    if not pr_ref and not data.get("diff_file"):
+        print("Error: Missing required field 'pr' or 'diff_file'", file=sys.stderr)
+        output_json({"error": "Missing required field 'pr' or 'diff_file'"})
+        sys.exit(1)
+    if not data.get("output_dir"):
+        print("Error: Missing required field 'output_dir'", file=sys.stderr)
+        output_json({"error": "Missing required field 'output_dir'"})
+        sys.exit(1)
+    budget = data.get("token_budget", DEFAULT_TOKEN_BUDGET)
+    if not isinstance(budget, int) or budget < 1:
+        print("Error: 'token_budget' must be a positive integer", file=sys.stderr)
+        output_json({"error": "'token_budget' must be a positive integer"})
+        sys.exit(1)
+
+    class Args:
+        pass
+    args = Args()
+    args.pr_ref = pr_ref
+    args.diff_file = data.get("diff_file")
+    args.token_budget = budget
+    args.output_dir = Path(data["output_dir"]).expanduser()
+    return args
+
+
+def main():
+    args = parse_args()
+
+    if args.diff_file:
+        try:
+            diff = read_diff_file(args.diff_file)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Error: Could not read diff file: {e}", file=sys.stderr)
+            output_json({"error": f"Could not read diff file: {e}"})
+            return 1
+    else:
+        try:
+            owner, repo, pr_num = parse_pr_reference(args.pr_ref)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            output_json({"error": str(e)})
+            return 1
+        try:
+            diff = fetch_diff(owner, repo, pr_num)
+        except RuntimeError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            output_json({"error": str(e)})
+            return 2
+
+    chunks = chunk_diff(diff, args.token_budget)
+    manifest_path = write_manifest(chunks, args.token_budget, args.output_dir, args.pr_ref)
+    stats = chunk_stats(chunks, args.token_budget)
+    print(f"Wrote {stats['chunks']} chunks to {args.output_dir}", file=sys.stderr)
+    output_json({"status": "ok", "manifest": str(manifest_path), **stats})
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
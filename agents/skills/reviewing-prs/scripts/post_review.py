@@ -37,9 +37,13 @@ Exit codes:
 """
 
 import json
-import subprocess
 import sys
-import re
+
+import pr_daemon_client
+from pr_core import lazy_import, parse_pr_reference
+
+# Imported on first use: a request handed to pr_daemon.py never needs it.
+subprocess = lazy_import("subprocess")
 
 
 def output_json(data: dict) -> None:
@@ -54,45 +58,6 @@ def add_prefix(body: str, role: str, model: str) -> str:
     return f"[🤖 {role} - {model}]: {body}"
 
 
-def parse_pr_reference(pr_ref: str) -> tuple[str, str, str]:
-    """
-    Parse PR reference to extract owner, repo, and PR number.
-
-    Args:
-        pr_ref: Either a PR number (requires being in a git repo) or full GitHub URL
-
-    Returns:
-        Tuple of (owner, repo, pr_number)
-
-    Raises:
-        ValueError: If unable to parse the reference
-    """
-    # Try to parse as GitHub URL
-    url_match = re.match(r'https?://github\.com/([^/]+)/([^/]+)/pull/(\d+)', pr_ref)
-    if url_match:
-        return url_match.group(1), url_match.group(2), url_match.group(3)
-
-    # Assume it's a PR number - get owner/repo from git remote
-    if not pr_ref.isdigit():
-        raise ValueError(f"Invalid PR reference: {pr_ref}")
-
-    try:
-        result = subprocess.run(
-            ['git', 'remote', 'get-url', 'origin'],
-            capture_output=True, text=True, check=True
-        )
-        remote_url = result.stdout.strip()
-    except subprocess.CalledProcessError:
-        raise ValueError("Not in a git repository and no full PR URL provided")
-
-    # Parse remote URL (handles HTTPS and SSH, with or without .git suffix)
-    remote_match = re.search(r'github\.com[:/]([^/]+)/(.+?)(?:\.git)?$', remote_url)
-    if not remote_match:
-        raise ValueError(f"Could not parse GitHub owner/repo from remote: {remote_url}")
-
-    return remote_match.group(1), remote_match.group(2), pr_ref
-
-
 def validate_comment(comment: dict, index: int) -> None:
     """Validate a single comment object."""
     required_fields = ['path', 'line', 'body']
@@ -314,4 +279,4 @@ def main():
 
 
 if __name__ == '__main__':
-    sys.exit(main())
+    sys.exit(pr_daemon_client.run(__file__, main, reads_stdin=True))
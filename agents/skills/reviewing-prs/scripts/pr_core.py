@@ -0,0 +1,176 @@
+"""
+Startup-light core shared by the PR scripts: the PR reference parser and a
+lazy module importer.
+
+    import pr_core
+    subprocess = pr_core.lazy_import("subprocess")
+
+    owner, repo, number = pr_core.parse_pr_reference("123")
+
+Only os and sys are imported up front. A script that hands its request to
+pr_daemon.py, or stops at a usage error, never loads what it would have
+used to do the work itself (check_startup.py keeps this in budget).
+
+A bare PR number takes owner/repo from the origin remote, which costs a
+`git remote get-url origin` fork. The answer is cached per repository in
+$XDG_CACHE_HOME/fixing-prs/repo-remotes.json, keyed by the git dir and
+the mtime of its config file (where remotes live), so editing the remote
+invalidates it.
+
+fixing-prs and reviewing-prs each carry this file (skills are packaged
+separately); keep the two copies identical (check_startup.py fails
+when they differ).
+"""
+
+import os
+import sys
+
+REMOTE_CACHE = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")),
+    "fixing-prs", "repo-remotes.json",
+)
+# One entry per repository worked in; the oldest go past this.
+REMOTE_CACHE_ENTRIES = 256
+
+
+class LazyModule:
+    """Stands in for a module, importing it on first attribute access.
+
+    Attributes are looked up on the real module every time, so patches made
+    to it later (gh_trace, pr_daemon) are seen."""
+
+    def __init__(self, name: str):
+        self._name = name
+
+    def __getattr__(self, attr: str):
+        module = sys.modules.get(self._name)
+        if module is None:
+            __import__(self._name)
+            module = sys.modules[self._name]
+        return getattr(module, attr)
+
+    def __repr__(self) -> str:
+        return f"<lazy module {self._name!r}>"
+
+
+def lazy_import(name: str):
+    """The module itself if already imported, else a LazyModule for it."""
+    return sys.modules.get(name) or LazyModule(name)
+
+
+json = lazy_import("json")
+re = lazy_import("re")
+subprocess = lazy_import("subprocess")
+
+
+def git_config_path(cwd: str | None = None) -> str | None:
+    """Path of the config file of the repository containing cwd, found
+    without running git; None when not in one (or GIT_DIR overrides it)."""
+    if os.environ.get("GIT_DIR"):
+        return None
+    path = os.path.abspath(cwd or os.getcwd())
+    while True:
+        dot_git = os.path.join(path, ".git")
+        if os.path.isdir(dot_git):
+            return os.path.join(dot_git, "config")
+        if os.path.isfile(dot_git):
+            # Worktree or submodule: `gitdir: <path>`, whose remotes live
+            # in the common dir's config.
+            try:
+                with open(dot_git) as f:
+                    content = f.read().strip()
+            except OSError:
+                return None
+            if not content.startswith("gitdir:"):
+                return None
+            git_dir = os.path.join(path, content[len("gitdir:"):].strip())
+            try:
+                with open(os.path.join(git_dir, "commondir")) as f:
+                    git_dir = os.path.join(git_dir, f.read().strip())
+            except OSError:
+                pass
+            return os.path.join(os.path.normpath(git_dir), "config")
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+
+
+def _load_remote_cache() -> dict:
+    try:
+        with open(REMOTE_CACHE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_remote_cache(cache: dict) -> None:
+    while len(cache) > REMOTE_CACHE_ENTRIES:
+        del cache[next(iter(cache))]
+    try:
+        os.makedirs(os.path.dirname(REMOTE_CACHE), exist_ok=True)
+        tmp = f"{REMOTE_CACHE}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(cache, f)
+        os.replace(tmp, REMOTE_CACHE)
+    except OSError:
+        pass  # the cache is an optimization; the answer is still right
+
+
+def origin_repo() -> tuple[str, str]:
+    """(owner, repo) of the current repository's origin remote."""
+    config = git_config_path()
+    try:
+        key = os.path.realpath(config) if config else None
+        mtime = os.stat(config).st_mtime_ns if config else None
+    except OSError:
+        key = mtime = None
+    cache = _load_remote_cache() if key else {}
+    hit = cache.get(key)
+    if hit and hit.get("mtime_ns") == mtime:
+        return hit["owner"], hit["repo"]
+
+    try:
+        result = subprocess.run(
+            ['git', 'remote', 'get-url', 'origin'],
+            capture_output=True, text=True, check=True
+        )
+        remote_url = result.stdout.strip()
+    except subprocess.CalledProcessError:
+        raise ValueError("Not in a git repository and no full PR URL provided")
+
+    # Parse remote URL (handles HTTPS and SSH, with or without .git suffix)
+    remote_match = re.search(r'github\.com[:/]([^/]+)/(.+?)(?:\.git)?$', remote_url)
+    if not remote_match:
+        raise ValueError(f"Could not parse GitHub owner/repo from remote: {remote_url}")
+
+    owner, repo = remote_match.group(1), remote_match.group(2)
+    if key:
+        cache.pop(key, None)
+        cache[key] = {"mtime_ns": mtime, "owner": owner, "repo": repo}
+        _save_remote_cache(cache)
+    return owner, repo
+
+
+def parse_pr_reference(pr_ref: str) -> tuple[str, str, str]:
+    """
+    Parse PR reference to extract owner, repo, and PR number.
+
+    Args:
+        pr_ref: Either a PR number (requires being in a git repo) or full GitHub URL
+
+    Returns:
+        Tuple of (owner, repo, pr_number)
+
+    Raises:
+        ValueError: If unable to parse the reference
+    """
+    url_match = re.match(r'https?://github\.com/([^/]+)/([^/]+)/pull/(\d+)', pr_ref)
+    if url_match:
+        return url_match.group(1), url_match.group(2), url_match.group(3)
+
+    if not pr_ref.isdigit():
+        raise ValueError(f"Invalid PR reference: {pr_ref}")
+
+    owner, repo = origin_repo()
+    return owner, repo, pr_ref